@@ -30,6 +30,7 @@ from app.db.database import Database
 
 async def on_shutdown(db: Database, bot: Bot, services: ServicesContainer) -> None:
     await services.notification.notify_developer(BOT_STOPPED_TAG)
+    await services.message_deletion.stop()
     await commands.delete(bot)
     await bot.delete_webhook()
     await bot.session.close()
@@ -37,7 +38,13 @@ async def on_shutdown(db: Database, bot: Bot, services: ServicesContainer) -> No
     logging.info("Bot stopped.")
 
 
-async def on_startup(config: Config, bot: Bot, services: ServicesContainer, db: Database) -> None:
+async def on_startup(
+    config: Config,
+    bot: Bot,
+    services: ServicesContainer,
+    db: Database,
+    gateway_factory: GatewayFactory,
+) -> None:
     webhook_url = urljoin(config.bot.DOMAIN, TELEGRAM_WEBHOOK)
 
     if await bot.get_webhook_info() != webhook_url:
@@ -49,10 +56,23 @@ async def on_startup(config: Config, bot: Bot, services: ServicesContainer, db:
     await services.notification.notify_developer(BOT_STARTED_TAG)
     logging.info("Bot started.")
 
+    services.message_deletion.start()
+    await services.broadcast.resume()
+
     tasks.transactions.start_scheduler(db.session)
+    tasks.statistics.start_scheduler(db.session)
+    tasks.query_stats.start_scheduler()
+    tasks.clients.start_scheduler(vpn_service=services.vpn)
+    tasks.fulfilment.start_scheduler(
+        session=db.session,
+        gateway_factory=gateway_factory,
+        notification_service=services.notification,
+    )
     if config.shop.REFERRER_REWARD_ENABLED:
-        tasks.referral.start_scheduler(
-            session_factory=db.session, referral_service=services.referral
+        tasks.referral.start_scheduler(referral_service=services.referral)
+    if config.database.is_sqlite and config.database.BACKUP_INTERVAL:
+        tasks.backup.start_scheduler(
+            config=config.database, notification_service=services.notification
         )
 
 
@@ -85,7 +105,9 @@ async def main() -> None:
     I18n.set_current(i18n)
 
     # Initialize services
-    services_container = await services.initialize(config=config, session=db.session, bot=bot)
+    services_container = await services.initialize(
+        config=config, session=db.session, bot=bot, redis=storage.redis
+    )
 
     # Sync servers
     await services_container.server_pool.sync_servers()
@@ -121,7 +143,9 @@ async def main() -> None:
     MaintenanceMiddleware.set_mode(False)
 
     # Register middlewares
-    middlewares.register(dispatcher=dispatcher, i18n=i18n, session=db.session)
+    middlewares.register(
+        dispatcher=dispatcher, i18n=i18n, session=db.session, config=config.database
+    )
 
     # Register filters
     filters.register(
@@ -2,14 +2,26 @@ from aiogram import Dispatcher
 from aiogram.utils.i18n import I18n, SimpleI18nMiddleware
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.config import DatabaseConfig
+
 from .database import DBSessionMiddleware
 from .garbage import GarbageMiddleware
 from .maintenance import MaintenanceMiddleware
+from .query_stats import QueryHandlerMiddleware, QueryStatsMiddleware
 from .throttling import ThrottlingMiddleware
 
 
-def register(dispatcher: Dispatcher, i18n: I18n, session: async_sessionmaker) -> None:
+def register(
+    dispatcher: Dispatcher,
+    i18n: I18n,
+    session: async_sessionmaker,
+    config: DatabaseConfig,
+) -> None:
     middlewares = [
+        QueryStatsMiddleware(
+            query_budget=config.UPDATE_QUERY_BUDGET,
+            time_budget=config.UPDATE_TIME_BUDGET,
+        ),
         ThrottlingMiddleware(),
         GarbageMiddleware(),
         SimpleI18nMiddleware(i18n),
@@ -19,3 +31,9 @@ def register(dispatcher: Dispatcher, i18n: I18n, session: async_sessionmaker) ->
 
     for middleware in middlewares:
         dispatcher.update.middleware.register(middleware)
+
+    # Inner middlewares of the dispatcher also run for the handlers of nested routers.
+    query_handler_middleware = QueryHandlerMiddleware()
+    for name, observer in dispatcher.observers.items():
+        if name not in ("update", "error"):
+            observer.middleware.register(query_handler_middleware)
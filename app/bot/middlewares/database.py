@@ -5,9 +5,11 @@ from typing import Any, Awaitable, Callable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 from aiogram.types import User as TelegramUser
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.bot.utils.constants import DEFAULT_LANGUAGE
 from app.db.models import User
+from app.db.session import LazySession
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +25,8 @@ class DBSessionMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        session: AsyncSession
-        async with self.session() as session:
+        session = LazySession(self.session)
+        try:
             tg_user: TelegramUser | None = data.get("event_from_user")
 
             if tg_user and not tg_user.is_bot:
@@ -39,18 +41,20 @@ class DBSessionMiddleware(BaseMiddleware):
                         vpn_id=str(uuid.uuid4()),
                         first_name=tg_user.first_name,
                         username=tg_user.username,
-                        language_code=tg_user.language_code or "ru",
+                        language_code=DEFAULT_LANGUAGE,
                     )
                     logger.info(f"New user {user.tg_id} created.")
-                elif user.language_code != "ru":
-                    await User.update_language_code(session, user.tg_id, "ru")
-                    user.language_code = "ru"
-                    logger.debug(f"Updated language code to 'ru' for user {user.tg_id}")
+
+                # Hand the connection back while the handler runs; the session keeps
+                # the loaded user and checks out a new connection only if queried again.
+                await session.release()
 
                 data["user"] = user
                 data["is_new_user"] = is_new_user
-            
+
             data["session"] = session
             data["session_maker"] = self.session
 
             return await handler(event, data)
+        finally:
+            await session.close()
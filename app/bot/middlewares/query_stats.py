@@ -0,0 +1,62 @@
+import logging
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject, Update
+
+from app.db import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware(BaseMiddleware):
+    """
+    Counts the queries of every update and logs updates over the query or time budget.
+
+    Registered as the outermost update middleware, so the queries of the other middlewares
+    (loading the user, for example) are attributed to the update as well.
+    """
+
+    def __init__(self, query_budget: int, time_budget: int) -> None:
+        self.query_budget = query_budget
+        self.time_budget = time_budget
+        logger.debug("Query Stats Middleware initialized.")
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        stats, token = instrumentation.start_tracking()
+        try:
+            return await handler(event, data)
+        finally:
+            instrumentation.stop_tracking(token)
+            duration = stats.duration * 1000
+            if (self.query_budget and stats.queries > self.query_budget) or (
+                self.time_budget and duration > self.time_budget
+            ):
+                update_id = event.update_id if isinstance(event, Update) else None
+                logger.warning(
+                    f"Update {update_id} ({stats.handler}) ran {stats.queries} queries "
+                    f"in {duration:.1f} ms."
+                )
+
+
+class QueryHandlerMiddleware(BaseMiddleware):
+    """Names the handler that processes the update in its query stats."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject | None = data.get("handler")
+        if handler_object:
+            callback = handler_object.callback
+            module = callback.__module__.rsplit(".", 1)[-1]
+            instrumentation.set_handler(f"{module}.{callback.__qualname__}")
+        return await handler(event, data)
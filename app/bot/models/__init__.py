@@ -1,3 +1,4 @@
+from .broadcast_segment_data import BroadcastSegmentData
 from .client_data import ClientData
 from .plan import Plan
 from .services_container import ServicesContainer
@@ -0,0 +1,8 @@
+from aiogram.filters.callback_data import CallbackData
+
+from app.bot.utils.constants import BroadcastSegment
+
+
+class BroadcastSegmentData(CallbackData, prefix="broadcast_segment"):
+    segment: BroadcastSegment
+    value: str = ""
@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from app.bot.services import (
+        BroadcastService,
+        MessageDeletionService,
         NotificationService,
         PlanService,
         ServerPoolService,
@@ -23,3 +25,5 @@ class ServicesContainer:
     notification: NotificationService
     referral: ReferralService
     subscription: SubscriptionService
+    broadcast: BroadcastService
+    message_deletion: MessageDeletionService
@@ -1,8 +1,11 @@
 from aiogram.filters.callback_data import CallbackData
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from app.bot.utils.navigation import NavSubscription
 
+if TYPE_CHECKING:
+    from app.db.models import Transaction
+
 
 class SubscriptionData(CallbackData, prefix="subscription"):
     state: NavSubscription
@@ -14,3 +17,32 @@ class SubscriptionData(CallbackData, prefix="subscription"):
     price: Optional[float] = 0.0
     location: str = ""
     is_change_location: bool = False
+
+    def to_transaction(self) -> dict[str, Any]:
+        """Returns the packed data together with the typed transaction columns."""
+        return {
+            "subscription": self.pack(),
+            "devices": self.devices,
+            "duration": self.duration,
+            "price": self.price,
+            "location": self.location or None,
+            "is_extend": self.is_extend,
+            "is_change": self.is_change,
+        }
+
+    @classmethod
+    def from_transaction(cls, transaction: "Transaction") -> "SubscriptionData":
+        """Reads the typed transaction columns, or the packed data if they were not backfilled."""
+        if transaction.devices is None or transaction.duration is None:
+            return cls.unpack(transaction.subscription)
+
+        return cls(
+            state=NavSubscription.PAY,
+            is_extend=bool(transaction.is_extend),
+            is_change=bool(transaction.is_change),
+            user_id=transaction.tg_id,
+            devices=transaction.devices,
+            duration=transaction.duration,
+            price=transaction.price,
+            location=transaction.location or "",
+        )
@@ -8,7 +8,7 @@ from aiogram.utils.i18n import I18n
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.i18n import lazy_gettext as __
 from aiohttp.web import Application
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.bot.models import ServicesContainer, SubscriptionData
 from app.bot.routers.main_menu.handler import redirect_to_main_menu
@@ -18,11 +18,12 @@ from app.bot.utils.constants import (
     EVENT_PAYMENT_SUCCEEDED_TAG,
     MESSAGE_EFFECT_IDS,
     Currency,
+    StatisticMetric,
     TransactionStatus,
 )
 from app.bot.utils.formatting import format_device_count, format_subscription_period
 from app.config import Config
-from app.db.models import Transaction, User
+from app.db.models import PaymentFulfilment, Statistic, Transaction, User
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +67,12 @@ class PaymentGateway(ABC):
         pass
 
     async def _on_payment_succeeded(self, payment_id: str) -> None:
+        """
+        Queues a successful payment for fulfilment and returns without waiting for it.
+
+        Webhooks answer the gateway right after this, the subscription is delivered by
+        the fulfilment task, see fulfil_payment.
+        """
         logger.info(f"Payment succeeded {payment_id}")
 
         async with self.session() as session:
@@ -78,28 +85,57 @@ class PaymentGateway(ABC):
                 logger.info(f"Transaction {payment_id} already processed. Skipping.")
                 return
 
-            subscription_data = SubscriptionData.unpack(transaction.subscription)
-            logger.debug(f"Subscription data unpacked: {subscription_data}")
+            await PaymentFulfilment.enqueue(
+                session=session, payment_id=payment_id, gateway=self.callback
+            )
+
+    async def fulfil_payment(self, fulfilment: PaymentFulfilment) -> None:
+        """
+        Delivers the subscription of a queued payment.
+
+        Every step can be repeated: the transaction is completed and counted once, referrer
+        rewards are unique per payment and the VPN client is provisioned only until
+        provisioned_at is set. Messages to the user may be sent again by a retry.
+
+        Args:
+            fulfilment (PaymentFulfilment): The queued payment.
+
+        Raises:
+            Exception: If the payment could not be fulfilled and should be retried.
+        """
+        payment_id = fulfilment.payment_id
+        logger.info(f"Fulfilling payment {payment_id}, attempt {fulfilment.attempts + 1}.")
+
+        async with self.session() as session:
+            transaction = await Transaction.get_by_id(session=session, payment_id=payment_id)
+            if not transaction:
+                raise LookupError(f"Transaction {payment_id} not found.")
+
+            subscription_data = SubscriptionData.from_transaction(transaction)
+            logger.debug(f"Subscription data read: {subscription_data}")
 
             user = await User.get(session, subscription_data.user_id)
             if not user:
-                logger.error(f"User {subscription_data.user_id} not found.")
-                return
+                raise LookupError(f"User {subscription_data.user_id} not found.")
 
-            transaction.tg_id = user.tg_id
-            transaction.status = TransactionStatus.COMPLETED
-            await session.commit()
-            
-            await self.services.notification.notify_developer(
-                text=EVENT_PAYMENT_SUCCEEDED_TAG
-                + "\n\n"
-                + _("payment:event:payment_succeeded").format(
-                    payment_id=payment_id,
-                    user_id=user.tg_id,
-                    devices=format_device_count(subscription_data.devices),
-                    duration=format_subscription_period(subscription_data.duration),
-                ),
+            completed = await Transaction.complete(
+                session=session, payment_id=payment_id, tg_id=user.tg_id
             )
+            if completed:
+                await self._record_payment_statistics(session, subscription_data)
+            await session.commit()
+
+            if completed:
+                await self.services.notification.notify_developer(
+                    text=EVENT_PAYMENT_SUCCEEDED_TAG
+                    + "\n\n"
+                    + _("payment:event:payment_succeeded").format(
+                        payment_id=payment_id,
+                        user_id=user.tg_id,
+                        devices=format_device_count(subscription_data.devices),
+                        duration=format_subscription_period(subscription_data.duration),
+                    ),
+                )
 
             try:
                 await self.services.referral.add_referrers_rewards_on_payment(
@@ -110,94 +146,126 @@ class PaymentGateway(ABC):
             except Exception as e:
                 logger.warning(f"No referral found for user {user.tg_id} on payment event: {e}")
 
-            location_name = None
-            if subscription_data.location:
-                location_name = await self.services.server_pool.get_location_name_by_index(
-                    subscription_data.location
-                )
-                logger.info(
-                    f"Resolved location index '{subscription_data.location}' to name '{location_name}' "
-                    f"for payment {payment_id}, user {user.tg_id}."
+            if not fulfilment.provisioned_at:
+                await self._provision_subscription(
+                    session=session,
+                    user=user,
+                    subscription_data=subscription_data,
+                    payment_id=payment_id,
                 )
+                await PaymentFulfilment.mark_provisioned(session=session, payment_id=payment_id)
 
-            try:
-                if subscription_data.is_extend:
-                    await self.services.vpn.extend_subscription(
-                        user=user,
-                        devices=subscription_data.devices,
-                        duration=subscription_data.duration,
-                    )
-                    logger.info(f"Subscription extended for user {user.tg_id}")
-                elif subscription_data.is_change:
-                    await self.services.vpn.change_subscription(
-                        user=user,
-                        devices=subscription_data.devices,
-                        duration=subscription_data.duration,
-                        session=session,
-                        location_name=location_name,
-                    )
-                    logger.info(f"Subscription changed for user {user.tg_id}")
-                else:
-                    updated_user = await self.services.vpn.create_subscription(
-                        user=user,
-                        devices=subscription_data.devices,
-                        duration=subscription_data.duration,
-                        session=session,
-                        location_name=location_name,
-                    )
-                    if updated_user:
-                        logger.info(f"Subscription created for user {user.tg_id}")
-                    else:
-                        logger.error(f"Failed to create subscription for user {user.tg_id}")
-                        return
-
-                # Send VPN key to user
-                key = await self.services.vpn.get_key(user, session=session)
-                if not key:
-                    logger.error(f"Failed to get VPN key for user {user.tg_id}")
-                    return
-
-                # Send notification about successful payment
-                await self.services.notification.notify_by_id(
-                    chat_id=user.tg_id,
-                    text=_("payment:ntf:payment_success").format(
-                        devices=format_device_count(subscription_data.devices),
-                        duration=format_subscription_period(subscription_data.duration)
-                    ),
-                    message_effect_id=MESSAGE_EFFECT_IDS["🎉"],
-                )
+            # Send VPN key to user
+            key = await self.services.vpn.get_key(user, session=session)
+            if not key:
+                raise RuntimeError(f"Failed to get VPN key for user {user.tg_id}")
 
-                # Send VPN key
-                await self.services.notification.notify_purchase_success(
-                    user_id=user.tg_id,
-                    key=key,
-                    duration=subscription_data.duration,
-                    devices=subscription_data.devices,
-                    is_change=subscription_data.is_change,
-                    is_extend=subscription_data.is_extend,
-                )
+            # Send notification about successful payment
+            await self.services.notification.notify_by_id(
+                chat_id=user.tg_id,
+                text=_("payment:ntf:payment_success").format(
+                    devices=format_device_count(subscription_data.devices),
+                    duration=format_subscription_period(subscription_data.duration)
+                ),
+                message_effect_id=MESSAGE_EFFECT_IDS["🎉"],
+            )
 
-                # Try to delete the payment confirmation message
-                try:
-                    # Get the state from storage
-                    state = await self.storage.get_data(chat=user.tg_id)
-                    payment_message_id = state.get("payment_message_id")
-                    if payment_message_id:
-                        await self.bot.delete_message(chat_id=user.tg_id, message_id=payment_message_id)
-                except Exception as e:
-                    logger.warning(f"Could not delete payment confirmation message for user {user.tg_id}: {e}")
-
-                await redirect_to_main_menu(
-                    bot=self.bot,
-                    user=user,
-                    storage=self.storage,
-                    services=self.services,
-                    config=self.config,
-                )
+            # Send VPN key
+            await self.services.notification.notify_purchase_success(
+                user_id=user.tg_id,
+                key=key,
+                duration=subscription_data.duration,
+                devices=subscription_data.devices,
+                is_change=subscription_data.is_change,
+                is_extend=subscription_data.is_extend,
+            )
 
+            # Try to delete the payment confirmation message
+            try:
+                # Get the state from storage
+                state = await self.storage.get_data(chat=user.tg_id)
+                payment_message_id = state.get("payment_message_id")
+                if payment_message_id:
+                    await self.bot.delete_message(chat_id=user.tg_id, message_id=payment_message_id)
             except Exception as e:
-                logger.error(f"Error processing payment {payment_id} for user {user.tg_id}: {e}")
-                raise
+                logger.warning(f"Could not delete payment confirmation message for user {user.tg_id}: {e}")
+
+            await redirect_to_main_menu(
+                bot=self.bot,
+                user=user,
+                storage=self.storage,
+                services=self.services,
+                config=self.config,
+            )
+
+    async def _provision_subscription(
+        self,
+        session: AsyncSession,
+        user: User,
+        subscription_data: SubscriptionData,
+        payment_id: str,
+    ) -> None:
+        location_name = None
+        if subscription_data.location:
+            location_name = await self.services.server_pool.get_location_name_by_index(
+                subscription_data.location
+            )
+            logger.info(
+                f"Resolved location index '{subscription_data.location}' to name '{location_name}' "
+                f"for payment {payment_id}, user {user.tg_id}."
+            )
+
+        if subscription_data.is_extend:
+            if not await self.services.vpn.extend_subscription(
+                user=user,
+                devices=subscription_data.devices,
+                duration=subscription_data.duration,
+                session=session,
+            ):
+                raise RuntimeError(f"Failed to extend subscription for user {user.tg_id}")
+            logger.info(f"Subscription extended for user {user.tg_id}")
+        elif subscription_data.is_change:
+            if not await self.services.vpn.change_subscription(
+                user=user,
+                devices=subscription_data.devices,
+                duration=subscription_data.duration,
+                session=session,
+                location_name=location_name,
+            ):
+                raise RuntimeError(f"Failed to change subscription for user {user.tg_id}")
+            logger.info(f"Subscription changed for user {user.tg_id}")
+        else:
+            updated_user = await self.services.vpn.create_subscription(
+                user=user,
+                devices=subscription_data.devices,
+                duration=subscription_data.duration,
+                session=session,
+                location_name=location_name,
+            )
+            if not updated_user:
+                raise RuntimeError(f"Failed to create subscription for user {user.tg_id}")
+            logger.info(f"Subscription created for user {user.tg_id}")
+
+    async def _record_payment_statistics(
+        self,
+        session: AsyncSession,
+        subscription_data: SubscriptionData,
+    ) -> None:
+        plan = f"{subscription_data.devices}:{subscription_data.duration}"
+        await Statistic.increment(
+            session=session,
+            metric=StatisticMetric.PAYMENTS_BY_GATEWAY,
+            dimension=self.callback.value,
+        )
+        await Statistic.increment(
+            session=session, metric=StatisticMetric.PAYMENTS_BY_PLAN, dimension=plan
+        )
+        await Statistic.increment(
+            session=session,
+            metric=StatisticMetric.REVENUE,
+            amount=float(subscription_data.price or 0),
+            dimension=self.currency.code,
+        )
 
     async def _on_payment_canceled(self, payment_id: str) -> None:
         logger.info(f"Payment canceled {payment_id}")
@@ -211,9 +279,9 @@ class PaymentGateway(ABC):
                 logger.info(f"Transaction {payment_id} is already completed. Ignoring cancellation.")
                 return
 
-            data = SubscriptionData.unpack(transaction.subscription)
+            data = SubscriptionData.from_transaction(transaction)
             if not data:
-                logger.error(f"Could not unpack subscription data for transaction {payment_id}")
+                logger.error(f"Could not read subscription data for transaction {payment_id}")
                 return
 
             await Transaction.update(
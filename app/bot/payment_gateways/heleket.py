@@ -86,7 +86,7 @@ class Heleket(PaymentGateway):
             await Transaction.create(
                 session=session,
                 tg_id=data.user_id,
-                subscription=data.pack(),
+                **data.to_transaction(),
                 payment_id=result["result"]["order_id"],
                 status=TransactionStatus.PENDING,
             )
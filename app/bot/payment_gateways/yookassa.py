@@ -94,7 +94,7 @@ class Yookassa(PaymentGateway):
             await Transaction.create(
                 session=session,
                 tg_id=data.user_id,
-                subscription=data.pack(),
+                **data.to_transaction(),
                 payment_id=response.id,
                 status=TransactionStatus.PENDING,
             )
@@ -75,7 +75,7 @@ class Yoomoney(PaymentGateway):
             await Transaction.create(
                 session=session,
                 tg_id=data.user_id,
-                subscription=data.pack(),
+                **data.to_transaction(),
                 payment_id=payment_id,
                 status=TransactionStatus.PENDING,
             )
@@ -1,16 +1,17 @@
 import logging
-from datetime import datetime
+import tempfile
+from pathlib import Path
 
 from aiogram import F, Router
-from aiogram.exceptions import TelegramAPIError
 from aiogram.types import CallbackQuery, FSInputFile
 from aiogram.utils.i18n import gettext as _
 
 from app.bot.filters import IsAdmin
 from app.bot.models import ServicesContainer
-from app.bot.utils.constants import BACKUP_CREATED_TAG, DB_FORMAT
+from app.bot.utils.constants import BACKUP_CREATED_TAG
 from app.bot.utils.navigation import NavAdminTools
-from app.config import DEFAULT_DATA_DIR, Config
+from app.config import Config
+from app.db.backup import create_backup
 from app.db.models import User
 
 logger = logging.getLogger(__name__)
@@ -25,20 +26,34 @@ async def callback_create_backup(
     services: ServicesContainer,
 ) -> None:
     logger.info(f"Admin {user.tg_id} initiated backup creation.")
+
+    if not config.database.is_sqlite:
+        logger.error("Backups are only supported for the SQLite database.")
+        await services.notification.show_popup(callback=callback, text=_("backup:popup:not_found"))
+        return
+
     try:
-        file = FSInputFile(
-            path=f"{DEFAULT_DATA_DIR}/{config.database.NAME}.{DB_FORMAT}",
-            filename=f"backup_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{DB_FORMAT}",
-        )
-        await services.notification.notify_developer(text=BACKUP_CREATED_TAG, document=file)
+        with tempfile.TemporaryDirectory() as directory:
+            parts = await create_backup(config=config.database, directory=Path(directory))
+
+            for index, part in enumerate(parts, start=1):
+                text = BACKUP_CREATED_TAG
+                if len(parts) > 1:
+                    text += f"\n{index}/{len(parts)}"
+
+                document = FSInputFile(path=part, filename=part.name)
+                if not await services.notification.notify_developer(text=text, document=document):
+                    logger.error(f"Failed to send backup part {part.name} to developer.")
+                    await services.notification.show_popup(
+                        callback=callback, text=_("backup:popup:failed")
+                    )
+                    return
+
         await services.notification.show_popup(callback=callback, text=_("backup:popup:success"))
         logger.info(f"Backup sent to developer: {config.bot.DEV_ID}")
     except FileNotFoundError:
         logger.error("Database file not found.")
         await services.notification.show_popup(callback=callback, text=_("backup:popup:not_found"))
-    except TelegramAPIError as exception:
-        logger.error(f"Failed to send backup to developer: {exception}")
-        await services.notification.show_popup(callback=callback, text=_("backup:popup:failed"))
     except Exception as exception:
         logger.error(f"Unexpected error during backup creation: {exception}")
         await services.notification.show_popup(callback=callback, text=_("backup:popup:error"))
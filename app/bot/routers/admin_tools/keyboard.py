@@ -2,11 +2,13 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.bot.models import BroadcastSegmentData
 from app.bot.routers.misc.keyboard import (
     back_button,
     back_to_main_menu_button,
     cancel_button,
 )
+from app.bot.utils.constants import BROADCAST_EXPIRED_DAYS, BroadcastSegment
 from app.bot.utils.navigation import NavAdminTools
 from app.db.models import Server
 
@@ -84,6 +86,12 @@ def promocode_editor_keyboard() -> InlineKeyboardMarkup:
             callback_data=NavAdminTools.CREATE_PROMOCODE,
         )
     )
+    builder.row(
+        InlineKeyboardButton(
+            text=_("promocode_editor:button:bulk_create"),
+            callback_data=NavAdminTools.BULK_CREATE_PROMOCODE,
+        )
+    )
     builder.row(
         InlineKeyboardButton(
             text=_("promocode_editor:button:delete"),
@@ -97,7 +105,7 @@ def promocode_editor_keyboard() -> InlineKeyboardMarkup:
         )
     )
 
-    builder.adjust(3)
+    builder.adjust(2)
     builder.row(back_button(NavAdminTools.MAIN))
     builder.row(back_to_main_menu_button())
     return builder.as_markup()
@@ -239,6 +247,66 @@ def notification_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+def broadcast_segment_keyboard(servers: list[Server]) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+
+    builder.row(
+        InlineKeyboardButton(
+            text=_("notification:button:segment_all"),
+            callback_data=BroadcastSegmentData(segment=BroadcastSegment.ALL).pack(),
+        ),
+        InlineKeyboardButton(
+            text=_("notification:button:segment_active"),
+            callback_data=BroadcastSegmentData(segment=BroadcastSegment.ACTIVE).pack(),
+        ),
+    )
+    builder.row(
+        *[
+            InlineKeyboardButton(
+                text=_("notification:button:segment_expired").format(days=days),
+                callback_data=BroadcastSegmentData(
+                    segment=BroadcastSegment.EXPIRED, value=str(days)
+                ).pack(),
+            )
+            for days in BROADCAST_EXPIRED_DAYS
+        ]
+    )
+    builder.row(
+        InlineKeyboardButton(
+            text=_("notification:button:segment_trial_only"),
+            callback_data=BroadcastSegmentData(segment=BroadcastSegment.TRIAL_ONLY).pack(),
+        ),
+        InlineKeyboardButton(
+            text=_("notification:button:segment_never_paid"),
+            callback_data=BroadcastSegmentData(segment=BroadcastSegment.NEVER_PAID).pack(),
+        ),
+    )
+
+    locations = sorted({server.location for server in servers if server.location})
+    for location in locations:
+        builder.row(
+            InlineKeyboardButton(
+                text=_("notification:button:segment_location").format(location=location),
+                callback_data=BroadcastSegmentData(
+                    segment=BroadcastSegment.LOCATION, value=location
+                ).pack(),
+            )
+        )
+
+    for server in servers:
+        builder.row(
+            InlineKeyboardButton(
+                text=_("notification:button:segment_server").format(server_name=server.name),
+                callback_data=BroadcastSegmentData(
+                    segment=BroadcastSegment.SERVER, value=str(server.id)
+                ).pack(),
+            )
+        )
+
+    builder.row(back_button(NavAdminTools.NOTIFICATION))
+    return builder.as_markup()
+
+
 def last_notification_keyboard() -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
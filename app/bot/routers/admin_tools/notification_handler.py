@@ -8,20 +8,25 @@ from aiogram.utils.i18n import gettext as _
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.filters import IsAdmin
-from app.bot.models import ServicesContainer
-from app.bot.routers.misc.keyboard import back_keyboard, close_notification_keyboard
+from app.bot.models import BroadcastSegmentData, ServicesContainer
+from app.bot.routers.misc.keyboard import back_keyboard
 from app.bot.utils.constants import (
     MAIN_MESSAGE_ID_KEY,
+    NOTIFICATION_BROADCAST_ID_KEY,
     NOTIFICATION_CHAT_IDS_KEY,
-    NOTIFICATION_LAST_MESSAGE_IDS_KEY,
     NOTIFICATION_MESSAGE_TEXT_KEY,
     NOTIFICATION_PRE_MESSAGE_TEXT_KEY,
+    NOTIFICATION_SEGMENT_KEY,
+    NOTIFICATION_SEGMENT_VALUE_KEY,
+    BroadcastSegment,
+    BroadcastStatus,
 )
 from app.bot.utils.navigation import NavAdminTools
 from app.bot.utils.validation import is_valid_message_text, is_valid_user_id
-from app.db.models import User
+from app.db.models import Broadcast, BroadcastReceipt, Server, User
 
 from .keyboard import (
+    broadcast_segment_keyboard,
     confirm_send_notification_keyboard,
     last_notification_keyboard,
     notification_keyboard,
@@ -169,11 +174,14 @@ async def callback_confirm_send_notification(
         return None
 
     user_id = await state.get_value(NOTIFICATION_CHAT_IDS_KEY)
-    notification = await services.notification.notify_by_id(chat_id=user_id[0], text=text)
+    broadcast = await services.broadcast.send_to_user(
+        admin_tg_id=user.tg_id, chat_id=user_id[0], text=text
+    )
 
-    if notification:
-        await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: [notification.message_id]})
-        await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: text})
+    if broadcast:
+        await state.update_data(
+            {NOTIFICATION_BROADCAST_ID_KEY: broadcast.id, NOTIFICATION_MESSAGE_TEXT_KEY: text}
+        )
         await show_notification_main(message=callback.message, state=state)
         await services.notification.notify_by_message(
             message=callback.message,
@@ -188,16 +196,69 @@ async def callback_confirm_send_notification(
         )
 
 
+async def get_segment_name(
+    session: AsyncSession,
+    segment: BroadcastSegment,
+    value: str | None,
+) -> str:
+    match segment:
+        case BroadcastSegment.ACTIVE:
+            return _("notification:button:segment_active")
+        case BroadcastSegment.EXPIRED:
+            return _("notification:button:segment_expired").format(days=value)
+        case BroadcastSegment.TRIAL_ONLY:
+            return _("notification:button:segment_trial_only")
+        case BroadcastSegment.NEVER_PAID:
+            return _("notification:button:segment_never_paid")
+        case BroadcastSegment.SERVER:
+            server = await Server.get_by_id(session=session, id=int(value))
+            server_name = server.name if server else value
+            return _("notification:button:segment_server").format(server_name=server_name)
+        case BroadcastSegment.LOCATION:
+            return _("notification:button:segment_location").format(location=value)
+    return _("notification:button:segment_all")
+
+
 @router.callback_query(F.data == NavAdminTools.SEND_NOTIFICATION_ALL, IsAdmin())
 async def callback_send_notification_all(
     callback: CallbackQuery,
     user: User,
+    session: AsyncSession,
     state: FSMContext,
 ) -> None:
     logger.info(f"Admin {user.tg_id} opened send notification to all.")
+    await state.set_state(None)
+    servers = await Server.get_all(session=session)
     await callback.message.edit_text(
-        text=_("notification:message:send_to_all"),
-        reply_markup=back_keyboard(NavAdminTools.NOTIFICATION),
+        text=_("notification:message:choose_segment"),
+        reply_markup=broadcast_segment_keyboard(servers),
+    )
+
+
+@router.callback_query(BroadcastSegmentData.filter(), IsAdmin())
+async def callback_broadcast_segment(
+    callback: CallbackQuery,
+    user: User,
+    session: AsyncSession,
+    state: FSMContext,
+    callback_data: BroadcastSegmentData,
+) -> None:
+    segment = callback_data.segment
+    value = callback_data.value or None
+    logger.info(f"Admin {user.tg_id} selected broadcast segment {segment.value} ({value}).")
+
+    count = await User.count_segment(
+        session=session, filters=User.get_segment_filters(segment, value)
+    )
+    await state.update_data(
+        {NOTIFICATION_SEGMENT_KEY: segment.value, NOTIFICATION_SEGMENT_VALUE_KEY: value}
+    )
+    await callback.message.edit_text(
+        text=_("notification:message:send_to_segment").format(
+            segment=await get_segment_name(session=session, segment=segment, value=value),
+            count=count,
+        ),
+        reply_markup=back_keyboard(NavAdminTools.SEND_NOTIFICATION_ALL),
     )
     await state.set_state(NotificationStates.message_to_all)
 
@@ -238,7 +299,6 @@ async def message_to_all(
 async def callback_confirm_send_notification_all(
     callback: CallbackQuery,
     user: User,
-    session: AsyncSession,
     state: FSMContext,
     services: ServicesContainer,
 ) -> None:
@@ -253,52 +313,40 @@ async def callback_confirm_send_notification_all(
         )
         return None
 
-    await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: text})
-    users = await User.get_all(session=session)
-    await services.notification.notify_by_message(
-        message=callback.message,
-        text=_("notification:ntf:sending_to_all").format(
-            count=len(users),
-        ),
-        duration=5,
+    segment = await state.get_value(NOTIFICATION_SEGMENT_KEY, BroadcastSegment.ALL.value)
+    segment_value = await state.get_value(NOTIFICATION_SEGMENT_VALUE_KEY)
+    broadcast = await services.broadcast.start(
+        admin_tg_id=user.tg_id,
+        text=text,
+        segment=BroadcastSegment(segment),
+        segment_value=segment_value,
     )
-    user_ids = []
-    message_ids = []
-
-    for _user in users:
-        notification = await services.notification.notify_by_id(chat_id=_user.tg_id, text=text)
-
-        if notification:
-            user_ids.append(_user.tg_id)
-            message_ids.append(notification.message_id)
-
-    await state.update_data({NOTIFICATION_CHAT_IDS_KEY: user_ids})
-    await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: message_ids})
-    await show_notification_main(message=callback.message, state=state)
-    await services.notification.notify_by_message(
-        message=callback.message,
-        text=_("notification:ntf:sent_success_all").format(
-            success=len(user_ids),
-            failed=len(users) - len(user_ids),
-        ),
-        duration=5,
+    await state.update_data(
+        {NOTIFICATION_BROADCAST_ID_KEY: broadcast.id, NOTIFICATION_MESSAGE_TEXT_KEY: text}
     )
+    await show_notification_main(message=callback.message, state=state)
 
 
 @router.callback_query(F.data == NavAdminTools.LAST_NOTIFICATION, IsAdmin())
 async def callback_last_notification(
     callback: CallbackQuery,
     user: User,
+    session: AsyncSession,
     state: FSMContext,
     services: ServicesContainer,
 ) -> None:
     logger.info(f"Admin {user.tg_id} opened last notification.")
-    user_ids = await state.get_value(NOTIFICATION_CHAT_IDS_KEY)
+    broadcast_id = await state.get_value(NOTIFICATION_BROADCAST_ID_KEY)
     message_text = await state.get_value(NOTIFICATION_MESSAGE_TEXT_KEY)
-    if user_ids and len(user_ids) > 0:
+    message_count = (
+        await BroadcastReceipt.count(session=session, broadcast_id=broadcast_id)
+        if broadcast_id
+        else 0
+    )
+    if message_count > 0:
         await callback.message.edit_text(
             text=_("notification:message:last_notification").format(
-                message_count=len(user_ids),
+                message_count=message_count,
                 message_text=message_text,
             ),
             reply_markup=last_notification_keyboard(),
@@ -352,6 +400,23 @@ async def message_edit(
         )
 
 
+async def notify_if_broadcast_running(
+    session: AsyncSession,
+    broadcast_id: int,
+    callback: CallbackQuery,
+    services: ServicesContainer,
+) -> bool:
+    broadcast = await Broadcast.get(session=session, broadcast_id=broadcast_id)
+    if broadcast and broadcast.status == BroadcastStatus.RUNNING:
+        await services.notification.notify_by_message(
+            message=callback.message,
+            text=_("notification:ntf:broadcast_running"),
+            duration=5,
+        )
+        return True
+    return False
+
+
 @router.callback_query(
     F.data == NavAdminTools.CONFIRM_SEND_NOTIFICATION,
     NotificationStates.message_edit,
@@ -360,14 +425,13 @@ async def message_edit(
 async def callback_confirm_edit_notification(
     callback: CallbackQuery,
     user: User,
+    session: AsyncSession,
     state: FSMContext,
     services: ServicesContainer,
 ) -> None:
     logger.info(f"Admin {user.tg_id} confirmed edit notification.")
     text = await state.get_value(NOTIFICATION_PRE_MESSAGE_TEXT_KEY)
-    chat_ids = await state.get_value(NOTIFICATION_CHAT_IDS_KEY)
-    last_message_ids = await state.get_value(NOTIFICATION_LAST_MESSAGE_IDS_KEY)
-    chat_ids_count = len(chat_ids)
+    broadcast_id = await state.get_value(NOTIFICATION_BROADCAST_ID_KEY)
 
     if not is_valid_message_text(text):
         await services.notification.notify_by_message(
@@ -377,134 +441,60 @@ async def callback_confirm_edit_notification(
         )
         return None
 
-    await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: text})
-
-    if chat_ids and last_message_ids and chat_ids_count > 0:
-        if chat_ids_count > 1:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:editing_notification").format(
-                    count=chat_ids_count,
-                ),
-                duration=5,
-            )
-        success = 0
-        edited = False
-        for chat_id, last_message_id in zip(chat_ids, last_message_ids):
-
-            try:
-                edited = await callback.message.bot.edit_message_text(
-                    text=text,
-                    chat_id=chat_id,
-                    message_id=last_message_id,
-                    reply_markup=close_notification_keyboard(),
-                )
-
-                if edited:
-                    success += 1
-            except Exception as exception:
-                logger.error(
-                    f"Error editing message {last_message_id} from chat {chat_id}: {exception}"
-                )
-                chat_ids.remove(chat_id)
-                last_message_ids.remove(last_message_id)
-
-        await state.update_data({NOTIFICATION_CHAT_IDS_KEY: chat_ids})
-        await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: last_message_ids})
-
-        await show_notification_main(message=callback.message, state=state)
-
-        if not edited:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:edited_failed"),
-                duration=5,
-            )
-            return None
-
-        if chat_ids_count > 1:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:edited_success_all").format(
-                    success=success,
-                    failed=chat_ids_count - success,
-                ),
-                duration=5,
-            )
-        else:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:edited_success"),
-                duration=5,
-            )
-    else:
+    message_count = (
+        await BroadcastReceipt.count(session=session, broadcast_id=broadcast_id)
+        if broadcast_id
+        else 0
+    )
+    if not message_count:
         await services.notification.notify_by_message(
             message=callback.message,
             text=_("notification:ntf:no_messages_to_edit"),
             duration=5,
         )
+        return None
+
+    if await notify_if_broadcast_running(
+        session=session, broadcast_id=broadcast_id, callback=callback, services=services
+    ):
+        return None
+
+    await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: text})
+    services.broadcast.edit(broadcast_id=broadcast_id, admin_tg_id=user.tg_id, text=text)
+    await show_notification_main(message=callback.message, state=state)
+    await services.notification.notify_by_message(
+        message=callback.message,
+        text=_("notification:ntf:editing_notification").format(count=message_count),
+        duration=5,
+    )
 
 
 @router.callback_query(F.data == NavAdminTools.DELETE_NOTIFICATION, IsAdmin())
 async def callback_delete_notification(
     callback: CallbackQuery,
     user: User,
+    session: AsyncSession,
     state: FSMContext,
     services: ServicesContainer,
 ) -> None:
     logger.info(f"Admin {user.tg_id} delete notification.")
-    chat_ids = await state.get_value(NOTIFICATION_CHAT_IDS_KEY)
-    last_message_ids = await state.get_value(NOTIFICATION_LAST_MESSAGE_IDS_KEY)
-    chat_ids_count = len(chat_ids)
-
-    if last_message_ids and chat_ids and chat_ids_count > 0:
-        for chat_id, last_message_id in zip(chat_ids, last_message_ids):
-            deleted = False
-            success = 0
-
-            try:
-                deleted = await callback.message.bot.delete_message(
-                    chat_id=chat_id,
-                    message_id=last_message_id,
-                )
-                if deleted:
-                    success += 1
-            except Exception as exception:
-                logger.error(
-                    f"Error deleting message {last_message_id} from chat {chat_id}: {exception}"
-                )
-
-        await state.update_data({NOTIFICATION_CHAT_IDS_KEY: None})
-        await state.update_data({NOTIFICATION_LAST_MESSAGE_IDS_KEY: None})
-        await state.update_data({NOTIFICATION_MESSAGE_TEXT_KEY: None})
-        await show_notification_main(message=callback.message, state=state)
+    broadcast_id = await state.get_value(NOTIFICATION_BROADCAST_ID_KEY)
 
-        if not deleted:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:deleted_failed"),
-                duration=5,
-            )
-            return None
-
-        if chat_ids_count > 1:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:deleted_success_all").format(
-                    success=success,
-                    failed=chat_ids_count - success,
-                ),
-                duration=5,
-            )
-        else:
-            await services.notification.notify_by_message(
-                message=callback.message,
-                text=_("notification:ntf:deleted_success"),
-                duration=5,
-            )
-    else:
+    if not broadcast_id:
         await services.notification.notify_by_message(
             message=callback.message,
             text=_("notification:ntf:deleted_failed"),
             duration=5,
         )
+        return None
+
+    if await notify_if_broadcast_running(
+        session=session, broadcast_id=broadcast_id, callback=callback, services=services
+    ):
+        return None
+
+    services.broadcast.delete(broadcast_id=broadcast_id, admin_tg_id=user.tg_id)
+    await state.update_data(
+        {NOTIFICATION_BROADCAST_ID_KEY: None, NOTIFICATION_MESSAGE_TEXT_KEY: None}
+    )
+    await show_notification_main(message=callback.message, state=state)
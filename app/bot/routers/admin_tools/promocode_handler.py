@@ -3,14 +3,19 @@ import logging
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import BufferedInputFile, CallbackQuery, Message
 from aiogram.utils.i18n import gettext as _
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.filters import IsAdmin
 from app.bot.models import ServicesContainer
 from app.bot.routers.misc.keyboard import back_keyboard
-from app.bot.utils.constants import INPUT_PROMOCODE_KEY, MAIN_MESSAGE_ID_KEY
+from app.bot.utils.constants import (
+    INPUT_PROMOCODE_AMOUNT_KEY,
+    INPUT_PROMOCODE_KEY,
+    MAIN_MESSAGE_ID_KEY,
+    PROMOCODE_BULK_MAX_AMOUNT,
+)
 from app.bot.utils.formatting import format_subscription_period
 from app.bot.utils.navigation import NavAdminTools
 from app.db.models import Promocode, User
@@ -25,6 +30,11 @@ class CreatePromocodeStates(StatesGroup):
     selecting_duration = State()
 
 
+class BulkCreatePromocodeStates(StatesGroup):
+    amount_input = State()
+    selecting_duration = State()
+
+
 class DeletePromocodeStates(StatesGroup):
     promocode_input = State()
 
@@ -93,6 +103,90 @@ async def callback_duration_selected(
 # endregion
 
 
+# region: Bulk Create Promocodes
+@router.callback_query(F.data == NavAdminTools.BULK_CREATE_PROMOCODE, IsAdmin())
+async def callback_bulk_create_promocode(
+    callback: CallbackQuery,
+    user: User,
+    state: FSMContext,
+) -> None:
+    logger.info(f"Admin {user.tg_id} started creating promocodes in bulk.")
+    await state.set_state(BulkCreatePromocodeStates.amount_input)
+    await callback.message.edit_text(
+        text=_("promocode_editor:message:bulk_create").format(max_amount=PROMOCODE_BULK_MAX_AMOUNT),
+        reply_markup=back_keyboard(NavAdminTools.PROMOCODE_EDITOR),
+    )
+
+
+@router.message(BulkCreatePromocodeStates.amount_input, IsAdmin())
+async def handle_promocode_amount_input(
+    message: Message,
+    user: User,
+    state: FSMContext,
+    services: ServicesContainer,
+) -> None:
+    input_amount = message.text.strip() if message.text else ""
+    logger.info(f"Admin {user.tg_id} entered promocodes amount: {input_amount}.")
+
+    if not input_amount.isdigit() or not 0 < int(input_amount) <= PROMOCODE_BULK_MAX_AMOUNT:
+        await services.notification.notify_by_message(
+            message=message,
+            text=_("promocode_editor:ntf:bulk_amount_invalid").format(
+                max_amount=PROMOCODE_BULK_MAX_AMOUNT
+            ),
+            duration=5,
+        )
+        return
+
+    await state.set_state(BulkCreatePromocodeStates.selecting_duration)
+    await state.update_data({INPUT_PROMOCODE_AMOUNT_KEY: int(input_amount)})
+    main_message_id = await state.get_value(MAIN_MESSAGE_ID_KEY)
+    await message.bot.edit_message_text(
+        text=_("promocode_editor:message:bulk_duration").format(amount=input_amount),
+        chat_id=message.chat.id,
+        message_id=main_message_id,
+        reply_markup=promocode_duration_keyboard(),
+    )
+
+
+@router.callback_query(BulkCreatePromocodeStates.selecting_duration, IsAdmin())
+async def callback_bulk_duration_selected(
+    callback: CallbackQuery,
+    user: User,
+    session: AsyncSession,
+    state: FSMContext,
+    services: ServicesContainer,
+) -> None:
+    amount = await state.get_value(INPUT_PROMOCODE_AMOUNT_KEY)
+    duration = int(callback.data)
+    logger.info(f"Admin {user.tg_id} selected {duration} days for {amount} promocodes.")
+    codes = await Promocode.create_bulk(session=session, amount=amount, duration=duration)
+    await show_promocode_editor_main(message=callback.message, state=state)
+
+    if not codes:
+        await services.notification.notify_by_message(
+            message=callback.message,
+            text=_("promocode_editor:ntf:bulk_create_failed"),
+            duration=5,
+        )
+        return
+
+    file = BufferedInputFile(
+        file="\n".join(codes).encode(),
+        filename=f"promocodes_{duration}d_{len(codes)}.txt",
+    )
+    await callback.message.answer_document(
+        document=file,
+        caption=_("promocode_editor:ntf:bulk_created_success").format(
+            amount=len(codes),
+            duration=format_subscription_period(duration),
+        ),
+    )
+
+
+# endregion
+
+
 # region: Delete Promocode
 @router.callback_query(F.data == NavAdminTools.DELETE_PROMOCODE, IsAdmin())
 async def callback_delete_promocode(callback: CallbackQuery, user: User, state: FSMContext) -> None:
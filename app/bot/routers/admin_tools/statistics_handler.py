@@ -3,16 +3,86 @@ import logging
 from aiogram import F, Router
 from aiogram.types import CallbackQuery
 from aiogram.utils.i18n import gettext as _
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.filters import IsAdmin
+from app.bot.payment_gateways import GatewayFactory
+from app.bot.routers.misc.keyboard import back_keyboard
+from app.bot.utils.constants import STATISTICS_PERIOD_DAYS, StatisticMetric
+from app.bot.utils.formatting import format_device_count, format_subscription_period
 from app.bot.utils.navigation import NavAdminTools
-from app.db.models import User
+from app.db.models import Statistic, User
 
 logger = logging.getLogger(__name__)
 router = Router(name=__name__)
 
 
+def format_number(value: float) -> str:
+    return str(int(value)) if value == int(value) else f"{value:.2f}"
+
+
+def format_lines(
+    values: dict[str, tuple[float, float]],
+    names: dict[str, str] | None = None,
+) -> str:
+    if not values:
+        return _("statistics:message:no_data")
+    names = names or {}
+    rows = sorted(values.items(), key=lambda item: item[1][1], reverse=True)
+    return "\n".join(
+        f"• {names.get(key, key) or '—'}: {format_number(today)} / {format_number(period)}"
+        for key, (today, period) in rows
+    )
+
+
+def format_snapshot(values: dict[str, float]) -> str:
+    if not values:
+        return _("statistics:message:no_data")
+    rows = sorted(values.items(), key=lambda item: item[1], reverse=True)
+    return "\n".join(f"• {key or '—'}: {format_number(value)}" for key, value in rows)
+
+
+def format_plan(plan: str) -> str:
+    devices, duration = plan.split(":")
+    return f"{format_device_count(int(devices))}, {format_subscription_period(int(duration))}"
+
+
+def format_total(values: dict[str, tuple[float, float]]) -> str:
+    today = sum(value[0] for value in values.values())
+    period = sum(value[1] for value in values.values())
+    return f"{format_number(today)} / {format_number(period)}"
+
+
 @router.callback_query(F.data == NavAdminTools.STATISTICS, IsAdmin())
-async def callback_statistics(callback: CallbackQuery, user: User) -> None:
+async def callback_statistics(
+    callback: CallbackQuery,
+    user: User,
+    session: AsyncSession,
+    gateway_factory: GatewayFactory,
+) -> None:
     logger.info(f"Admin {user.tg_id} opened statistics.")
-    await callback.answer(text=_("global:popup:development"), show_alert=True)
+    summary = await Statistic.get_summary(session=session, days=STATISTICS_PERIOD_DAYS)
+    servers = await Statistic.get_latest(session, StatisticMetric.SUBSCRIPTIONS_BY_SERVER)
+    locations = await Statistic.get_latest(session, StatisticMetric.SUBSCRIPTIONS_BY_LOCATION)
+
+    plans = summary.get(StatisticMetric.PAYMENTS_BY_PLAN, {})
+    gateway_names = {
+        gateway.callback.value: str(gateway.name) for gateway in gateway_factory.get_gateways()
+    }
+
+    await callback.message.edit_text(
+        text=_("statistics:message:main").format(
+            days=STATISTICS_PERIOD_DAYS,
+            new_users=format_total(summary.get(StatisticMetric.NEW_USERS, {})),
+            trials=format_total(summary.get(StatisticMetric.TRIALS, {})),
+            payments=format_total(summary.get(StatisticMetric.PAYMENTS_BY_GATEWAY, {})),
+            revenue=format_lines(summary.get(StatisticMetric.REVENUE, {})),
+            gateways=format_lines(
+                summary.get(StatisticMetric.PAYMENTS_BY_GATEWAY, {}), gateway_names
+            ),
+            plans=format_lines(plans, {plan: format_plan(plan) for plan in plans}),
+            servers=format_snapshot(servers),
+            locations=format_snapshot(locations),
+        ),
+        reply_markup=back_keyboard(NavAdminTools.MAIN),
+    )
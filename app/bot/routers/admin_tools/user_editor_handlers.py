@@ -6,7 +6,6 @@ from aiogram.types import InlineKeyboardButton
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from sqlalchemy import delete
 
 logger = logging.getLogger(__name__)
 
@@ -25,23 +24,37 @@ from app.bot.services.vpn import VPNService
 from app.bot.services.server_pool import ServerPoolService
 from app.bot.utils.navigation import NavAdminTools 
 from app.bot.utils.constants import UNLIMITED
-from app.db.models import User, Server, Transaction
+from app.db.models import User, Server
 from app.bot.models import ServicesContainer
 
 router = Router(name="admin_user_editor")
 
-async def get_total_users_count(session_maker: async_sessionmaker) -> int:
-    async with session_maker() as session:
-        all_users = await User.get_all(session) 
-        return len(all_users)
+# FSM key holding the last user id before each visited page of the user list.
+USER_LIST_CURSORS_KEY = "user_list_cursors"
+
+async def get_users_page(session: AsyncSession, state: FSMContext, page: int) -> tuple[int, list[User]]:
+    data = await state.get_data()
+    cursors = data.get(USER_LIST_CURSORS_KEY) or [0]
+    # Pages are walked one at a time, a page without a known cursor falls back to the last one.
+    page = min(page, len(cursors) - 1)
+
+    users_page = await User.get_all(session, limit=USERS_PER_PAGE, after_id=cursors[page])
+    if users_page:
+        cursors = cursors[: page + 1] + [users_page[-1].id]
+    await state.update_data({USER_LIST_CURSORS_KEY: cursors})
+    return page, users_page
+
+async def get_total_pages(session: AsyncSession) -> int:
+    total_users = await User.count(session)
+    return (total_users + USERS_PER_PAGE - 1) // USERS_PER_PAGE
 
 @router.callback_query(F.data == NavAdminTools.USER_EDITOR)
-async def handle_user_editor_entry(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession, session_maker: async_sessionmaker):
+async def handle_user_editor_entry(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     await state.set_state(AdminEditUserStates.browsing_user_list)
-    
-    users_page = await User.get_all(session, limit=USERS_PER_PAGE, offset=0)
-    total_users = await get_total_users_count(session_maker) 
-    total_pages = (total_users + USERS_PER_PAGE - 1) // USERS_PER_PAGE
+    await state.update_data({USER_LIST_CURSORS_KEY: None})
+
+    current_page, users_page = await get_users_page(session, state, page=0)
+    total_pages = await get_total_pages(session)
 
     if not users_page:
         # TODO: Add a specific message for no users found, maybe with just search and back buttons
@@ -51,7 +64,7 @@ async def handle_user_editor_entry(callback: types.CallbackQuery, state: FSMCont
             _("user_editor:prompt:select_user_or_search"),
             reply_markup=user_selection_list_keyboard(
                 users=users_page, 
-                current_page=0, 
+                current_page=current_page, 
                 total_pages=total_pages
             )
         )
@@ -84,8 +97,7 @@ async def handle_user_list_navigation(
     callback: types.CallbackQuery, 
     state: FSMContext, 
     callback_data: AdminEditUserAction, 
-    session: AsyncSession, 
-    session_maker: async_sessionmaker
+    session: AsyncSession
 ):
     current_page = callback_data.page if callback_data.page is not None else 0
     data = await state.get_data()
@@ -96,24 +108,20 @@ async def handle_user_list_navigation(
         search_query = None
         is_search_mode = False
         current_page = 0
-        await state.update_data(current_search_query=None, is_search_mode=False)
+        await state.update_data({"current_search_query": None, "is_search_mode": False, USER_LIST_CURSORS_KEY: None})
         await state.set_state(AdminEditUserStates.browsing_user_list)
 
     if callback_data.action == "user_list_page":
          await state.set_state(AdminEditUserStates.browsing_user_list)
 
-    offset = current_page * USERS_PER_PAGE
-
     if is_search_mode and search_query:
-        users_page = await User.search_users(session, query_text=search_query, limit=USERS_PER_PAGE, offset=offset)
-        async with session_maker() as count_session:
-             all_search_results_for_count = await User.search_users(count_session, query_text=search_query)
-        total_pages = (len(all_search_results_for_count) + USERS_PER_PAGE - 1) // USERS_PER_PAGE
+        offset = current_page * USERS_PER_PAGE
+        users_page, total_found = await User.search_users(session, query_text=search_query, limit=USERS_PER_PAGE, offset=offset)
+        total_pages = (total_found + USERS_PER_PAGE - 1) // USERS_PER_PAGE
         list_title = _("user_editor:message:search_results_for").format(query=search_query)
     else:
-        users_page = await User.get_all(session, limit=USERS_PER_PAGE, offset=offset)
-        total_users = await get_total_users_count(session_maker)
-        total_pages = (total_users + USERS_PER_PAGE - 1) // USERS_PER_PAGE
+        current_page, users_page = await get_users_page(session, state, page=current_page)
+        total_pages = await get_total_pages(session)
         list_title = _("user_editor:prompt:select_user_or_search")
     
     if not users_page and current_page == 0:
@@ -146,8 +154,7 @@ async def handle_search_user_prompt(callback: types.CallbackQuery, state: FSMCon
 async def handle_user_search_query(
     message: types.Message, 
     state: FSMContext, 
-    session: AsyncSession, 
-    session_maker: async_sessionmaker
+    session: AsyncSession
 ):
     search_query = message.text
     if not search_query or len(search_query) < 1: # Basic validation
@@ -158,11 +165,8 @@ async def handle_user_search_query(
     await state.update_data(current_search_query=search_query, is_search_mode=True)
     await state.set_state(AdminEditUserStates.browsing_user_list) # Switch back to browsing to display results
 
-    users_page = await User.search_users(session, query_text=search_query, limit=USERS_PER_PAGE, offset=0)
-    
-    async with session_maker() as count_session:
-        all_search_results_for_count = await User.search_users(count_session, query_text=search_query) 
-    total_pages = (len(all_search_results_for_count) + USERS_PER_PAGE - 1) // USERS_PER_PAGE
+    users_page, total_found = await User.search_users(session, query_text=search_query, limit=USERS_PER_PAGE, offset=0)
+    total_pages = (total_found + USERS_PER_PAGE - 1) // USERS_PER_PAGE
     
     if not users_page:
         await message.answer(
@@ -712,14 +716,7 @@ async def handle_execute_delete_action(
     if delete_type in ["db", "all"]:
         try:
             async with session_maker() as session_delete:
-                user_to_delete = await User.get(session_delete, tg_id=target_user_id)
-                if user_to_delete:
-                    await session_delete.execute(
-                        delete(Transaction).where(Transaction.tg_id == target_user_id)
-                    )
-                    await session_delete.delete(user_to_delete)
-                    await session_delete.commit()
-                    
+                if await User.delete(session_delete, tg_id=target_user_id):
                     check_user = await User.get(session_delete, tg_id=target_user_id)
                     if check_user:
                         delete_db_success = False
@@ -739,13 +736,13 @@ async def handle_execute_delete_action(
     await callback.message.edit_text(final_message_text)
         
     await state.set_state(AdminEditUserStates.browsing_user_list)
-    await show_user_list(callback.message, session_maker)
+    await show_user_list(callback.message, state, session_maker)
 
-async def show_user_list(message: types.Message, session_maker: async_sessionmaker):
+async def show_user_list(message: types.Message, state: FSMContext, session_maker: async_sessionmaker):
     async with session_maker() as session_list:
-        users_page = await User.get_all(session_list, limit=USERS_PER_PAGE, offset=0)
-        total_users = await get_total_users_count(session_maker)
-        total_pages = (total_users + USERS_PER_PAGE - 1) // USERS_PER_PAGE
+        await state.update_data({USER_LIST_CURSORS_KEY: None})
+        current_page, users_page = await get_users_page(session_list, state, page=0)
+        total_pages = await get_total_pages(session_list)
 
         if not users_page:
             await message.answer(_("user_editor:message:no_users_found_initial"))
@@ -754,7 +751,7 @@ async def show_user_list(message: types.Message, session_maker: async_sessionmak
                 _("user_editor:prompt:select_user_or_search"),
                 reply_markup=user_selection_list_keyboard(
                     users=users_page,
-                    current_page=0,
+                    current_page=current_page,
                     total_pages=total_pages
                 )
             )
@@ -929,11 +926,16 @@ async def handle_execute_creation(callback: types.CallbackQuery, state: FSMConte
             username = None
             first_name = f"User {target_user_id}"
 
-        user = User(
+        user = await User.create(
+            session,
             tg_id=target_user_id,
             username=username,
-            first_name=first_name
+            first_name=first_name,
         )
+        if not user:
+            await callback.message.edit_text(_("user_editor:error:user_creation_failed").format(user_id=target_user_id))
+            await state.clear()
+            return
 
     created_user = await services.vpn.create_client(
         user=user,
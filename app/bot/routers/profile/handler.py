@@ -1,5 +1,4 @@
 from __future__ import annotations
-import asyncio
 import logging
 from typing import Optional
 import io
@@ -13,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.models import ClientData
 from app.bot.services import ServicesContainer
-from app.bot.utils.constants import PREVIOUS_CALLBACK_KEY
+from app.bot.utils.constants import KEY_MESSAGE_COUNTDOWN, PREVIOUS_CALLBACK_KEY
 from app.bot.utils.navigation import NavProfile
 from app.bot.utils.qrcode import generate_qr_code
 from app.db.models import User, Server
@@ -154,8 +153,4 @@ async def callback_show_key(
         parse_mode="HTML"
     )
 
-    await asyncio.sleep(10)
-    try:
-        await sent_message.delete()
-    except Exception as e:
-        logger.warning(f"Could not delete key message for user {user.tg_id}: {e}")
+    await services.notification.delete_later(message=sent_message, delay=KEY_MESSAGE_COUNTDOWN)
@@ -16,7 +16,7 @@ from app.bot.utils.constants import (
 from app.bot.utils.formatting import format_subscription_period
 from app.bot.utils.navigation import NavMain, NavReferral
 from app.config import Config
-from app.db.models import Referral, ReferrerReward, User
+from app.db.models import ReferrerStats, User
 
 from .keyboard import referral_keyboard
 
@@ -41,27 +41,21 @@ async def generate_referral_summary_text(
             referred_duration=referred_duration,
         )
 
-    referrals_count = await Referral.get_referral_count(session=session, referrer_tg_id=user.tg_id)
+    stats = await ReferrerStats.get(session=session, tg_id=user.tg_id)
     text += _("referral:message:user_summary_invite_link").format(
         referral_link=referral_link,
-        referrals_count=referrals_count,
+        referrals_count=stats.referrals_count if stats else 0,
     )
 
     referrer_reward_enabled = config.shop.REFERRER_REWARD_ENABLED
 
     if referrer_reward_enabled:
         reward_type = ReferrerRewardType.from_str(config.shop.REFERRER_REWARD_TYPE)
-        first_level_rewards_sum = await ReferrerReward.get_rewards_sum(
-            session=session,
-            tg_id=user.tg_id,
-            reward_type=reward_type,
-            reward_level=ReferrerRewardLevel.FIRST_LEVEL,
+        first_level_rewards_sum = (
+            stats.get_rewards_sum(reward_type, ReferrerRewardLevel.FIRST_LEVEL) if stats else 0
         )
-        second_level_rewards_sum = await ReferrerReward.get_rewards_sum(
-            session=session,
-            tg_id=user.tg_id,
-            reward_type=reward_type,
-            reward_level=ReferrerRewardLevel.SECOND_LEVEL,
+        second_level_rewards_sum = (
+            stats.get_rewards_sum(reward_type, ReferrerRewardLevel.SECOND_LEVEL) if stats else 0
         )
 
         if reward_type == ReferrerRewardType.DAYS:
@@ -87,13 +81,10 @@ async def generate_referral_summary_text(
 
             # TODO: handle and format money currencies
 
-        pending_rewards_count = await ReferrerReward.get_pending_rewards_count(
-            session=session, user_tg_id=user.tg_id
-        )
         text += _("referral:message:user_summary_referrer_rewards").format(
             first_level_rewards_sum=first_level_rewards_sum,
             second_level_rewards_sum=second_level_rewards_sum,
-            pending_rewards_count=pending_rewards_count,
+            pending_rewards_count=stats.pending_rewards if stats else 0,
         )
 
     return text
@@ -123,13 +123,15 @@ async def successful_payment(
         )
 
     data = SubscriptionData.unpack(message.successful_payment.invoice_payload)
-    transaction = await Transaction.create(
+    payment_id = message.successful_payment.telegram_payment_charge_id
+    # Created pending, the fulfilment completes it like the payments of other gateways.
+    await Transaction.create(
         session=session,
         tg_id=user.tg_id,
-        subscription=data.pack(),
-        payment_id=message.successful_payment.telegram_payment_charge_id,
-        status=TransactionStatus.COMPLETED,
+        **data.to_transaction(),
+        payment_id=payment_id,
+        status=TransactionStatus.PENDING,
     )
 
     gateway = gateway_factory.get_gateway(NavSubscription.PAY_TELEGRAM_STARS)
-    await gateway.handle_payment_succeeded(payment_id=transaction.payment_id)
+    await gateway.handle_payment_succeeded(payment_id=payment_id)
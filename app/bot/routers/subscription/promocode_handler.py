@@ -54,9 +54,14 @@ async def handle_promocode_input(
         )
         return
 
-    promocode = await Promocode.get(session=session, code=input_promocode)
-    if promocode and not promocode.is_activated:
-        success = await services.vpn.activate_promocode(user=user, promocode=promocode)
+    # Claim the promocode first, so it can be redeemed only once even by concurrent requests.
+    promocode = await Promocode.set_activated(
+        session=session, code=input_promocode, user_id=user.tg_id
+    )
+    if promocode:
+        success = await services.vpn.activate_promocode(
+            user=user, promocode=promocode, session=session
+        )
         main_message_id = await state.get_value(MAIN_MESSAGE_ID_KEY)
         if success:
             await message.bot.edit_message_text(
@@ -69,6 +74,7 @@ async def handle_promocode_input(
                 reply_markup=promocode_keyboard(),
             )
         else:
+            await Promocode.set_deactivated(session=session, code=promocode.code)
             text = _("promocode:ntf:activate_failed")
             await services.notification.notify_by_message(message=message, text=text, duration=5)
     else:
@@ -731,26 +731,21 @@ async def handle_promocode_input(
     promocode_text = message.text.strip().upper()
     logger.info(f"User {user.tg_id} entered promocode: '{promocode_text}'")
 
-    promocode = await Promocode.get(session, code=promocode_text)
-
-    if not promocode:
-        await message.answer(_("promocode:ntf:activate_invalid"))
-        return
-
-    if promocode.is_activated:
-        await message.answer(_("promocode:ntf:activate_invalid"))
-        return
-
-
     client_data = await services.vpn.get_client_data(user, session=session)
     if not client_data or client_data.has_subscription_expired:
         await message.answer(_("promocode:ntf:no_active_sub_for_promo"))
         return
 
+    # Claim the promocode first, so it can be redeemed only once even by concurrent requests.
+    promocode = await Promocode.set_activated(session, code=promocode_text, user_id=user.tg_id)
+
+    if not promocode:
+        await message.answer(_("promocode:ntf:activate_invalid"))
+        return
+
     success = await services.vpn.activate_promocode(user, promocode, session=session)
 
     if success:
-        await Promocode.set_activated(session, code=promocode.code, user_id=user.tg_id)
         await message.answer(
             _("promocode:message:activated_success").format(
                 promocode=promocode.code,
@@ -758,6 +753,7 @@ async def handle_promocode_input(
             )
         )
     else:
+        await Promocode.set_deactivated(session, code=promocode.code)
         await message.answer(_("promocode:ntf:activate_failed"))
 
     await state.clear()
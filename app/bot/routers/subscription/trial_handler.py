@@ -1,5 +1,4 @@
 import logging
-import asyncio
 import io
 
 import qrcode
@@ -11,7 +10,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.bot.models import ServicesContainer
 from app.bot.routers.subscription.keyboard import trial_success_keyboard
-from app.bot.utils.constants import MAIN_MESSAGE_ID_KEY, PREVIOUS_CALLBACK_KEY
+from app.bot.utils.constants import (
+    KEY_MESSAGE_COUNTDOWN,
+    MAIN_MESSAGE_ID_KEY,
+    PREVIOUS_CALLBACK_KEY,
+)
 from app.bot.utils.formatting import format_subscription_period
 from app.bot.utils.navigation import NavMain, NavSubscription
 from app.config import Config
@@ -64,24 +67,22 @@ async def callback_get_trial(
             qr_code_file = BufferedInputFile(img_byte_arr.read(), filename="qr_code.png")
             
             key_text = _("profile:message:key")
+            captions = {
+                seconds: key_text.format(
+                    key=key,
+                    seconds_text=_("1 second", "{} seconds", seconds).format(seconds),
+                )
+                for seconds in range(1, KEY_MESSAGE_COUNTDOWN + 1)
+            }
             message = await callback.message.answer_photo(
                 photo=qr_code_file,
-                caption=key_text.format(key=key, seconds_text=_("10 seconds")),
+                caption=captions[KEY_MESSAGE_COUNTDOWN],
+            )
+            await services.message_deletion.schedule_countdown(
+                chat_id=message.chat.id,
+                message_id=message.message_id,
+                captions=captions,
             )
-
-            for seconds in range(9, 0, -1):
-                seconds_text = _("1 second", "{} seconds", seconds).format(seconds)
-                await asyncio.sleep(1)
-                try:
-                    await message.edit_caption(caption=key_text.format(key=key, seconds_text=seconds_text))
-                except Exception as e:
-                    logger.debug(f"Failed to edit caption, probably message was deleted by user. {e}")
-                    break
-            
-            try:
-                await message.delete()
-            except Exception as e:
-                logger.debug(f"Failed to delete message, probably already deleted. {e}")
     else:
         text = _("subscription:popup:trial_activate_failed")
         await services.notification.show_popup(callback=callback, text=text)
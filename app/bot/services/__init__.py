@@ -1,9 +1,12 @@
 from aiogram import Bot
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.bot.models import ServicesContainer
 from app.config import Config
 
+from .broadcast import BroadcastService
+from .message_deletion import MessageDeletionService
 from .notification import NotificationService
 from .plan import PlanService
 from .referral import ReferralService
@@ -16,13 +19,18 @@ async def initialize(
     config: Config,
     session: async_sessionmaker,
     bot: Bot,
+    redis: Redis,
 ) -> ServicesContainer:
     server_pool = ServerPoolService(config=config, session=session)
     plan = PlanService()
     vpn = VPNService(config=config, session=session, server_pool_service=server_pool)
-    notification = NotificationService(config=config, bot=bot)
+    message_deletion = MessageDeletionService(bot=bot, redis=redis)
+    notification = NotificationService(
+        config=config, bot=bot, message_deletion=message_deletion
+    )
     referral = ReferralService(config=config, session_factory=session, vpn_service=vpn)
     subscription = SubscriptionService(config=config, session_factory=session, vpn_service=vpn)
+    broadcast = BroadcastService(config=config, session_factory=session, bot=bot)
 
     return ServicesContainer(
         server_pool=server_pool,
@@ -31,4 +39,6 @@ async def initialize(
         notification=notification,
         referral=referral,
         subscription=subscription,
+        broadcast=broadcast,
+        message_deletion=message_deletion,
     )
@@ -0,0 +1,431 @@
+import asyncio
+import html
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+from aiogram.utils.i18n import gettext as _
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.bot.routers.misc.keyboard import close_notification_keyboard
+from app.bot.utils.constants import (
+    BROADCAST_BATCH_SIZE,
+    BROADCAST_PROGRESS_INTERVAL,
+    BROADCAST_RATE_LIMIT,
+    BROADCAST_RETRY_ATTEMPTS,
+    BROADCAST_RETRY_SECONDS,
+    BROADCAST_WORKERS,
+    BroadcastSegment,
+    BroadcastStatus,
+)
+from app.bot.utils.rate_limiter import TokenBucket
+from app.config import Config
+from app.db.models import Broadcast, BroadcastReceipt, User
+
+logger = logging.getLogger(__name__)
+
+SEND_ATTEMPTS = 3
+
+
+@dataclass
+class BroadcastProgress:
+    sent: int = 0
+    failed: int = 0
+    receipts: list[tuple[int, int]] = field(default_factory=list)
+
+
+class BroadcastService:
+    """
+    Sends, edits and deletes admin notifications in the background.
+
+    Every broadcast is a row in the broadcasts table with a checkpoint, so it survives
+    restarts, and every delivered message is a row in broadcast_receipts. Messages are sent,
+    edited and deleted by BROADCAST_WORKERS concurrent senders that share one token bucket,
+    which keeps the bot under the Bot API limit and pauses all of them on a flood-wait reply.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        session_factory: async_sessionmaker,
+        bot: Bot,
+    ) -> None:
+        self.config = config
+        self.session_factory = session_factory
+        self.bot = bot
+        self.bucket = TokenBucket(rate=BROADCAST_RATE_LIMIT)
+        self._tasks: set[asyncio.Task] = set()
+        logger.info("Broadcast Service initialized.")
+
+    async def start(
+        self,
+        admin_tg_id: int,
+        text: str,
+        segment: BroadcastSegment = BroadcastSegment.ALL,
+        segment_value: str | None = None,
+    ) -> Broadcast:
+        """
+        Creates a broadcast to a segment of users and starts sending it in the background.
+
+        Args:
+            admin_tg_id (int): Telegram user ID of the admin, who receives the progress.
+            text (str): Text of the message.
+            segment (BroadcastSegment): Audience of the broadcast.
+            segment_value (str | None): Parameter of the segment, if it takes one.
+
+        Returns:
+            Broadcast: The created broadcast.
+        """
+        async with self.session_factory() as session:
+            total = await User.count_segment(
+                session=session, filters=User.get_segment_filters(segment, segment_value)
+            )
+
+        progress_message = await self.bot.send_message(
+            chat_id=admin_tg_id,
+            text=_("notification:ntf:sending_to_all").format(count=total),
+        )
+
+        async with self.session_factory() as session:
+            broadcast = await Broadcast.create(
+                session=session,
+                admin_tg_id=admin_tg_id,
+                text=text,
+                segment=segment,
+                segment_value=segment_value,
+                total=total,
+                progress_message_id=progress_message.message_id,
+            )
+
+        self._spawn(self._run(broadcast.id))
+        return broadcast
+
+    async def send_to_user(self, admin_tg_id: int, chat_id: int, text: str) -> Broadcast | None:
+        """
+        Sends a notification to one user and stores it as a completed broadcast.
+
+        Args:
+            admin_tg_id (int): Telegram user ID of the admin.
+            chat_id (int): Chat of the user.
+            text (str): Text of the message.
+
+        Returns:
+            Broadcast | None: The stored broadcast, or None if the message was not delivered.
+        """
+        message_id = await self._send(chat_id=chat_id, text=text)
+        if not message_id:
+            return None
+
+        async with self.session_factory() as session:
+            return await Broadcast.create(
+                session=session,
+                receipts=[(chat_id, message_id)],
+                admin_tg_id=admin_tg_id,
+                text=text,
+                status=BroadcastStatus.COMPLETED,
+                total=1,
+                sent=1,
+                finished_at=func.now(),
+            )
+
+    async def resume(self) -> None:
+        """Restarts the broadcasts interrupted by a shutdown from their last checkpoint."""
+        async with self.session_factory() as session:
+            broadcasts = await Broadcast.get_running(session=session)
+
+        for broadcast in broadcasts:
+            logger.info(
+                f"Resuming broadcast {broadcast.id} after user {broadcast.last_user_id}."
+            )
+            self._spawn(self._run(broadcast.id))
+
+    def edit(self, broadcast_id: int, admin_tg_id: int, text: str) -> None:
+        """Replaces the text of all delivered messages of a broadcast in the background."""
+        self._spawn(self._edit(broadcast_id=broadcast_id, admin_tg_id=admin_tg_id, text=text))
+
+    def delete(self, broadcast_id: int, admin_tg_id: int) -> None:
+        """Deletes all delivered messages of a broadcast in the background."""
+        self._spawn(self._delete(broadcast_id=broadcast_id, admin_tg_id=admin_tg_id))
+
+    def _spawn(self, coroutine: Awaitable[None]) -> None:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, broadcast_id: int) -> None:
+        async with self.session_factory() as session:
+            broadcast = await Broadcast.get(session=session, broadcast_id=broadcast_id)
+        if not broadcast:
+            logger.error(f"Broadcast {broadcast_id} not found, nothing to send.")
+            return
+
+        progress = BroadcastProgress(sent=broadcast.sent, failed=broadcast.failed)
+        semaphore = asyncio.Semaphore(BROADCAST_WORKERS)
+
+        async def send(chat_id: int) -> None:
+            async with semaphore:
+                message_id = await self._send(chat_id=chat_id, text=broadcast.text)
+
+            if message_id:
+                progress.sent += 1
+                progress.receipts.append((chat_id, message_id))
+            else:
+                progress.failed += 1
+
+        async def get_page() -> list[tuple[int, int]]:
+            # Built per page, so time-based segments stay current in long broadcasts.
+            filters = User.get_segment_filters(broadcast.segment, broadcast.segment_value)
+            async with self.session_factory() as session:
+                return await User.get_chat_ids(
+                    session=session,
+                    after_id=last_user_id,
+                    limit=BROADCAST_BATCH_SIZE,
+                    filters=filters,
+                )
+
+        async def save_page() -> None:
+            async with self.session_factory() as session:
+                await Broadcast.save_progress(
+                    session=session,
+                    broadcast_id=broadcast.id,
+                    last_user_id=last_user_id,
+                    sent=progress.sent - sent,
+                    failed=progress.failed - failed,
+                    receipts=progress.receipts,
+                )
+
+        reporter = asyncio.create_task(self._report_progress(broadcast, progress))
+        last_user_id = broadcast.last_user_id
+        try:
+            while True:
+                recipients = await self._retry(broadcast.id, get_page)
+                if not recipients:
+                    break
+
+                sent, failed = progress.sent, progress.failed
+                await asyncio.gather(*(send(chat_id) for _, chat_id in recipients))
+                last_user_id = recipients[-1][0]
+
+                # Only the checkpoint is retried: sending the page again would duplicate it.
+                await self._retry(broadcast.id, save_page)
+                progress.receipts = []
+        except Exception as exception:
+            logger.error(f"Broadcast {broadcast.id} stopped after user {last_user_id}: {exception}")
+            await self._fail(broadcast, progress, exception)
+            return
+        finally:
+            reporter.cancel()
+
+        async with self.session_factory() as session:
+            await Broadcast.finish(session=session, broadcast_id=broadcast.id)
+
+        await self._edit_progress(
+            broadcast,
+            text=_("notification:ntf:sent_success_all").format(
+                success=progress.sent,
+                failed=progress.failed,
+            ),
+            done=True,
+        )
+
+    async def _retry(self, broadcast_id: int, operation: Callable[[], Awaitable[Any]]) -> Any:
+        delay = BROADCAST_RETRY_SECONDS
+        for attempt in range(1, BROADCAST_RETRY_ATTEMPTS + 1):
+            try:
+                return await operation()
+            except Exception as exception:
+                if attempt == BROADCAST_RETRY_ATTEMPTS:
+                    raise
+                logger.warning(
+                    f"Broadcast {broadcast_id} page failed (attempt {attempt}), "
+                    f"retrying in {delay}s: {exception}"
+                )
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _fail(
+        self,
+        broadcast: Broadcast,
+        progress: BroadcastProgress,
+        exception: Exception,
+    ) -> None:
+        # A failed broadcast is not resumed, so its delivered messages can be edited or deleted.
+        try:
+            async with self.session_factory() as session:
+                await Broadcast.finish(
+                    session=session, broadcast_id=broadcast.id, status=BroadcastStatus.FAILED
+                )
+        except Exception as finish_exception:
+            logger.error(f"Failed to mark broadcast {broadcast.id} as failed: {finish_exception}")
+
+        await self._edit_progress(
+            broadcast,
+            text=_("notification:ntf:broadcast_failed").format(
+                processed=progress.sent + progress.failed,
+                total=broadcast.total,
+                success=progress.sent,
+                failed=progress.failed,
+                error=html.escape(str(exception)),
+            ),
+            done=True,
+        )
+
+    async def _edit(self, broadcast_id: int, admin_tg_id: int, text: str) -> None:
+        async def edit(receipt: BroadcastReceipt) -> Any:
+            return await self._call(
+                self.bot.edit_message_text,
+                text=text,
+                chat_id=receipt.chat_id,
+                message_id=receipt.message_id,
+                reply_markup=close_notification_keyboard(),
+            )
+
+        async with self.session_factory() as session:
+            await Broadcast.update_text(session=session, broadcast_id=broadcast_id, text=text)
+
+        success, failed = await self._apply(broadcast_id, edit)
+
+        # Messages that cannot be edited are gone or blocked, so they are not retried later.
+        async with self.session_factory() as session:
+            await BroadcastReceipt.delete_many(session=session, receipt_ids=failed)
+
+        if not success:
+            summary = _("notification:ntf:edited_failed")
+        elif success + len(failed) == 1:
+            summary = _("notification:ntf:edited_success")
+        else:
+            summary = _("notification:ntf:edited_success_all").format(
+                success=success,
+                failed=len(failed),
+            )
+        await self._notify_admin(admin_tg_id=admin_tg_id, text=summary)
+
+    async def _delete(self, broadcast_id: int, admin_tg_id: int) -> None:
+        async def delete(receipt: BroadcastReceipt) -> Any:
+            return await self._call(
+                self.bot.delete_message,
+                chat_id=receipt.chat_id,
+                message_id=receipt.message_id,
+            )
+
+        success, failed = await self._apply(broadcast_id, delete)
+
+        async with self.session_factory() as session:
+            await BroadcastReceipt.delete_all(session=session, broadcast_id=broadcast_id)
+
+        if not success:
+            summary = _("notification:ntf:deleted_failed")
+        elif success + len(failed) == 1:
+            summary = _("notification:ntf:deleted_success")
+        else:
+            summary = _("notification:ntf:deleted_success_all").format(
+                success=success,
+                failed=len(failed),
+            )
+        await self._notify_admin(admin_tg_id=admin_tg_id, text=summary)
+
+    async def _apply(
+        self,
+        broadcast_id: int,
+        action: Callable[[BroadcastReceipt], Awaitable[Any]],
+    ) -> tuple[int, list[int]]:
+        """
+        Runs an action concurrently for every receipt of a broadcast, page by page.
+
+        Args:
+            broadcast_id (int): ID of the broadcast.
+            action (Callable): Bot API call for one receipt, returning None on failure.
+
+        Returns:
+            tuple[int, list[int]]: Number of successful calls and IDs of the failed receipts.
+        """
+        semaphore = asyncio.Semaphore(BROADCAST_WORKERS)
+
+        async def apply(receipt: BroadcastReceipt) -> Any:
+            async with semaphore:
+                return await action(receipt)
+
+        success = 0
+        failed = []
+        last_receipt_id = 0
+        while True:
+            async with self.session_factory() as session:
+                receipts = await BroadcastReceipt.get_page(
+                    session=session,
+                    broadcast_id=broadcast_id,
+                    after_id=last_receipt_id,
+                    limit=BROADCAST_BATCH_SIZE,
+                )
+            if not receipts:
+                break
+
+            results = await asyncio.gather(*(apply(receipt) for receipt in receipts))
+            for receipt, result in zip(receipts, results):
+                if result:
+                    success += 1
+                else:
+                    failed.append(receipt.id)
+            last_receipt_id = receipts[-1].id
+
+        return success, failed
+
+    async def _send(self, chat_id: int, text: str) -> int | None:
+        message = await self._call(
+            self.bot.send_message,
+            chat_id=chat_id,
+            text=text,
+            reply_markup=close_notification_keyboard(),
+        )
+        return message.message_id if message else None
+
+    async def _call(self, method: Callable[..., Awaitable[Any]], **kwargs: Any) -> Any:
+        for _attempt in range(SEND_ATTEMPTS):
+            await self.bucket.acquire()
+            try:
+                return await method(**kwargs)
+            except TelegramRetryAfter as exception:
+                logger.warning(f"Flood control on broadcast, waiting {exception.retry_after}s.")
+                self.bucket.pause(exception.retry_after)
+            except TelegramAPIError as exception:
+                logger.debug(f"Broadcast call to {kwargs.get('chat_id')} failed: {exception}")
+                return None
+
+        return None
+
+    async def _notify_admin(self, admin_tg_id: int, text: str) -> None:
+        await self._call(
+            self.bot.send_message,
+            chat_id=admin_tg_id,
+            text=text,
+            reply_markup=close_notification_keyboard(),
+        )
+
+    async def _report_progress(self, broadcast: Broadcast, progress: BroadcastProgress) -> None:
+        while True:
+            await asyncio.sleep(BROADCAST_PROGRESS_INTERVAL)
+            await self._edit_progress(
+                broadcast,
+                text=_("notification:message:broadcast_progress").format(
+                    processed=progress.sent + progress.failed,
+                    total=broadcast.total,
+                    success=progress.sent,
+                    failed=progress.failed,
+                ),
+            )
+
+    async def _edit_progress(self, broadcast: Broadcast, text: str, done: bool = False) -> None:
+        if not broadcast.progress_message_id:
+            return
+
+        try:
+            await self.bot.edit_message_text(
+                text=text,
+                chat_id=broadcast.admin_tg_id,
+                message_id=broadcast.progress_message_id,
+                reply_markup=close_notification_keyboard() if done else None,
+            )
+        except TelegramAPIError as exception:
+            logger.debug(f"Failed to update progress of broadcast {broadcast.id}: {exception}")
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+from redis.asyncio import Redis
+
+from app.bot.utils.constants import (
+    COUNTDOWN_EDIT_RATE,
+    COUNTDOWN_TICK,
+    MESSAGE_DELETION_BATCH_SIZE,
+    MESSAGE_DELETION_POLL_INTERVAL,
+    MESSAGE_DELETION_QUEUE_KEY,
+    MESSAGE_DELETION_RATE_LIMIT,
+)
+from app.bot.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DELETE_ATTEMPTS = 3
+
+
+@dataclass
+class Countdown:
+    chat_id: int
+    message_id: int
+    captions: dict[int, str]
+    deadline: float
+    shown: int
+
+
+class MessageDeletionService:
+    """
+    Deletes messages after a delay without keeping the caller waiting.
+
+    Pending deletions are members "chat_id:message_id" of a Redis sorted set scored by the
+    time they are due, so they survive restarts. One drain task takes the due members in
+    batches and deletes them with one deleteMessages call per chat, rate-limited by a token
+    bucket. It sleeps until the next member is due or a new one is scheduled.
+
+    A message can also show a countdown until its deletion. All countdowns share one ticker
+    and one edit budget: every tick only the most outdated captions are edited, straight to
+    the current number, so under load the numbers skip instead of the edits piling up.
+    Countdowns live in memory; after a restart the message is still deleted on time.
+    """
+
+    def __init__(self, bot: Bot, redis: Redis) -> None:
+        self.bot = bot
+        self.redis = redis
+        self.bucket = TokenBucket(rate=MESSAGE_DELETION_RATE_LIMIT)
+        self.edit_bucket = TokenBucket(rate=COUNTDOWN_EDIT_RATE)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._countdowns: dict[tuple[int, int], Countdown] = {}
+        self._ticker: asyncio.Task | None = None
+        logger.info("Message Deletion Service initialized.")
+
+    async def schedule(self, chat_id: int, message_id: int, delay: float) -> None:
+        """
+        Queues a message to be deleted after a delay.
+
+        Args:
+            chat_id (int): Chat of the message.
+            message_id (int): ID of the message.
+            delay (float): Seconds to wait before the deletion.
+        """
+        await self.redis.zadd(
+            MESSAGE_DELETION_QUEUE_KEY, {f"{chat_id}:{message_id}": time.time() + delay}
+        )
+        self._wakeup.set()
+
+    async def schedule_countdown(
+        self,
+        chat_id: int,
+        message_id: int,
+        captions: dict[int, str],
+    ) -> None:
+        """
+        Queues a message for deletion and counts down its caption until then.
+
+        Captions are rendered by the caller, in the user's language, as the ticker runs
+        outside of the handler context.
+
+        Args:
+            chat_id (int): Chat of the message.
+            message_id (int): ID of the message.
+            captions (dict[int, str]): Caption to show by the number of seconds left. The
+                largest key is the lifetime of the message and its current caption.
+        """
+        seconds = max(captions)
+        await self.schedule(chat_id=chat_id, message_id=message_id, delay=seconds)
+        self._countdowns[(chat_id, message_id)] = Countdown(
+            chat_id=chat_id,
+            message_id=message_id,
+            captions=captions,
+            deadline=time.monotonic() + seconds,
+            shown=seconds,
+        )
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._tick())
+
+    def start(self) -> None:
+        """Starts the drain task, which also deletes the messages due during a restart."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Stops the drain task and the ticker. Pending deletions stay in Redis."""
+        for task in (self._task, self._ticker):
+            if task is None:
+                continue
+
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._ticker = None
+        self._countdowns.clear()
+
+    async def _tick(self) -> None:
+        next_tick = time.monotonic()
+        while self._countdowns:
+            # Ticks keep a fixed schedule, however long the edits of the last one took.
+            next_tick += COUNTDOWN_TICK
+            await asyncio.sleep(max(0, next_tick - time.monotonic()))
+            now = time.monotonic()
+
+            outdated = []
+            for key, countdown in list(self._countdowns.items()):
+                seconds = math.ceil(countdown.deadline - now)
+                if seconds <= 0:
+                    # The drain task deletes the message.
+                    del self._countdowns[key]
+                elif seconds < countdown.shown and seconds in countdown.captions:
+                    outdated.append((countdown, seconds))
+
+            outdated.sort(key=lambda item: item[1] - item[0].shown)
+            budget = max(1, int(COUNTDOWN_EDIT_RATE * COUNTDOWN_TICK))
+            await asyncio.gather(
+                *(self._edit(countdown, seconds) for countdown, seconds in outdated[:budget])
+            )
+
+    async def _edit(self, countdown: Countdown, seconds: int) -> None:
+        await self.edit_bucket.acquire()
+        try:
+            await self.bot.edit_message_caption(
+                chat_id=countdown.chat_id,
+                message_id=countdown.message_id,
+                caption=countdown.captions[seconds],
+            )
+            countdown.shown = seconds
+        except TelegramRetryAfter as exception:
+            logger.warning(f"Flood control on countdown, waiting {exception.retry_after}s.")
+            self.edit_bucket.pause(exception.retry_after)
+        except TelegramAPIError as exception:
+            # Most likely the user deleted the message already.
+            logger.debug(f"Stopped countdown of message {countdown.message_id}: {exception}")
+            self._countdowns.pop((countdown.chat_id, countdown.message_id), None)
+
+    async def _drain(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                timeout = await self._delete_due()
+            except Exception as exception:
+                logger.error(f"Failed to process the message deletion queue: {exception}")
+                timeout = MESSAGE_DELETION_POLL_INTERVAL
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _delete_due(self) -> float:
+        """
+        Deletes all due messages, batch by batch.
+
+        Returns:
+            float: Seconds until the next deletion is due, at most the poll interval.
+        """
+        while True:
+            members = await self.redis.zrangebyscore(
+                MESSAGE_DELETION_QUEUE_KEY,
+                "-inf",
+                time.time(),
+                start=0,
+                num=MESSAGE_DELETION_BATCH_SIZE,
+            )
+            if not members:
+                break
+
+            message_ids = defaultdict(list)
+            for member in members:
+                chat_id, message_id = self._parse(member)
+                message_ids[chat_id].append(message_id)
+
+            await asyncio.gather(
+                *(self._delete(chat_id, ids) for chat_id, ids in message_ids.items())
+            )
+            # Removed after the calls, so a crash repeats a deletion instead of losing it.
+            await self.redis.zrem(MESSAGE_DELETION_QUEUE_KEY, *members)
+
+        upcoming = await self.redis.zrange(MESSAGE_DELETION_QUEUE_KEY, 0, 0, withscores=True)
+        if not upcoming:
+            return MESSAGE_DELETION_POLL_INTERVAL
+
+        _member, due = upcoming[0]
+        return min(max(due - time.time(), 0), MESSAGE_DELETION_POLL_INTERVAL)
+
+    async def _delete(self, chat_id: int, message_ids: list[int]) -> None:
+        for _attempt in range(DELETE_ATTEMPTS):
+            await self.bucket.acquire()
+            try:
+                await self.bot.delete_messages(chat_id=chat_id, message_ids=message_ids)
+                logger.debug(f"Deleted {len(message_ids)} messages in chat {chat_id}.")
+                return
+            except TelegramRetryAfter as exception:
+                logger.warning(f"Flood control on deletion, waiting {exception.retry_after}s.")
+                self.bucket.pause(exception.retry_after)
+            except TelegramAPIError as exception:
+                logger.debug(
+                    f"Failed to delete messages {message_ids} in chat {chat_id}: {exception}"
+                )
+                return
+
+    @staticmethod
+    def _parse(member: bytes | str) -> tuple[int, int]:
+        if isinstance(member, bytes):
+            member = member.decode()
+        chat_id, message_id = member.split(":")
+        return int(chat_id), int(message_id)
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import qrcode
 import io
@@ -25,6 +24,8 @@ from app.bot.utils.formatting import format_device_count, format_subscription_pe
 from app.bot.utils.qrcode import generate_qr_code
 from app.config import Config
 
+from .message_deletion import MessageDeletionService
+
 logger = logging.getLogger(__name__)
 
 ReplyMarkupType = (
@@ -33,11 +34,44 @@ ReplyMarkupType = (
 
 
 class NotificationService:
-    def __init__(self, config: Config, bot: Bot) -> None:
+    # Class-level, so the static notify_by_message can schedule deletions as well.
+    message_deletion: MessageDeletionService | None = None
+
+    def __init__(
+        self,
+        config: Config,
+        bot: Bot,
+        message_deletion: MessageDeletionService,
+    ) -> None:
         self.config = config
         self.bot = bot
+        NotificationService.message_deletion = message_deletion
         logger.info("Notification Service initialized.")
 
+    @staticmethod
+    async def delete_later(message: Message, delay: int) -> None:
+        """
+        Schedules a message for deletion without waiting for it.
+
+        Args:
+            message (Message): Message to delete.
+            delay (int): Seconds to wait before the deletion.
+        """
+        if NotificationService.message_deletion is None:
+            logger.error(f"Failed to schedule deletion of message {message.message_id}.")
+            return
+
+        try:
+            await NotificationService.message_deletion.schedule(
+                chat_id=message.chat.id,
+                message_id=message.message_id,
+                delay=delay,
+            )
+        except Exception as exception:
+            logger.error(
+                f"Failed to schedule deletion of message {message.message_id}: {exception}"
+            )
+
     @staticmethod
     async def _notify(
         text: str,
@@ -76,11 +110,7 @@ class NotificationService:
             return None
 
         if duration > 0:
-            await asyncio.sleep(duration)
-            try:
-                await notification.delete()
-            except Exception as exception:
-                logger.error(f"Failed to delete message {notification.message_id}: {exception}")
+            await NotificationService.delete_later(message=notification, delay=duration)
 
         return notification
 
@@ -146,8 +176,8 @@ class NotificationService:
         duration: int = 0,
         reply_markup: ReplyMarkupType = None,
         document: InputFile | None = None,
-    ) -> None:
-        await self._notify(
+    ) -> Message | None:
+        return await self._notify(
             text=text,
             duration=duration,
             chat_id=self.config.bot.DEV_ID,
@@ -193,13 +223,8 @@ class NotificationService:
             parse_mode="Markdown"
         )
 
-        # Delete message after delay
         if self.config.DELETE_KEY_DELAY > 0:
-            await asyncio.sleep(self.config.DELETE_KEY_DELAY)
-            try:
-                await message.delete()
-            except Exception as e:
-                logger.warning(f"Could not delete key message for user {user_id}: {e}")
+            await self.delete_later(message=message, delay=self.config.DELETE_KEY_DELAY)
 
     async def notify_extend_success(
         self,
@@ -5,12 +5,18 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from app.bot.services import VPNService
 
+import asyncio
 import logging
+from collections import defaultdict
 from decimal import Decimal
 
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from app.bot.utils.constants import ReferrerRewardLevel, ReferrerRewardType
+from app.bot.utils.constants import (
+    REFERRER_REWARDS_CONCURRENCY,
+    ReferrerRewardLevel,
+    ReferrerRewardType,
+)
 from app.bot.utils.formatting import to_decimal
 from app.config import Config
 from app.db.models import Referral, ReferrerReward, User
@@ -56,6 +62,7 @@ class ReferralService:
                 session=session, referred_tg_id=user.tg_id
             )
 
+            # Conditional update: only one of concurrent requests marks the referral rewarded.
             rewarded = await Referral.set_rewarded(
                 session=session, referral=referral, referred_bonus_days=days_count
             )
@@ -72,6 +79,7 @@ class ReferralService:
                 referral.referred,
                 duration=self.config.shop.REFERRED_TRIAL_PERIOD,
                 devices=self.config.shop.BONUS_DEVICES_COUNT,
+                session=session,
             )
 
             if referred_success:
@@ -90,6 +98,39 @@ class ReferralService:
 
             return False
 
+    def get_reward_amounts(self, payment_amount: float) -> dict[ReferrerRewardLevel, Decimal]:
+        """
+        Calculates the reward of every referrer level for a payment.
+
+        Args:
+            payment_amount (float): Amount paid by the referred user.
+
+        Returns:
+            dict[ReferrerRewardLevel, Decimal]: Reward amount by level, in days or money
+            depending on REFERRER_REWARD_TYPE.
+        """
+        mode = self.config.shop.REFERRER_REWARD_TYPE
+
+        if mode == ReferrerRewardType.DAYS.value:
+            return {
+                ReferrerRewardLevel.FIRST_LEVEL: Decimal(self.config.shop.REFERRER_LEVEL_ONE_PERIOD),
+                ReferrerRewardLevel.SECOND_LEVEL: Decimal(self.config.shop.REFERRER_LEVEL_TWO_PERIOD),
+            }
+
+        if mode == ReferrerRewardType.MONEY.value:
+            # TODO: add currency check before usage
+            payment_amount = to_decimal(payment_amount)
+            rates = {
+                ReferrerRewardLevel.FIRST_LEVEL: self.config.shop.REFERRER_LEVEL_ONE_RATE,
+                ReferrerRewardLevel.SECOND_LEVEL: self.config.shop.REFERRER_LEVEL_TWO_RATE,
+            }
+            return {
+                level: to_decimal(payment_amount * Decimal(rate) / Decimal(100))
+                for level, rate in rates.items()
+            }
+
+        return {}
+
     async def add_referrers_rewards_on_payment(
         self, referred_tg_id: int, payment_amount: float, payment_id: str
     ) -> bool:
@@ -99,52 +140,39 @@ class ReferralService:
             )
             return False
 
+        reward_amounts = self.get_reward_amounts(payment_amount)
+        if not reward_amounts:
+            logger.warning(
+                f"Aborting. Unknown referrer reward type {self.config.shop.REFERRER_REWARD_TYPE}."
+            )
+            return False
+
+        reward_type = ReferrerRewardType.from_str(self.config.shop.REFERRER_REWARD_TYPE)
+        depth = max(level.value for level in reward_amounts)
+
         async with self.session_factory() as session:
-            referral = await Referral.get_referral_with_users(session, referred_tg_id)
-            if not referral:
+            # All referrers up to the deepest rewarded level, the direct referrer first.
+            referrers = await Referral.get_referrer_chain(
+                session=session, referred_tg_id=referred_tg_id, depth=depth
+            )
+            if not referrers:
                 logger.warning(f"No referral found for user {referred_tg_id} on payment event.")
                 return False
-            referrer_tg_id = referral.referrer_tg_id
-
-            mode = self.config.shop.REFERRER_REWARD_TYPE
-
-            if mode == ReferrerRewardType.DAYS.value:
-                first_level_reward_amount = self.config.shop.REFERRER_LEVEL_ONE_PERIOD
-                second_level_reward_amount = self.config.shop.REFERRER_LEVEL_TWO_PERIOD
-            elif mode == ReferrerRewardType.MONEY.value:
-                # TODO: add currency check before usage
-                payment_amount = to_decimal(payment_amount)
-                first_level_rate = Decimal(self.config.shop.REFERRER_LEVEL_ONE_RATE) / Decimal(100)
-                second_level_rate = Decimal(self.config.shop.REFERRER_LEVEL_TWO_RATE) / Decimal(100)
-
-                first_level_reward_amount = to_decimal(payment_amount * first_level_rate)
-                second_level_reward_amount = to_decimal(payment_amount * second_level_rate)
 
             rewards_created = []
 
-            if referrer_tg_id and first_level_reward_amount > 0:
-                reward = await ReferrerReward.create_referrer_reward(
-                    session=session,
-                    user_tg_id=referrer_tg_id,
-                    reward_type=ReferrerRewardType.from_str(mode),
-                    amount=first_level_reward_amount,
-                    reward_level=ReferrerRewardLevel.FIRST_LEVEL,
-                    payment_id=payment_id,
-                )
-                rewards_created.append(reward)
+            for level_value, referrer_tg_id in enumerate(referrers, start=1):
+                reward_level = ReferrerRewardLevel(level_value)
+                amount = reward_amounts.get(reward_level, 0)
+                if amount <= 0:
+                    continue
 
-            second_level_referral = await Referral.get_referral(session, referrer_tg_id)
-            if (
-                second_level_reward_amount > 0
-                and second_level_referral
-                and second_level_referral.referrer_tg_id
-            ):
                 reward = await ReferrerReward.create_referrer_reward(
                     session=session,
-                    user_tg_id=second_level_referral.referrer_tg_id,
-                    reward_type=ReferrerRewardType.from_str(mode),
-                    amount=second_level_reward_amount,
-                    reward_level=ReferrerRewardLevel.SECOND_LEVEL,
+                    user_tg_id=referrer_tg_id,
+                    reward_type=reward_type,
+                    amount=amount,
+                    reward_level=reward_level,
                     payment_id=payment_id,
                 )
                 rewards_created.append(reward)
@@ -155,46 +183,90 @@ class ReferralService:
 
             return bool(rewards_created)
 
-    async def process_referrer_rewards_after_payment(self, reward: ReferrerReward) -> bool:
-        if reward.rewarded_at:
-            logger.info(
-                f"ReferrerReward {reward.id} (tg_id: {reward.user_tg_id}) was already given earlier."
-            )
-            return False
+    async def process_pending_referrer_rewards(self) -> int:
+        """
+        Gives all pending referrer rewards.
+
+        Rewards are grouped by server and user. Servers are processed concurrently, up to
+        REFERRER_REWARDS_CONCURRENCY at a time, and the users of one server one after another,
+        so a single panel is never flooded.
 
+        Returns:
+            int: Number of rewards marked as given.
+        """
         async with self.session_factory() as session:
-            if reward.reward_type == ReferrerRewardType.DAYS:
-                days = int(reward.amount)
-                user = await User.get(session=session, tg_id=reward.user_tg_id)
-                if not user:
-                    return False
-
-                success = await self.vpn_service.process_bonus_days(
-                    user=user, duration=days, devices=self.config.shop.BONUS_DEVICES_COUNT
-                )
-                if not success:
+            pending = await ReferrerReward.get_pending_rewards_with_server(session)
+
+        servers: dict[int | None, dict[int, list[ReferrerReward]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for reward, server_id in pending:
+            servers[server_id][reward.user_tg_id].append(reward)
+
+        logger.info(
+            f"Processing {len(pending)} pending referrer rewards on {len(servers)} servers."
+        )
+        semaphore = asyncio.Semaphore(REFERRER_REWARDS_CONCURRENCY)
+
+        async def process_server(users: dict[int, list[ReferrerReward]]) -> int:
+            rewarded = 0
+            async with semaphore:
+                for user_tg_id, rewards in users.items():
+                    try:
+                        rewarded += await self.process_referrer_rewards(user_tg_id, rewards)
+                    except Exception as exception:
+                        logger.error(
+                            f"Failed to process referrer rewards of user {user_tg_id}: {exception}"
+                        )
+            return rewarded
+
+        results = await asyncio.gather(*(process_server(users) for users in servers.values()))
+        return sum(results)
+
+    async def process_referrer_rewards(
+        self,
+        user_tg_id: int,
+        rewards: list[ReferrerReward],
+    ) -> int:
+        """
+        Gives the pending rewards of one user, all DAYS rewards with a single panel update.
+
+        Args:
+            user_tg_id (int): Telegram ID of the referrer.
+            rewards (list[ReferrerReward]): Pending rewards of the referrer.
+
+        Returns:
+            int: Number of rewards marked as given.
+        """
+        given: list[int] = []
+        days_rewards = [r for r in rewards if r.reward_type == ReferrerRewardType.DAYS]
+        money_rewards = [r for r in rewards if r.reward_type == ReferrerRewardType.MONEY]
+
+        async with self.session_factory() as session:
+            if days_rewards:
+                days = sum(int(reward.amount) for reward in days_rewards)
+                user = await User.get(session=session, tg_id=user_tg_id)
+                if user and await self.vpn_service.process_bonus_days(
+                    user=user,
+                    duration=days,
+                    devices=self.config.shop.BONUS_DEVICES_COUNT,
+                    session=session,
+                ):
+                    logger.info(f"Gave {days} days to a referrer user {user_tg_id}")
+                    given.extend(reward.id for reward in days_rewards)
+                else:
                     logger.error(
-                        f"Failed to give {days} days reward to a referrer user {reward.user_tg_id}"
+                        f"Failed to give {days} days reward to a referrer user {user_tg_id}"
                     )
-                    return False
-
-                logger.info(f"Gave {days} days to a referrer user {reward.user_tg_id}")
 
-            elif reward.reward_type == ReferrerRewardType.MONEY:
+            for reward in money_rewards:
                 # TODO: add balance processing
                 logger.critical(
-                    f"Tried to give money {reward.amount} reward to a referrer user {reward.user_tg_id}"
+                    f"Tried to give money {reward.amount} reward to a referrer user {user_tg_id}"
                 )
+                given.append(reward.id)
 
-            else:
-                logger.warning(
-                    f"Failed to give referrer reward. Unknown reward type: {reward.reward_type}"
-                )
-                return False
-
-            await ReferrerReward.mark_reward_as_given(session=session, reward=reward)
+            if not given:
+                return 0
 
-            logger.info(
-                f"ReferrerReward {reward.id} (tg_id: {reward.user_tg_id}) successfully rewarded."
-            )
-            return True
+            return await ReferrerReward.mark_rewards_as_given(session=session, reward_ids=given)
@@ -65,6 +65,9 @@ class ServerPoolService:
         await self._add_server(server, session=session)
         logger.info(f"Server {server.name} reinitialized successfully.")
 
+    def get_connections(self) -> dict[int, Connection]:
+        return dict(self._servers)
+
     async def get_inbound_id(self, api: AsyncApi) -> int | None:
         try:
             inbounds = await api.inbound.get_list()
@@ -82,10 +85,11 @@ class ServerPoolService:
 
         if user.server_id not in self._servers:
             logger.warning(f"Server {user.server_id} not found in active pool. Attempting to reconnect.")
-            async with self.session() as session:
-                server_from_db = await Server.get_by_id(session=session, id=user.server_id)
+            async with self.session() as read_session:
+                server_from_db = await Server.get_by_id(session=read_session, id=user.server_id)
             if server_from_db:
-                await self._add_server(server_from_db)
+                # The caller's session, so the status update does not wait for its write lock.
+                await self._add_server(server_from_db, session=session)
             else:
                 logger.error(f"Server {user.server_id} for user {user.tg_id} not found in DB either.")
                 return None
@@ -101,8 +105,8 @@ class ServerPoolService:
             )
             return None
 
-        async with self.session() as session:
-            refreshed_server = await Server.get_by_id(session=session, id=user.server_id)
+        async with self.session() as read_session:
+            refreshed_server = await Server.get_by_id(session=read_session, id=user.server_id)
             if refreshed_server:
                 connection.server = refreshed_server
             else:
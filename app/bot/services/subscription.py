@@ -47,11 +47,12 @@ class SubscriptionService:
             )
             return None
 
+        # Claim the trial before giving it, a concurrent request for the same user loses here.
         trial_used = await User.update_trial_status(
             session=session, tg_id=user.tg_id, used=True
         )
         if not trial_used:
-            logger.critical(f"Failed to update trial status for user {user.tg_id}.")
+            logger.warning(f"Trial period for user {user.tg_id} is already claimed.")
             return None
 
         user.is_trial_used = True
@@ -235,6 +235,7 @@ class VPNService:
                 replace_devices=True,
                 replace_duration=True,
                 enable=True,
+                session=session,
             )
             if not success:
                 logger.error(f"Failed to update existing client {user.tg_id}.")
@@ -301,12 +302,18 @@ class VPNService:
             logger.info(
                 f"Successfully created new client {user.tg_id} on server {connection.server.name} in inbound {target_inbound_id}."
             )
+            await self._mirror_client_expiry(user.tg_id, final_expiry_time_ms, session=session)
             return user
         except Exception as e:
             logger.error(f"Error creating client for {user.tg_id}: {e}", exc_info=True)
             return None
 
-    async def delete_client(self, user: User, server_id_override: Optional[int] = None) -> bool:
+    async def delete_client(
+        self,
+        user: User,
+        server_id_override: Optional[int] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> bool:
         """Deletes a client from their assigned server or a specified server."""
         logger.info(f"Attempting to delete client for user {user.tg_id} (VPN ID: {user.vpn_id}).")
         
@@ -320,9 +327,11 @@ class VPNService:
         connection = None
         if server_id_override:
             logger.warning(f"Deleting client from specific server {server_id_override} needs ServerPoolService.get_connection_by_id(id) or similar.")
-            temp_server_for_delete = None
-            async with self.session() as session:
+            if session is not None:
                 temp_server_for_delete = await Server.get_by_id(session, target_server_id)
+            else:
+                async with self.session() as read_session:
+                    temp_server_for_delete = await Server.get_by_id(read_session, target_server_id)
             
             if temp_server_for_delete and temp_server_for_delete.online:
                 from py3xui import AsyncApi as TempApi
@@ -351,7 +360,7 @@ class VPNService:
                 logger.error(f"Server {target_server_id} for override not found or not online.")
                 return False
         else:
-            connection = await self.server_pool_service.get_connection(user)
+            connection = await self.server_pool_service.get_connection(user, session=session)
 
         if not connection:
             logger.warning(f"Cannot delete client for user {user.tg_id} on server {target_server_id}: No connection could be established.")
@@ -370,6 +379,7 @@ class VPNService:
 
             await connection.api.client.delete(inbound_id=inbound_id, client_uuid=user.vpn_id)
             logger.info(f"Successfully deleted client {user.tg_id} (VPN ID: {user.vpn_id}) from server {connection.server.name} (ID: {connection.server.id}). Inbound: {inbound_id}")
+            await self._mirror_client_expiry(user.tg_id, None, session=session)
             return True
         except Exception as exception:
             logger.error(f"Error deleting client {user.tg_id} from server {connection.server.name} (ID: {connection.server.id}): {exception}")
@@ -385,9 +395,10 @@ class VPNService:
         enable: Optional[bool] = None,
         flow: str = "",
         total_gb: Optional[int] = None,
+        session: Optional[AsyncSession] = None,
     ) -> bool:
         logger.info(f"Updating client {user.tg_id} | Devices: {devices}, Duration: {duration}")
-        connection = await self.server_pool_service.get_connection(user)
+        connection = await self.server_pool_service.get_connection(user, session=session)
 
         if not connection:
             return False
@@ -450,16 +461,17 @@ class VPNService:
                     client=client_to_update
                 )
                 logger.info(f"Client {user.tg_id} updated successfully in inbound {client_inbound_id}")
+                await self._mirror_client_expiry(
+                    user.tg_id, update_data["expiry_time"], session=session
+                )
 
                 if isinstance(existing_client.id, str) and existing_client.id != user.vpn_id:
-                    async with self.session() as session:
-                        stmt = select(User).where(User.tg_id == user.tg_id)
-                        db_user = (await session.execute(stmt)).scalar_one_or_none()
-                        if db_user:
-                            db_user.vpn_id = existing_client.id
-                            session.add(db_user)
-                            await session.commit()
-                            logger.info(f"Updated vpn_id in database for user {user.tg_id} to {existing_client.id}")
+                    if session is not None:
+                        await self._update_vpn_id(session, user.tg_id, existing_client.id)
+                    else:
+                        async with self.session() as own_session:
+                            await self._update_vpn_id(own_session, user.tg_id, existing_client.id)
+                            await own_session.commit()
 
                 return True
             except Exception as e:
@@ -469,6 +481,62 @@ class VPNService:
             logger.error(f"Error updating client {user.tg_id}: {exception}", exc_info=True)
             return False
 
+    async def _update_vpn_id(self, session: AsyncSession, tg_id: int, vpn_id: str) -> None:
+        stmt = select(User).where(User.tg_id == tg_id)
+        db_user = (await session.execute(stmt)).scalar_one_or_none()
+        if db_user:
+            db_user.vpn_id = vpn_id
+            session.add(db_user)
+            logger.info(f"Updated vpn_id in database for user {tg_id} to {vpn_id}")
+
+    async def _mirror_client_expiry(
+        self,
+        tg_id: int,
+        expiry_time: int | None,
+        session: Optional[AsyncSession] = None,
+    ) -> None:
+        # The mirror only feeds broadcast segments, so a failed write must not fail the
+        # panel operation; the periodic sync corrects it. In the caller's session it is
+        # written in a savepoint, so a failure leaves the caller's transaction usable and
+        # the caller commits it.
+        try:
+            if session is not None:
+                async with session.begin_nested():
+                    await User.set_client_expiry(
+                        session=session, tg_id=tg_id, expiry_time=expiry_time
+                    )
+            else:
+                async with self.session() as own_session:
+                    await User.set_client_expiry(
+                        session=own_session, tg_id=tg_id, expiry_time=expiry_time
+                    )
+                    await own_session.commit()
+        except Exception as exception:
+            logger.error(f"Failed to mirror client expiry of user {tg_id}: {exception}")
+
+    async def sync_client_expiry(self) -> None:
+        """Mirrors the client expiry times of all connected panels to the users table."""
+        for server_id, connection in self.server_pool_service.get_connections().items():
+            try:
+                inbounds = await connection.api.inbound.get_list()
+            except Exception as exception:
+                logger.error(f"Failed to load clients of server {connection.server.name}: {exception}")
+                continue
+
+            expiry_times = {
+                int(client.email): client.expiry_time
+                for inbound in inbounds or []
+                for client in inbound.settings.clients or []
+                if client.email and client.email.isdigit()
+            }
+            async with self.session() as session:
+                await User.sync_client_expiry(
+                    session=session, server_id=server_id, expiry_times=expiry_times
+                )
+            logger.info(
+                f"Mirrored {len(expiry_times)} clients of server {connection.server.name}."
+            )
+
     async def create_subscription(self, user: User, devices: int, duration: int, session: AsyncSession, location_name: Optional[str] = None) -> User | None:
         logger.info(f"Processing subscription creation for user {user.tg_id} with location hint '{location_name}'.")
 
@@ -485,7 +553,9 @@ class VPNService:
                 old_vpn_id = user.vpn_id
                 if old_server_id and old_vpn_id:
                     user_for_deletion = User(tg_id=user.tg_id, vpn_id=old_vpn_id)
-                    delete_success = await self.delete_client(user_for_deletion, server_id_override=old_server_id)
+                    delete_success = await self.delete_client(
+                        user_for_deletion, server_id_override=old_server_id, session=session
+                    )
                     if not delete_success:
                         logger.warning(f"Failed to delete client from old server {old_server_id}. A zombie client may be left.")
 
@@ -498,7 +568,7 @@ class VPNService:
                 if zombie_client_on_dest and zombie_client_on_dest.id:
                     logger.warning(f"Found zombie client {zombie_client_on_dest.id} for user {user.tg_id} on destination server. Deleting.")
                     user_for_zombie_deletion = User(tg_id=user.tg_id, vpn_id=zombie_client_on_dest.id, server_id=user.server_id)
-                    delete_zombie_success = await self.delete_client(user_for_zombie_deletion)
+                    delete_zombie_success = await self.delete_client(user_for_zombie_deletion, session=session)
                     if not delete_zombie_success:
                         logger.error("Failed to delete zombie client from destination. Subsequent creation might fail.")
                 
@@ -513,6 +583,7 @@ class VPNService:
                     replace_devices=True,
                     replace_duration=True,
                     enable=True,
+                    session=session,
                 )
                 if not updated:
                     logger.error(f"Failed to update existing client {user.tg_id}.")
@@ -532,13 +603,20 @@ class VPNService:
             session=session
         )
 
-    async def extend_subscription(self, user: User, devices: int, duration: int) -> bool:
+    async def extend_subscription(
+        self,
+        user: User,
+        devices: int,
+        duration: int,
+        session: Optional[AsyncSession] = None,
+    ) -> bool:
         return await self.update_client(
             user=user,
             devices=devices,
             duration=duration,
             replace_devices=True,
-            replace_duration=False
+            replace_duration=False,
+            session=session,
         )
 
     async def change_subscription(self, user: User, devices: int, duration: int, session: AsyncSession, location_name: Optional[str] = None) -> bool:
@@ -565,7 +643,9 @@ class VPNService:
             if old_server_id and old_vpn_id:
                 logger.info(f"Deleting client {old_vpn_id} from old server {old_server_id}.")
                 user_to_delete = User(tg_id=user.tg_id, vpn_id=old_vpn_id)
-                delete_success = await self.delete_client(user_to_delete, server_id_override=old_server_id)
+                delete_success = await self.delete_client(
+                    user_to_delete, server_id_override=old_server_id, session=session
+                )
                 if not delete_success:
                     logger.warning(f"Failed to delete client from old server {old_server_id}. A zombie client might be left.")
 
@@ -585,16 +665,18 @@ class VPNService:
                 duration=duration,
                 replace_devices=True,
                 replace_duration=False,
+                session=session,
             )
 
     async def process_bonus_days(self, user: User, duration: int, devices: int, session: AsyncSession) -> User | None:
-        if await self.is_client_exists(user):
+        if await self.is_client_exists(user, session):
             updated = await self.update_client(
                 user=user,
                 duration=duration,
                 devices=devices,
                 replace_devices=True,
-                replace_duration=False
+                replace_duration=False,
+                session=session,
             )
             if updated:
                 logger.info(f"Updated client {user.tg_id} with additional {duration} days(-s).")
@@ -672,7 +754,9 @@ class VPNService:
 
         if old_server_id and old_server_id != new_server.id:
             logger.info(f"User {user.tg_id}: Deleting client (VPN ID: {old_vpn_id}) from old server {old_server_id}.")
-            delete_success = await self.delete_client(user, server_id_override=old_server_id)
+            delete_success = await self.delete_client(
+                user, server_id_override=old_server_id, session=session
+            )
             if not delete_success:
                 logger.warning(f"User {user.tg_id}: Failed to delete client from old server {old_server_id}. Proceeding.")
         
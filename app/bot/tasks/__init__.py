@@ -1,2 +1,7 @@
+from .backup import start_scheduler
+from .clients import start_scheduler
+from .fulfilment import start_scheduler
+from .query_stats import start_scheduler
 from .referral import start_scheduler
+from .statistics import start_scheduler
 from .transactions import start_scheduler
@@ -0,0 +1,52 @@
+import logging
+from datetime import datetime
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.bot.services import NotificationService
+from app.bot.utils.constants import BACKUP_FAILED_TAG
+from app.config import DatabaseConfig
+from app.db.backup import BACKUP_DIR, apply_retention, create_backup, verify_backup
+
+logger = logging.getLogger(__name__)
+
+
+async def create_scheduled_backup(
+    config: DatabaseConfig,
+    notification_service: NotificationService,
+) -> None:
+    try:
+        parts = await create_backup(config=config, directory=BACKUP_DIR, part_size=None)
+    except Exception as exception:
+        logger.error(f"[Background check] Scheduled backup failed: {exception}")
+        await notification_service.notify_developer(text=f"{BACKUP_FAILED_TAG}\n\n{exception}")
+        return
+
+    archive = parts[0]
+    if not await verify_backup(archive):
+        # A corrupt archive must not push a good one out of the retention window.
+        archive.unlink(missing_ok=True)
+        await notification_service.notify_developer(text=f"{BACKUP_FAILED_TAG}\n\n{archive.name}")
+        return
+
+    apply_retention(
+        directory=BACKUP_DIR,
+        keep_daily=config.BACKUP_KEEP_DAILY,
+        keep_weekly=config.BACKUP_KEEP_WEEKLY,
+    )
+    logger.info(f"[Background check] Scheduled backup {archive.name} finished.")
+
+
+def start_scheduler(
+    config: DatabaseConfig,
+    notification_service: NotificationService,
+) -> None:
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        create_scheduled_backup,
+        "interval",
+        hours=config.BACKUP_INTERVAL,
+        args=[config, notification_service],
+        next_run_time=datetime.now(),
+    )
+    scheduler.start()
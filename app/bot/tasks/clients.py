@@ -0,0 +1,31 @@
+import logging
+from datetime import datetime
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.bot.services import VPNService
+
+logger = logging.getLogger(__name__)
+
+# Expiry times are also mirrored on every client change, the sync only catches changes
+# made in the panels and clients created before the mirror existed.
+CLIENTS_SYNC_INTERVAL_HOURS = 1
+
+
+async def sync_clients(vpn_service: VPNService) -> None:
+    await vpn_service.sync_client_expiry()
+    logger.info("[Background check] Client expiry times synchronized.")
+
+
+def start_scheduler(vpn_service: VPNService) -> None:
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        sync_clients,
+        "interval",
+        hours=CLIENTS_SYNC_INTERVAL_HOURS,
+        args=[vpn_service],
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.bot.payment_gateways import GatewayFactory
+from app.bot.services import NotificationService
+from app.bot.utils.constants import EVENT_PAYMENT_FULFILMENT_FAILED_TAG
+from app.db.models import PaymentFulfilment
+from app.db.models.payment_fulfilment import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Payment webhooks only queue the payment, so the queue is polled often enough for the
+# subscription to arrive a moment after the payment.
+FULFILMENT_INTERVAL_SECONDS = 2
+FULFILMENT_BATCH_SIZE = 10
+FULFILMENT_MAX_ATTEMPTS = 10
+FULFILMENT_RETRY_SECONDS = 30  # doubled after every failed attempt
+FULFILMENT_RETRY_MAX_SECONDS = 3600
+
+
+async def fulfil_payment(
+    session_factory: async_sessionmaker,
+    gateway_factory: GatewayFactory,
+    notification_service: NotificationService,
+    fulfilment: PaymentFulfilment,
+) -> None:
+    try:
+        gateway = gateway_factory.get_gateway(fulfilment.gateway)
+        await gateway.fulfil_payment(fulfilment)
+    except Exception as exception:
+        attempts = fulfilment.attempts + 1
+        next_attempt_at = None
+        if attempts < FULFILMENT_MAX_ATTEMPTS:
+            delay = min(
+                FULFILMENT_RETRY_SECONDS * 2 ** (attempts - 1), FULFILMENT_RETRY_MAX_SECONDS
+            )
+            next_attempt_at = utcnow() + timedelta(seconds=delay)
+
+        async with session_factory() as session:
+            await PaymentFulfilment.record_failure(
+                session=session,
+                payment_id=fulfilment.payment_id,
+                error=str(exception),
+                next_attempt_at=next_attempt_at,
+            )
+
+        if next_attempt_at:
+            logger.warning(
+                f"[Background check] Fulfilment of payment {fulfilment.payment_id} failed "
+                f"(attempt {attempts}), retrying at {next_attempt_at}: {exception}"
+            )
+        else:
+            logger.error(
+                f"[Background check] Fulfilment of payment {fulfilment.payment_id} failed "
+                f"after {attempts} attempts: {exception}"
+            )
+            await notification_service.notify_developer(
+                text=f"{EVENT_PAYMENT_FULFILMENT_FAILED_TAG}\n\n"
+                f"{fulfilment.payment_id}: {exception}"
+            )
+        return
+
+    async with session_factory() as session:
+        await PaymentFulfilment.complete(session=session, payment_id=fulfilment.payment_id)
+
+
+async def process_fulfilments(
+    session_factory: async_sessionmaker,
+    gateway_factory: GatewayFactory,
+    notification_service: NotificationService,
+) -> None:
+    async with session_factory() as session:
+        fulfilments = await PaymentFulfilment.get_due(session=session, limit=FULFILMENT_BATCH_SIZE)
+        is_sqlite = session.bind.dialect.name == "sqlite"
+
+    if not fulfilments:
+        return
+
+    # A fulfilment interrupted by a restart is still pending, so it runs again: payments
+    # are fulfilled at least once.
+    if is_sqlite:
+        # SQLite has a single writer, concurrent fulfilments would only wait for each other.
+        for fulfilment in fulfilments:
+            await fulfil_payment(
+                session_factory, gateway_factory, notification_service, fulfilment
+            )
+        return
+
+    await asyncio.gather(
+        *(
+            fulfil_payment(session_factory, gateway_factory, notification_service, fulfilment)
+            for fulfilment in fulfilments
+        )
+    )
+
+
+def start_scheduler(
+    session: async_sessionmaker,
+    gateway_factory: GatewayFactory,
+    notification_service: NotificationService,
+) -> None:
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        process_fulfilments,
+        "interval",
+        seconds=FULFILMENT_INTERVAL_SECONDS,
+        args=[session, gateway_factory, notification_service],
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
@@ -0,0 +1,34 @@
+import logging
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.db import instrumentation
+
+logger = logging.getLogger(__name__)
+
+TOP_HANDLERS = 10
+
+
+async def log_query_stats() -> None:
+    handler_stats = instrumentation.get_handler_stats()
+    if not handler_stats:
+        logger.info("[Background check] No handler query stats collected yet.")
+        return
+
+    lines = [
+        f"{name}: {stats.updates} updates, {stats.queries / stats.updates:.1f} queries "
+        f"and {stats.duration * 1000 / stats.updates:.1f} ms per update, "
+        f"max {stats.max_queries} queries"
+        for name, stats in list(handler_stats.items())[:TOP_HANDLERS]
+    ]
+    logger.info("[Background check] Query stats by handler:\n" + "\n".join(lines))
+
+
+def start_scheduler() -> None:
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        log_query_stats,
+        "interval",
+        hours=1,
+    )
+    scheduler.start()
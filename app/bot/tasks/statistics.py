@@ -0,0 +1,104 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.bot.utils.constants import StatisticMetric
+from app.db.models import Server, Statistic, Transaction, User
+from app.db.models.statistic import today
+
+logger = logging.getLogger(__name__)
+
+
+async def _catch_up_since(
+    session: AsyncSession,
+    metric: StatisticMetric,
+    current_day: date,
+) -> datetime | None:
+    # Backfill the whole history once, afterwards only re-check the last complete day.
+    # Today is left to the increments, so the rewrite cannot race with new events.
+    first_day = await Statistic.get_first_day(session, metric)
+    if first_day and first_day < current_day:
+        return datetime.combine(current_day - timedelta(days=1), time.min)
+    return None
+
+
+async def catch_up_statistics(session_factory: async_sessionmaker) -> None:
+    session: AsyncSession
+    async with session_factory() as session:
+        current_day = today()
+        until = datetime.combine(current_day, time.min)
+
+        since = await _catch_up_since(session, StatisticMetric.NEW_USERS, current_day)
+        new_users = await User.count_by_day(session=session, until=until, since=since)
+        if since:
+            new_users.setdefault(since.date(), 0)
+        for day, count in new_users.items():
+            await Statistic.replace(
+                session=session,
+                metric=StatisticMetric.NEW_USERS,
+                values={"": count},
+                day=day,
+            )
+
+        since = await _catch_up_since(session, StatisticMetric.PAYMENTS_BY_PLAN, current_day)
+        plans = await Transaction.count_by_plan(session=session, until=until, since=since)
+        if since:
+            plans.setdefault(since.date(), {})
+        for day, values in plans.items():
+            await Statistic.replace(
+                session=session,
+                metric=StatisticMetric.PAYMENTS_BY_PLAN,
+                values=values,
+                day=day,
+            )
+
+        await session.commit()
+        logger.info(
+            f"[Background check] Statistics caught up for {len(new_users)} days of new users "
+            f"and {len(plans)} days of payments."
+        )
+
+
+async def snapshot_subscriptions(session_factory: async_sessionmaker) -> None:
+    session: AsyncSession
+    async with session_factory() as session:
+        by_server: dict[str, float] = {}
+        by_location: dict[str, float] = defaultdict(float)
+        for name, location, count in await Server.get_clients_count(session):
+            by_server[name] = count
+            by_location[location or ""] += count
+
+        await Statistic.replace(
+            session=session, metric=StatisticMetric.SUBSCRIPTIONS_BY_SERVER, values=by_server
+        )
+        await Statistic.replace(
+            session=session,
+            metric=StatisticMetric.SUBSCRIPTIONS_BY_LOCATION,
+            values=dict(by_location),
+        )
+        await session.commit()
+        logger.info("[Background check] Subscriptions statistics snapshot updated.")
+
+
+def start_scheduler(session_factory: async_sessionmaker) -> None:
+    scheduler = AsyncIOScheduler()
+    scheduler.add_job(
+        catch_up_statistics,
+        "cron",
+        hour=0,
+        minute=5,
+        timezone="UTC",
+        args=[session_factory],
+        next_run_time=datetime.now(),
+    )
+    scheduler.add_job(
+        snapshot_subscriptions,
+        "interval",
+        hours=1,
+        args=[session_factory],
+        next_run_time=datetime.now(),
+    )
+    scheduler.start()
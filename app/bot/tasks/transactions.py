@@ -2,54 +2,49 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.bot.utils.constants import TransactionStatus
 from app.db.models import Transaction
 
 logger = logging.getLogger(__name__)
 
+TRANSACTION_EXPIRATION_MINUTES = 15
+# The expiry is a single indexed UPDATE, so it can run often enough for pending
+# transactions to be canceled within a minute of their deadline.
+TRANSACTION_EXPIRATION_CHECK_MINUTES = 1
+
 
 async def cancel_expired_transactions(
     session_factory: async_sessionmaker,
-    expiration_minutes: int = 15,
+    expiration_minutes: int = TRANSACTION_EXPIRATION_MINUTES,
 ) -> None:
     session: AsyncSession
     async with session_factory() as session:
-        expiration_time = datetime.now(timezone.utc) - timedelta(minutes=expiration_minutes)
-        stmt = select(Transaction).where(
-            Transaction.status == TransactionStatus.PENDING,
-            Transaction.created_at <= expiration_time,
+        # created_at is stored as naive UTC, so compare against a naive timestamp.
+        expiration_time = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            minutes=expiration_minutes
         )
-        result = await session.execute(stmt)
-        expired_transactions = result.scalars().all()
-
-        if expired_transactions:
-            logger.info(
-                f"[Background check] Found {len(expired_transactions)} expired transactions."
-            )
-
-            for transaction in expired_transactions:
-                current_transaction = await Transaction.get_by_id(session, transaction.payment_id)
-                if current_transaction and current_transaction.status == TransactionStatus.PENDING:
-                    transaction.status = TransactionStatus.CANCELED
-                else:
-                    logger.info(f"Transaction {transaction.payment_id} status changed while processing, skipping.")
-            
-            await session.commit()
-            logger.info(f"[Background check] Successfully canceled expired transactions.")
+        canceled = await Transaction.cancel_expired(session, expiration_time)
+
+        if canceled:
+            logger.info(f"[Background check] Canceled {len(canceled)} expired transactions.")
+            logger.debug(f"[Background check] Canceled transactions: {', '.join(canceled)}")
         else:
-            logger.info("[Background check] No expired transactions found.")
+            logger.debug("[Background check] No expired transactions found.")
 
 
-def start_scheduler(session: async_sessionmaker) -> None:
+def start_scheduler(
+    session: async_sessionmaker,
+    interval_minutes: int = TRANSACTION_EXPIRATION_CHECK_MINUTES,
+) -> None:
     scheduler = AsyncIOScheduler()
     scheduler.add_job(
         cancel_expired_transactions,
         "interval",
-        minutes=15,
+        minutes=interval_minutes,
         args=[session],
         next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
     )
     scheduler.start()
@@ -17,15 +17,18 @@ MAIN_MESSAGE_ID_KEY = "main_message_id"
 PREVIOUS_CALLBACK_KEY = "previous_callback"
 
 INPUT_PROMOCODE_KEY = "input_promocode"
+INPUT_PROMOCODE_AMOUNT_KEY = "input_promocode_amount"
 
 SERVER_NAME_KEY = "server_name"
 SERVER_HOST_KEY = "server_host"
 SERVER_MAX_CLIENTS_KEY = "server_max_clients"
 
 NOTIFICATION_CHAT_IDS_KEY = "notification_chat_ids"
-NOTIFICATION_LAST_MESSAGE_IDS_KEY = "notification_last_message_ids"
+NOTIFICATION_BROADCAST_ID_KEY = "notification_broadcast_id"
 NOTIFICATION_MESSAGE_TEXT_KEY = "notification_message_text"
 NOTIFICATION_PRE_MESSAGE_TEXT_KEY = "notification_pre_message_text"
+NOTIFICATION_SEGMENT_KEY = "notification_segment"
+NOTIFICATION_SEGMENT_VALUE_KEY = "notification_segment_value"
 # endregion
 
 # region: Webhook paths
@@ -41,8 +44,10 @@ YOOMONEY_WEBHOOK = "/yoomoney"  # Webhook path for receiving Yoomoney payment no
 BOT_STARTED_TAG = "#BotStarted"
 BOT_STOPPED_TAG = "#BotStopped"
 BACKUP_CREATED_TAG = "#BackupCreated"
+BACKUP_FAILED_TAG = "#BackupFailed"
 EVENT_PAYMENT_SUCCEEDED_TAG = "#EventPaymentSucceeded"
 EVENT_PAYMENT_CANCELED_TAG = "#EventPaymentCanceled"
+EVENT_PAYMENT_FULFILMENT_FAILED_TAG = "#EventPaymentFulfilmentFailed"
 # endregion
 
 # region: I18n settings
@@ -53,8 +58,28 @@ I18N_DOMAIN = "bot"
 # region: Constants
 UNLIMITED = "∞"
 DB_FORMAT = "sqlite3"
+DB_DRIVER_SQLITE = "sqlite+aiosqlite"
+DB_DRIVER_POSTGRES = "postgresql+asyncpg"
 LOG_ZIP_ARCHIVE_FORMAT = "zip"
 LOG_GZ_ARCHIVE_FORMAT = "gz"
+BACKUP_ARCHIVE_FORMAT = "gz"
+PROMOCODE_BULK_MAX_AMOUNT = 10_000
+STATISTICS_PERIOD_DAYS = 30
+REFERRER_REWARDS_CONCURRENCY = 5
+BROADCAST_RATE_LIMIT = 25  # messages per second, below the Bot API limit of ~30
+BROADCAST_WORKERS = 10
+BROADCAST_BATCH_SIZE = 50
+BROADCAST_PROGRESS_INTERVAL = 10  # seconds
+BROADCAST_RETRY_ATTEMPTS = 5  # per page, before the broadcast is marked as failed
+BROADCAST_RETRY_SECONDS = 5  # doubled after every failed attempt
+BROADCAST_EXPIRED_DAYS = (7, 30)
+MESSAGE_DELETION_QUEUE_KEY = "message_deletion_queue"
+MESSAGE_DELETION_RATE_LIMIT = 20  # deleteMessages calls per second
+MESSAGE_DELETION_BATCH_SIZE = 100  # maximum message_ids of one deleteMessages call
+MESSAGE_DELETION_POLL_INTERVAL = 5  # seconds
+COUNTDOWN_TICK = 1  # seconds
+COUNTDOWN_EDIT_RATE = 10  # caption edits per second across all countdowns
+KEY_MESSAGE_COUNTDOWN = 10  # seconds
 MESSAGE_EFFECT_IDS = {
     "🔥": "5104841245755180586",
     "👍": "5107584321108051014",
@@ -77,6 +102,38 @@ class TransactionStatus(Enum):
     REFUNDED = "refunded"
 
 
+class FulfilmentStatus(Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BroadcastStatus(Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BroadcastSegment(Enum):
+    ALL = "all"
+    ACTIVE = "active"
+    EXPIRED = "expired"  # value: days since expiry
+    TRIAL_ONLY = "trial_only"
+    NEVER_PAID = "never_paid"
+    SERVER = "server"  # value: server id
+    LOCATION = "location"  # value: location name
+
+
+class StatisticMetric(Enum):
+    NEW_USERS = "new_users"
+    TRIALS = "trials"
+    PAYMENTS_BY_GATEWAY = "payments_by_gateway"
+    PAYMENTS_BY_PLAN = "payments_by_plan"
+    REVENUE = "revenue"
+    SUBSCRIPTIONS_BY_SERVER = "subscriptions_by_server"
+    SUBSCRIPTIONS_BY_LOCATION = "subscriptions_by_location"
+
+
 class Currency(Enum):
     RUB = ("RUB", "₽")
     USD = ("USD", "$")
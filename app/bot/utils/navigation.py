@@ -72,6 +72,7 @@ class NavAdminTools(str, Enum):
 
     PROMOCODE_EDITOR = "promocode_editor"
     CREATE_PROMOCODE = "create_promocode"
+    BULK_CREATE_PROMOCODE = "bulk_create_promocode"
     DELETE_PROMOCODE = "delete_promocode"
     EDIT_PROMOCODE = "edit_promocode"
 
@@ -7,6 +7,8 @@ from environs import Env
 from marshmallow.validate import OneOf, Range
 
 from app.bot.utils.constants import (
+    DB_DRIVER_POSTGRES,
+    DB_DRIVER_SQLITE,
     DB_FORMAT,
     LOG_GZ_ARCHIVE_FORMAT,
     LOG_ZIP_ARCHIVE_FORMAT,
@@ -42,6 +44,20 @@ DEFAULT_SHOP_PAYMENT_HELEKET_ENABLED = False
 DEFAULT_SHOP_PAYMENT_YOOKASSA_ENABLED = False
 DEFAULT_SHOP_PAYMENT_YOOMONEY_ENABLED = False
 DEFAULT_DB_NAME = "bot_database"
+DEFAULT_DB_DRIVER = DB_DRIVER_SQLITE
+DEFAULT_DB_POOL_SIZE = 10
+DEFAULT_DB_MAX_OVERFLOW = 20
+DEFAULT_DB_POOL_RECYCLE = 1800
+DEFAULT_DB_STATEMENT_CACHE_SIZE = 100
+DEFAULT_DB_BUSY_TIMEOUT = 5000
+DEFAULT_DB_CACHE_SIZE = -64000
+DEFAULT_DB_MMAP_SIZE = 268435456
+DEFAULT_DB_BACKUP_INTERVAL = 24
+DEFAULT_DB_SLOW_QUERY_THRESHOLD = 200
+DEFAULT_DB_UPDATE_QUERY_BUDGET = 20
+DEFAULT_DB_UPDATE_TIME_BUDGET = 1000
+DEFAULT_DB_BACKUP_KEEP_DAILY = 7
+DEFAULT_DB_BACKUP_KEEP_WEEKLY = 4
 
 DEFAULT_REDIS_DB_NAME = "0"
 DEFAULT_REDIS_HOST = "3xui-shop-redis"
@@ -131,8 +147,27 @@ class DatabaseConfig:
     NAME: str
     USERNAME: str | None
     PASSWORD: str | None
-
-    def url(self, driver: str = "sqlite+aiosqlite") -> str:
+    DRIVER: str = DEFAULT_DB_DRIVER
+    POOL_SIZE: int = DEFAULT_DB_POOL_SIZE
+    MAX_OVERFLOW: int = DEFAULT_DB_MAX_OVERFLOW
+    POOL_RECYCLE: int = DEFAULT_DB_POOL_RECYCLE
+    STATEMENT_CACHE_SIZE: int = DEFAULT_DB_STATEMENT_CACHE_SIZE
+    BUSY_TIMEOUT: int = DEFAULT_DB_BUSY_TIMEOUT
+    CACHE_SIZE: int = DEFAULT_DB_CACHE_SIZE
+    MMAP_SIZE: int = DEFAULT_DB_MMAP_SIZE
+    BACKUP_INTERVAL: int = DEFAULT_DB_BACKUP_INTERVAL
+    BACKUP_KEEP_DAILY: int = DEFAULT_DB_BACKUP_KEEP_DAILY
+    BACKUP_KEEP_WEEKLY: int = DEFAULT_DB_BACKUP_KEEP_WEEKLY
+    SLOW_QUERY_THRESHOLD: int = DEFAULT_DB_SLOW_QUERY_THRESHOLD
+    UPDATE_QUERY_BUDGET: int = DEFAULT_DB_UPDATE_QUERY_BUDGET
+    UPDATE_TIME_BUDGET: int = DEFAULT_DB_UPDATE_TIME_BUDGET
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.DRIVER.startswith("sqlite")
+
+    def url(self, driver: str | None = None) -> str:
+        driver = driver or self.DRIVER
         if driver.startswith("sqlite"):
             return f"{driver}:////{DEFAULT_DATA_DIR}/{self.NAME}.{DB_FORMAT}"
         return f"{driver}://{self.USERNAME}:{self.PASSWORD}@{self.HOST}:{self.PORT}/{self.NAME}"
@@ -285,6 +320,18 @@ def load_config() -> Config:
 
     delete_key_delay = env.int("DELETE_KEY_DELAY", default=DEFAULT_DELETE_KEY_DELAY)
 
+    db_driver = env.str(
+        "DB_DRIVER",
+        default=DEFAULT_DB_DRIVER,
+        validate=OneOf(
+            [DB_DRIVER_SQLITE, DB_DRIVER_POSTGRES],
+            error="DB_DRIVER must be one of: {choices}",
+        ),
+    )
+    if db_driver == DB_DRIVER_POSTGRES and not env.str("DB_HOST", default=None):
+        logger.error("DB_HOST is not set. Falling back to SQLite database.")
+        db_driver = DB_DRIVER_SQLITE
+
     return Config(
         bot=BotConfig(
             TOKEN=env.str("BOT_TOKEN"),
@@ -386,6 +433,64 @@ def load_config() -> Config:
             USERNAME=env.str("DB_USERNAME", default=None),
             PASSWORD=env.str("DB_PASSWORD", default=None),
             NAME=env.str("DB_NAME", default=DEFAULT_DB_NAME),
+            DRIVER=db_driver,
+            POOL_SIZE=env.int(
+                "DB_POOL_SIZE",
+                default=DEFAULT_DB_POOL_SIZE,
+                validate=Range(min=1, error="DB_POOL_SIZE must be >= 1"),
+            ),
+            MAX_OVERFLOW=env.int(
+                "DB_MAX_OVERFLOW",
+                default=DEFAULT_DB_MAX_OVERFLOW,
+                validate=Range(min=0, error="DB_MAX_OVERFLOW must be >= 0"),
+            ),
+            POOL_RECYCLE=env.int("DB_POOL_RECYCLE", default=DEFAULT_DB_POOL_RECYCLE),
+            STATEMENT_CACHE_SIZE=env.int(
+                "DB_STATEMENT_CACHE_SIZE",
+                default=DEFAULT_DB_STATEMENT_CACHE_SIZE,
+                validate=Range(min=0, error="DB_STATEMENT_CACHE_SIZE must be >= 0"),
+            ),
+            BUSY_TIMEOUT=env.int(
+                "DB_BUSY_TIMEOUT",
+                default=DEFAULT_DB_BUSY_TIMEOUT,
+                validate=Range(min=0, error="DB_BUSY_TIMEOUT must be >= 0"),
+            ),
+            CACHE_SIZE=env.int("DB_CACHE_SIZE", default=DEFAULT_DB_CACHE_SIZE),
+            MMAP_SIZE=env.int(
+                "DB_MMAP_SIZE",
+                default=DEFAULT_DB_MMAP_SIZE,
+                validate=Range(min=0, error="DB_MMAP_SIZE must be >= 0"),
+            ),
+            BACKUP_INTERVAL=env.int(
+                "DB_BACKUP_INTERVAL",
+                default=DEFAULT_DB_BACKUP_INTERVAL,
+                validate=Range(min=0, error="DB_BACKUP_INTERVAL must be >= 0"),
+            ),
+            BACKUP_KEEP_DAILY=env.int(
+                "DB_BACKUP_KEEP_DAILY",
+                default=DEFAULT_DB_BACKUP_KEEP_DAILY,
+                validate=Range(min=1, error="DB_BACKUP_KEEP_DAILY must be >= 1"),
+            ),
+            BACKUP_KEEP_WEEKLY=env.int(
+                "DB_BACKUP_KEEP_WEEKLY",
+                default=DEFAULT_DB_BACKUP_KEEP_WEEKLY,
+                validate=Range(min=0, error="DB_BACKUP_KEEP_WEEKLY must be >= 0"),
+            ),
+            SLOW_QUERY_THRESHOLD=env.int(
+                "DB_SLOW_QUERY_THRESHOLD",
+                default=DEFAULT_DB_SLOW_QUERY_THRESHOLD,
+                validate=Range(min=0, error="DB_SLOW_QUERY_THRESHOLD must be >= 0"),
+            ),
+            UPDATE_QUERY_BUDGET=env.int(
+                "DB_UPDATE_QUERY_BUDGET",
+                default=DEFAULT_DB_UPDATE_QUERY_BUDGET,
+                validate=Range(min=0, error="DB_UPDATE_QUERY_BUDGET must be >= 0"),
+            ),
+            UPDATE_TIME_BUDGET=env.int(
+                "DB_UPDATE_TIME_BUDGET",
+                default=DEFAULT_DB_UPDATE_TIME_BUDGET,
+                validate=Range(min=0, error="DB_UPDATE_TIME_BUDGET must be >= 0"),
+            ),
         ),
         redis=RedisConfig(
             HOST=env.str("REDIS_HOST", default=DEFAULT_REDIS_HOST),
@@ -0,0 +1,246 @@
+"""
+Consistent, compressed backups of the SQLite database.
+
+The snapshot is taken with the SQLite online backup API, so it is consistent even while
+the bot keeps writing. It is then gzip-compressed in a stream and, if needed, split into
+parts that fit into a Telegram document. All file work runs in a worker thread.
+
+Usage:
+    python -m app.db.backup verify <archive>
+    python -m app.db.backup restore <archive>
+
+Split archives are joined before restoring with: cat backup_*.gz.* > backup.gz
+"""
+
+import argparse
+import asyncio
+import gzip
+import logging
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from app.bot.utils.constants import BACKUP_ARCHIVE_FORMAT, DB_FORMAT
+from app.config import DEFAULT_DATA_DIR, DatabaseConfig, load_config
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = DEFAULT_DATA_DIR / "backups"
+BACKUP_NAME_FORMAT = "backup_%Y-%m-%d_%H-%M-%S"
+# Bots can upload documents up to 50 MB.
+BACKUP_PART_SIZE = 45 * 1024 * 1024
+BACKUP_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def database_path(config: DatabaseConfig) -> Path:
+    return DEFAULT_DATA_DIR / f"{config.NAME}.{DB_FORMAT}"
+
+
+def create_snapshot(source_path: Path, snapshot_path: Path) -> None:
+    if not source_path.exists():
+        raise FileNotFoundError(source_path)
+
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    target = sqlite3.connect(snapshot_path)
+    try:
+        # A single step copies all pages under one read transaction, which gives a
+        # point-in-time snapshot. In WAL mode it does not block writers.
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+def compress(source_path: Path, archive_path: Path) -> None:
+    with source_path.open("rb") as source, gzip.open(archive_path, "wb") as archive:
+        shutil.copyfileobj(source, archive, BACKUP_COPY_BUFFER_SIZE)
+
+
+def split(archive_path: Path, part_size: int | None = BACKUP_PART_SIZE) -> list[Path]:
+    if part_size is None or archive_path.stat().st_size <= part_size:
+        return [archive_path]
+
+    parts = []
+    with archive_path.open("rb") as archive:
+        while chunk := archive.read(part_size):
+            part_path = archive_path.with_name(f"{archive_path.name}.{len(parts) + 1:03d}")
+            part_path.write_bytes(chunk)
+            parts.append(part_path)
+
+    archive_path.unlink()
+    return parts
+
+
+def _create_backup(source_path: Path, directory: Path, part_size: int | None) -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"{datetime.now().strftime(BACKUP_NAME_FORMAT)}.{DB_FORMAT}"
+    snapshot_path = directory / name
+    archive_path = directory / f"{name}.{BACKUP_ARCHIVE_FORMAT}"
+
+    try:
+        create_snapshot(source_path, snapshot_path)
+        compress(snapshot_path, archive_path)
+    finally:
+        snapshot_path.unlink(missing_ok=True)
+
+    return split(archive_path, part_size)
+
+
+async def create_backup(
+    config: DatabaseConfig,
+    directory: Path,
+    part_size: int | None = BACKUP_PART_SIZE,
+) -> list[Path]:
+    """
+    Creates a compressed snapshot of the SQLite database without blocking the event loop.
+
+    Args:
+        config (DatabaseConfig): Database configuration.
+        directory (Path): Directory to write the archive to.
+        part_size (int | None): Maximum size of a single archive file, None to never split.
+
+    Returns:
+        list[Path]: The archive, or its parts in order if it is larger than part_size.
+    """
+    parts = await asyncio.to_thread(_create_backup, database_path(config), directory, part_size)
+    logger.info(f"Backup created: {', '.join(part.name for part in parts)}")
+    return parts
+
+
+def _decompress(archive_path: Path, target_path: Path) -> None:
+    with gzip.open(archive_path, "rb") as archive, target_path.open("wb") as target:
+        shutil.copyfileobj(archive, target, BACKUP_COPY_BUFFER_SIZE)
+
+
+def _check_integrity(path: Path) -> bool:
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        result = connection.execute("PRAGMA integrity_check").fetchall()
+    finally:
+        connection.close()
+    return result == [("ok",)]
+
+
+def _verify_backup(archive_path: Path) -> bool:
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = Path(directory) / archive_path.stem
+        try:
+            _decompress(archive_path, snapshot_path)
+            return _check_integrity(snapshot_path)
+        except (OSError, EOFError, sqlite3.DatabaseError) as exception:
+            logger.error(f"Backup {archive_path.name} cannot be read: {exception}")
+            return False
+
+
+async def verify_backup(archive_path: Path) -> bool:
+    """
+    Checks that the archive decompresses into a database that passes PRAGMA integrity_check.
+
+    Args:
+        archive_path (Path): Path to the backup archive.
+
+    Returns:
+        bool: True if the backup is usable for a restore.
+    """
+    verified = await asyncio.to_thread(_verify_backup, archive_path)
+    if verified:
+        logger.info(f"Backup {archive_path.name} verified.")
+    else:
+        logger.error(f"Backup {archive_path.name} failed verification.")
+    return verified
+
+
+def apply_retention(directory: Path, keep_daily: int, keep_weekly: int) -> list[Path]:
+    """
+    Keeps the newest archive of each of the last keep_daily days and keep_weekly ISO weeks.
+
+    Args:
+        directory (Path): Directory with the backup archives.
+        keep_daily (int): Number of days to keep one archive for.
+        keep_weekly (int): Number of weeks to keep one archive for.
+
+    Returns:
+        list[Path]: Removed archives.
+    """
+    archives = []
+    for path in directory.glob(f"backup_*.{DB_FORMAT}.{BACKUP_ARCHIVE_FORMAT}"):
+        try:
+            created_at = datetime.strptime(path.name.split(".")[0], BACKUP_NAME_FORMAT)
+        except ValueError:
+            continue
+        archives.append((created_at, path))
+
+    archives.sort(reverse=True)
+    kept: set[Path] = set()
+    days: set = set()
+    weeks: set = set()
+    for created_at, path in archives:
+        day = created_at.date()
+        week = created_at.isocalendar()[:2]
+        if day not in days and len(days) < keep_daily:
+            days.add(day)
+            kept.add(path)
+        if week not in weeks and len(weeks) < keep_weekly:
+            weeks.add(week)
+            kept.add(path)
+
+    removed = [path for _, path in archives if path not in kept]
+    for path in removed:
+        path.unlink(missing_ok=True)
+        logger.info(f"Backup {path.name} removed by retention policy.")
+    return removed
+
+
+def _restore_backup(archive_path: Path, target_path: Path) -> None:
+    with tempfile.TemporaryDirectory(dir=target_path.parent) as directory:
+        snapshot_path = Path(directory) / archive_path.stem
+        _decompress(archive_path, snapshot_path)
+        if not _check_integrity(snapshot_path):
+            raise ValueError(f"Backup {archive_path.name} failed integrity check.")
+
+        # Copying through the backup API replaces the pages of the live database under
+        # SQLite's own locking: running connections see the restored data on their next
+        # transaction and the bot does not have to be stopped.
+        source = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+
+async def restore_backup(config: DatabaseConfig, archive_path: Path) -> None:
+    """
+    Verifies the archive and restores it into the configured SQLite database.
+
+    Args:
+        config (DatabaseConfig): Database configuration.
+        archive_path (Path): Path to the backup archive.
+    """
+    await asyncio.to_thread(_restore_backup, archive_path, database_path(config))
+    logger.info(f"Database restored from {archive_path.name}.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verify or restore SQLite database backups.")
+    parser.add_argument("command", choices=["verify", "restore"])
+    parser.add_argument("archive", type=Path)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    config = load_config().database
+    if not config.is_sqlite:
+        raise SystemExit("Backups are only supported for the SQLite database.")
+
+    if args.command == "verify":
+        if not asyncio.run(verify_backup(args.archive)):
+            raise SystemExit(1)
+    else:
+        asyncio.run(restore_backup(config, args.archive))
+
+
+if __name__ == "__main__":
+    main()
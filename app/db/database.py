@@ -1,28 +1,67 @@
 import logging
-from typing import Self
+from typing import Any, Self
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import DatabaseConfig
 
-from . import models
+from . import instrumentation, models, sqlite
 
 logger = logging.getLogger(__name__)
 
 
 class Database:
     def __init__(self, config: DatabaseConfig) -> None:
+        self.config = config
         self.engine = create_async_engine(
             url=config.url(),
             pool_pre_ping=True,
+            **self._engine_options(config),
         )
+
+        if config.is_sqlite:
+            # SQLite allows a single writer at a time: writes go through the one writer
+            # connection (see SQLiteRoutingSession), while reads fan out over a separate
+            # pool. BEGIN IMMEDIATE and busy_timeout cover writers in other processes.
+            self.read_engine = create_async_engine(url=config.url(), pool_pre_ping=True)
+            sqlite.setup_engine(self.engine.sync_engine, config, immediate=True)
+            sqlite.setup_engine(self.read_engine.sync_engine, config)
+            session_options = {
+                "sync_session_class": sqlite.SQLiteRoutingSession,
+                "reader": self.read_engine.sync_engine,
+                "join_transaction_mode": "create_savepoint",
+            }
+        else:
+            self.read_engine = self.engine
+            session_options = {}
+
+        instrumentation.setup_engine(self.engine.sync_engine, config.SLOW_QUERY_THRESHOLD)
+        if self.read_engine is not self.engine:
+            instrumentation.setup_engine(self.read_engine.sync_engine, config.SLOW_QUERY_THRESHOLD)
+
         self.session = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
             expire_on_commit=False,
+            **session_options,
         )
         logger.debug("Database engine and session maker initialized successfully.")
 
+    @staticmethod
+    def _engine_options(config: DatabaseConfig) -> dict[str, Any]:
+        if config.is_sqlite:
+            return {"poolclass": AsyncAdaptedQueuePool, "pool_size": 1, "max_overflow": 0}
+
+        return {
+            "pool_size": config.POOL_SIZE,
+            "max_overflow": config.MAX_OVERFLOW,
+            "pool_recycle": config.POOL_RECYCLE,
+            # Size of the asyncpg prepared statement cache per connection.
+            # Set DB_STATEMENT_CACHE_SIZE=0 when running behind PgBouncer in transaction mode.
+            "connect_args": {"prepared_statement_cache_size": config.STATEMENT_CACHE_SIZE},
+        }
+
     async def initialize(self) -> Self:
         try:
             async with self.engine.begin() as connection:
@@ -36,6 +75,8 @@ class Database:
     async def close(self) -> None:
         try:
             await self.engine.dispose()
+            if self.read_engine is not self.engine:
+                await self.read_engine.dispose()
             logger.debug("Database engine closed successfully.")
         except Exception as exception:
             logger.error(f"Error closing database engine: {exception}")
@@ -0,0 +1,112 @@
+"""
+Per-update query accounting.
+
+Engine event hooks add every executed statement to the QueryStats of the current update,
+which is carried by a context variable, so nothing has to be passed through handlers and
+models. Finished updates are folded into per-handler aggregates.
+"""
+
+import logging
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+QUERY_STARTED_AT_KEY = "query_started_at"
+UNKNOWN_HANDLER = "unhandled"
+
+
+@dataclass
+class QueryStats:
+    handler: str = UNKNOWN_HANDLER
+    queries: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class HandlerStats:
+    updates: int = 0
+    queries: int = 0
+    duration: float = 0.0
+    max_queries: int = 0
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_handler_stats: dict[str, HandlerStats] = {}
+
+
+def setup_engine(engine: Engine, slow_query_threshold: int) -> None:
+    """
+    Counts the statements of the engine against the current update and logs slow ones.
+
+    Args:
+        engine (Engine): Synchronous engine to instrument.
+        slow_query_threshold (int): Statement duration in milliseconds to log, 0 to disable.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        connection: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        connection.info[QUERY_STARTED_AT_KEY] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        connection: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        started_at = connection.info.pop(QUERY_STARTED_AT_KEY, None)
+        if started_at is None:
+            return
+
+        elapsed = time.perf_counter() - started_at
+        stats = _current_stats.get()
+        if stats:
+            stats.queries += 1
+            stats.duration += elapsed
+
+        if slow_query_threshold and elapsed * 1000 >= slow_query_threshold:
+            handler = stats.handler if stats else UNKNOWN_HANDLER
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms, {handler}): {statement}")
+
+
+def start_tracking() -> tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_tracking(token: Token) -> None:
+    stats = _current_stats.get()
+    _current_stats.reset(token)
+    if not stats:
+        return
+
+    aggregate = _handler_stats.setdefault(stats.handler, HandlerStats())
+    aggregate.updates += 1
+    aggregate.queries += stats.queries
+    aggregate.duration += stats.duration
+    aggregate.max_queries = max(aggregate.max_queries, stats.queries)
+
+
+def set_handler(name: str) -> None:
+    stats = _current_stats.get()
+    if stats:
+        stats.handler = name
+
+
+def get_handler_stats() -> dict[str, HandlerStats]:
+    """Returns the aggregates by handler, the busiest handlers first."""
+    return dict(sorted(_handler_stats.items(), key=lambda item: item[1].queries, reverse=True))
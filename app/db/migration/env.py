@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.config import load_config
 from app.db.models import Base
+from app.db.models.user import USER_SEARCH_TABLE
 
 database = load_config().database
 
@@ -19,6 +20,17 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Search objects created by hand-written migrations, invisible to autogenerate.
+UNMANAGED_INDEXES = {"ix_users_first_name_trgm", "ix_users_username_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    if type_ == "table" and reflected and name.startswith(USER_SEARCH_TABLE):
+        return False
+    if type_ == "index" and name in UNMANAGED_INDEXES:
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -28,6 +40,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -39,6 +52,7 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         render_as_batch=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
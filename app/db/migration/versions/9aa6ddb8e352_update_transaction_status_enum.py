@@ -19,6 +19,11 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # Native enum type: rename the value in place instead of rebuilding the table.
+        op.execute("ALTER TYPE transactionstatus RENAME VALUE 'failed' TO 'canceled'")
+        return
+
     # ### commands auto generated by Alembic - please adjust! ###
     new_enum = sa.Enum("pending", "completed", "canceled", "refunded", name="transactionstatus")
 
@@ -48,6 +53,10 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TYPE transactionstatus RENAME VALUE 'canceled' TO 'failed'")
+        return
+
     # ### commands auto generated by Alembic - please adjust! ###
     old_enum = sa.Enum("pending", "completed", "failed", "refunded", name="transactionstatus")
 
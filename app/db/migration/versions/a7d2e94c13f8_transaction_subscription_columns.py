@@ -0,0 +1,122 @@
+"""transaction subscription columns
+
+Revision ID: a7d2e94c13f8
+Revises: f3b6c1d84a27
+Create Date: 2026-10-19 16:40:27.915362
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e94c13f8'
+down_revision: Union[str, None] = 'f3b6c1d84a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Field order of SubscriptionData.pack() after the "subscription" prefix. Older rows may
+# lack the trailing fields.
+PACKED_FIELDS = [
+    'state',
+    'is_extend',
+    'is_change',
+    'user_id',
+    'devices',
+    'duration',
+    'price',
+    'location',
+    'is_change_location',
+]
+
+transactions = sa.table(
+    'transactions',
+    sa.column('id', sa.Integer),
+    sa.column('subscription', sa.String),
+    sa.column('devices', sa.Integer),
+    sa.column('duration', sa.Integer),
+    sa.column('price', sa.Float),
+    sa.column('location', sa.String),
+    sa.column('is_extend', sa.Boolean),
+    sa.column('is_change', sa.Boolean),
+)
+
+
+def _unpack(subscription: str) -> dict | None:
+    prefix, *values = subscription.split(':')
+    if prefix != 'subscription':
+        return None
+
+    fields = dict(zip(PACKED_FIELDS, values))
+    try:
+        return {
+            'devices': int(fields['devices']) if fields.get('devices') else None,
+            'duration': int(fields['duration']) if fields.get('duration') else None,
+            'price': float(fields['price']) if fields.get('price') else None,
+            'location': fields.get('location') or None,
+            'is_extend': fields['is_extend'] == '1' if 'is_extend' in fields else None,
+            'is_change': fields['is_change'] == '1' if 'is_change' in fields else None,
+        }
+    except ValueError:
+        return None
+
+
+def _backfill() -> None:
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(transactions.c.id, transactions.c.subscription)
+            .where(transactions.c.id > last_id)
+            .order_by(transactions.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        last_id = rows[-1].id
+        values = []
+        for row in rows:
+            unpacked = _unpack(row.subscription)
+            if unpacked:
+                values.append({'row_id': row.id, **unpacked})
+
+        if values:
+            connection.execute(
+                transactions.update()
+                .where(transactions.c.id == sa.bindparam('row_id'))
+                .values(
+                    devices=sa.bindparam('devices'),
+                    duration=sa.bindparam('duration'),
+                    price=sa.bindparam('price'),
+                    location=sa.bindparam('location'),
+                    is_extend=sa.bindparam('is_extend'),
+                    is_change=sa.bindparam('is_change'),
+                ),
+                values,
+            )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('devices', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('duration', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('price', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('location', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('is_extend', sa.Boolean(), nullable=True))
+        batch_op.add_column(sa.Column('is_change', sa.Boolean(), nullable=True))
+
+    _backfill()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('is_change')
+        batch_op.drop_column('is_extend')
+        batch_op.drop_column('location')
+        batch_op.drop_column('price')
+        batch_op.drop_column('duration')
+        batch_op.drop_column('devices')
@@ -0,0 +1,32 @@
+"""normalize user language_code
+
+Revision ID: b7e2c41d9a05
+Revises: 579d48dd94ef
+Create Date: 2026-10-19 10:12:41.508113
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c41d9a05'
+down_revision: Union[str, None] = '579d48dd94ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One-shot backfill: the bot only serves the default locale, so every stored
+    # language_code is normalised here instead of on each incoming update.
+    op.execute(
+        sa.text("UPDATE users SET language_code = :code WHERE language_code != :code").bindparams(
+            code="ru"
+        )
+    )
+
+
+def downgrade() -> None:
+    # Original Telegram language codes are not recoverable.
+    pass
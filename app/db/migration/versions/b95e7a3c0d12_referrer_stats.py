@@ -0,0 +1,113 @@
+"""referrer stats
+
+Revision ID: b95e7a3c0d12
+Revises: a7d2e94c13f8
+Create Date: 2026-10-19 18:02:51.604117
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b95e7a3c0d12'
+down_revision: Union[str, None] = 'a7d2e94c13f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Reward enums are stored by name.
+REWARD_COLUMNS = {
+    ('DAYS', 'FIRST_LEVEL'): 'first_level_days',
+    ('DAYS', 'SECOND_LEVEL'): 'second_level_days',
+    ('MONEY', 'FIRST_LEVEL'): 'first_level_money',
+    ('MONEY', 'SECOND_LEVEL'): 'second_level_money',
+}
+
+users = sa.table('users', sa.column('tg_id', sa.BigInteger))
+referrals = sa.table('referrals', sa.column('referrer_tg_id', sa.BigInteger))
+referrer_rewards = sa.table(
+    'referrer_rewards',
+    sa.column('user_tg_id', sa.BigInteger),
+    sa.column('reward_type', sa.String),
+    sa.column('reward_level', sa.String),
+    sa.column('amount', sa.Numeric),
+    sa.column('rewarded_at', sa.DateTime),
+)
+
+
+def _backfill(referrer_stats: sa.Table) -> None:
+    connection = op.get_bind()
+    stats = defaultdict(dict)
+
+    rows = connection.execute(
+        sa.select(referrals.c.referrer_tg_id, sa.func.count())
+        .join(users, users.c.tg_id == referrals.c.referrer_tg_id)
+        .group_by(referrals.c.referrer_tg_id)
+    ).all()
+    for tg_id, count in rows:
+        stats[tg_id]['referrals_count'] = count
+
+    # referrer_rewards is created by the application on first start, so it may be absent.
+    if 'referrer_rewards' in sa.inspect(connection).get_table_names():
+        pending = sa.func.sum(sa.case((referrer_rewards.c.rewarded_at.is_(None), 1), else_=0))
+        rows = connection.execute(
+            sa.select(
+                referrer_rewards.c.user_tg_id,
+                referrer_rewards.c.reward_type,
+                referrer_rewards.c.reward_level,
+                sa.func.sum(referrer_rewards.c.amount),
+                pending,
+            )
+            .join(users, users.c.tg_id == referrer_rewards.c.user_tg_id)
+            .group_by(
+                referrer_rewards.c.user_tg_id,
+                referrer_rewards.c.reward_type,
+                referrer_rewards.c.reward_level,
+            )
+        ).all()
+        for tg_id, reward_type, reward_level, amount, pending_count in rows:
+            user_stats = stats[tg_id]
+            user_stats['pending_rewards'] = user_stats.get('pending_rewards', 0) + pending_count
+            column = REWARD_COLUMNS.get((reward_type, reward_level))
+            if column:
+                user_stats[column] = amount
+
+    values = [
+        {
+            'user_tg_id': tg_id,
+            'referrals_count': user_stats.get('referrals_count', 0),
+            'pending_rewards': user_stats.get('pending_rewards', 0),
+            **{column: user_stats.get(column, 0) for column in REWARD_COLUMNS.values()},
+        }
+        for tg_id, user_stats in stats.items()
+    ]
+    if values:
+        op.bulk_insert(referrer_stats, values)
+
+
+def upgrade() -> None:
+    referrer_stats = op.create_table(
+        'referrer_stats',
+        sa.Column('user_tg_id', sa.BigInteger(), nullable=False),
+        sa.Column('referrals_count', sa.Integer(), nullable=False),
+        sa.Column('pending_rewards', sa.Integer(), nullable=False),
+        sa.Column('first_level_days', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('second_level_days', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('first_level_money', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.Column('second_level_money', sa.Numeric(precision=38, scale=18), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['user_tg_id'],
+            ['users.tg_id'],
+            name=op.f('fk_referrer_stats_user_tg_id_users'),
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('user_tg_id', name=op.f('pk_referrer_stats')),
+    )
+
+    _backfill(referrer_stats)
+
+
+def downgrade() -> None:
+    op.drop_table('referrer_stats')
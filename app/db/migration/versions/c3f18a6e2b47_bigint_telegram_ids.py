@@ -0,0 +1,47 @@
+"""bigint telegram ids
+
+Revision ID: c3f18a6e2b47
+Revises: b7e2c41d9a05
+Create Date: 2026-10-19 11:40:03.215870
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f18a6e2b47'
+down_revision: Union[str, None] = 'b7e2c41d9a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Telegram IDs no longer fit into a 32-bit INTEGER. SQLite stores integers in 64 bits
+# anyway, but the declared type is changed there too (by recreating the tables) so the
+# schema matches the models on both dialects.
+TELEGRAM_ID_COLUMNS = [
+    ('users', 'tg_id'),
+    ('transactions', 'tg_id'),
+    ('promocodes', 'activated_by'),
+    ('referrals', 'referred_tg_id'),
+    ('referrals', 'referrer_tg_id'),
+    ('referrer_rewards', 'user_tg_id'),
+]
+
+
+def _alter_telegram_ids(type_: sa.types.TypeEngine, existing_type: sa.types.TypeEngine) -> None:
+    bind = op.get_bind()
+    tables = set(sa.inspect(bind).get_table_names())
+    for table, column in TELEGRAM_ID_COLUMNS:
+        if table not in tables:
+            continue
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, existing_type=existing_type, type_=type_)
+
+
+def upgrade() -> None:
+    _alter_telegram_ids(type_=sa.BigInteger(), existing_type=sa.Integer())
+
+
+def downgrade() -> None:
+    _alter_telegram_ids(type_=sa.Integer(), existing_type=sa.BigInteger())
@@ -0,0 +1,41 @@
+"""broadcast receipts
+
+Revision ID: d2f94b7a6c15
+Revises: c4a81f6e2d39
+Create Date: 2026-10-19 20:08:36.918442
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f94b7a6c15'
+down_revision: Union[str, None] = 'c4a81f6e2d39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'broadcast_receipts',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('broadcast_id', sa.Integer(), nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('message_id', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['broadcast_id'],
+            ['broadcasts.id'],
+            name=op.f('fk_broadcast_receipts_broadcast_id_broadcasts'),
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_broadcast_receipts')),
+        sa.UniqueConstraint(
+            'broadcast_id', 'chat_id', name=op.f('uq_broadcast_receipts_broadcast_id')
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('broadcast_receipts')
@@ -0,0 +1,65 @@
+"""hot query indexes
+
+Revision ID: d81c5f3a9e60
+Revises: c3f18a6e2b47
+Create Date: 2026-10-19 13:05:41.508214
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81c5f3a9e60'
+down_revision: Union[str, None] = 'c3f18a6e2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_REWARDS = sa.text('rewarded_at IS NULL')
+
+# (table, index name, columns, extra kwargs)
+INDEXES = [
+    # cancel_expired_transactions: status = 'pending' AND created_at <= :expiration
+    ('transactions', 'ix_transactions_status_created_at', ['status', 'created_at'], {}),
+    # reward_pending_referrals_after_payment / get_pending_rewards: rewarded_at IS NULL [AND user_tg_id = :id]
+    (
+        'referrer_rewards',
+        'ix_referrer_rewards_pending',
+        ['user_tg_id'],
+        {'sqlite_where': PENDING_REWARDS, 'postgresql_where': PENDING_REWARDS},
+    ),
+    # get_rewards_sum: user_tg_id = :id AND reward_type = :type AND reward_level = :level
+    (
+        'referrer_rewards',
+        'ix_referrer_rewards_user_type_level',
+        ['user_tg_id', 'reward_type', 'reward_level'],
+        {},
+    ),
+    # get_referral_count: referrer_tg_id = :id
+    ('referrals', 'ix_referrals_referrer_tg_id', ['referrer_tg_id'], {}),
+]
+
+
+def _existing_indexes() -> dict[str, set[str]]:
+    inspector = sa.inspect(op.get_bind())
+    # referrer_rewards is created by the application on first start, so it may be absent.
+    return {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade() -> None:
+    existing = _existing_indexes()
+    for table, name, columns, kwargs in INDEXES:
+        if table not in existing or name in existing[table]:
+            continue
+        op.create_index(name, table, columns, unique=False, **kwargs)
+
+
+def downgrade() -> None:
+    existing = _existing_indexes()
+    for table, name, _, _ in reversed(INDEXES):
+        if name in existing.get(table, set()):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,70 @@
+"""user search index
+
+Revision ID: e5a9b0d27c14
+Revises: d81c5f3a9e60
+Create Date: 2026-10-19 14:22:10.637415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9b0d27c14'
+down_revision: Union[str, None] = 'd81c5f3a9e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite: external-content FTS5 table with the trigram tokenizer, so substring
+# searches on first_name/username are answered from the index. The triggers keep it
+# in sync with users. Note that rebuilding users with batch_alter_table drops the
+# triggers, such a migration has to recreate them.
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE users_search USING fts5("
+    "first_name, username, content='users', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER users_search_ai AFTER INSERT ON users BEGIN "
+    "INSERT INTO users_search(rowid, first_name, username) "
+    "VALUES (new.id, new.first_name, new.username); END",
+    "CREATE TRIGGER users_search_ad AFTER DELETE ON users BEGIN "
+    "INSERT INTO users_search(users_search, rowid, first_name, username) "
+    "VALUES ('delete', old.id, old.first_name, old.username); END",
+    "CREATE TRIGGER users_search_au AFTER UPDATE OF first_name, username ON users BEGIN "
+    "INSERT INTO users_search(users_search, rowid, first_name, username) "
+    "VALUES ('delete', old.id, old.first_name, old.username); "
+    "INSERT INTO users_search(rowid, first_name, username) "
+    "VALUES (new.id, new.first_name, new.username); END",
+    "INSERT INTO users_search(users_search) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS users_search_au",
+    "DROP TRIGGER IF EXISTS users_search_ad",
+    "DROP TRIGGER IF EXISTS users_search_ai",
+    "DROP TABLE IF EXISTS users_search",
+]
+
+# PostgreSQL: trigram GIN indexes serve ILIKE '%...%' directly and are maintained by
+# the server itself.
+POSTGRESQL_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_users_first_name_trgm ON users USING gin (first_name gin_trgm_ops)",
+    "CREATE INDEX ix_users_username_trgm ON users USING gin (username gin_trgm_ops)",
+]
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_users_username_trgm",
+    "DROP INDEX IF EXISTS ix_users_first_name_trgm",
+]
+
+
+def _execute(sqlite: list[str], postgresql: list[str]) -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {'sqlite': sqlite, 'postgresql': postgresql}.get(dialect, [])
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _execute(SQLITE_UPGRADE, POSTGRESQL_UPGRADE)
+
+
+def downgrade() -> None:
+    _execute(SQLITE_DOWNGRADE, POSTGRESQL_DOWNGRADE)
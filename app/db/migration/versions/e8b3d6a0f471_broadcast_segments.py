@@ -0,0 +1,48 @@
+"""broadcast segments
+
+Revision ID: e8b3d6a0f471
+Revises: d2f94b7a6c15
+Create Date: 2026-10-19 21:14:52.307816
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3d6a0f471'
+down_revision: Union[str, None] = 'd2f94b7a6c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled in by the hourly clients sync, so no backfill is needed here.
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('client_expiry_time', sa.BigInteger(), nullable=True))
+        batch_op.create_index('ix_users_server_id', ['server_id'], unique=False)
+        batch_op.create_index('ix_users_client_expiry_time', ['client_expiry_time'], unique=False)
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_tg_id_status', ['tg_id', 'status'], unique=False)
+
+    with op.batch_alter_table('broadcasts', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('segment', sa.String(length=16), server_default='all', nullable=False)
+        )
+        batch_op.add_column(sa.Column('segment_value', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('broadcasts', schema=None) as batch_op:
+        batch_op.drop_column('segment_value')
+        batch_op.drop_column('segment')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_tg_id_status')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_client_expiry_time')
+        batch_op.drop_index('ix_users_server_id')
+        batch_op.drop_column('client_expiry_time')
@@ -0,0 +1,53 @@
+"""payment fulfilments
+
+Revision ID: f1c7a2d94e58
+Revises: e8b3d6a0f471
+Create Date: 2026-10-19 22:31:07.642195
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a2d94e58'
+down_revision: Union[str, None] = 'e8b3d6a0f471'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'payment_fulfilments',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('payment_id', sa.String(length=64), nullable=False),
+        sa.Column('gateway', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('provisioned_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['payment_id'],
+            ['transactions.payment_id'],
+            name=op.f('fk_payment_fulfilments_payment_id_transactions'),
+        ),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_payment_fulfilments')),
+        sa.UniqueConstraint('payment_id', name=op.f('uq_payment_fulfilments_payment_id')),
+    )
+    op.create_index(
+        'ix_payment_fulfilments_status_next_attempt_at',
+        'payment_fulfilments',
+        ['status', 'next_attempt_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_payment_fulfilments_status_next_attempt_at', table_name='payment_fulfilments'
+    )
+    op.drop_table('payment_fulfilments')
@@ -0,0 +1,37 @@
+"""daily statistics
+
+Revision ID: f3b6c1d84a27
+Revises: e5a9b0d27c14
+Create Date: 2026-10-19 15:12:08.361904
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b6c1d84a27'
+down_revision: Union[str, None] = 'e5a9b0d27c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'statistics',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(length=32), nullable=False),
+        sa.Column('dimension', sa.String(length=64), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_statistics')),
+        sa.UniqueConstraint(
+            'day', 'metric', 'dimension', name=op.f('uq_statistics_day')
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('statistics')
@@ -1,7 +1,12 @@
 from ._base import Base
+from .broadcast import Broadcast
+from .broadcast_receipt import BroadcastReceipt
+from .payment_fulfilment import PaymentFulfilment
 from .promocode import Promocode
 from .referral import Referral
 from .referrer_reward import ReferrerReward
+from .referrer_stats import ReferrerStats
 from .server import Server
+from .statistic import Statistic
 from .transaction import Transaction
 from .user import User
@@ -1,7 +1,112 @@
-from sqlalchemy import MetaData
+from typing import Any, Self
+
+from sqlalchemy import ColumnElement, MetaData, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declarative_base
 
+
+class _Model:
+    """
+    Single-statement write helpers shared by all models.
+
+    Both SQLite and PostgreSQL support INSERT ... ON CONFLICT and RETURNING, so a create
+    or update is one round-trip instead of a lookup followed by a write.
+    """
+
+    @classmethod
+    def insert_statement(cls, session: AsyncSession) -> sqlite.Insert | postgresql.Insert:
+        if session.bind.dialect.name == "postgresql":
+            return postgresql.insert(cls)
+        return sqlite.insert(cls)
+
+    @classmethod
+    async def insert_or_ignore(
+        cls,
+        session: AsyncSession,
+        conflict: list[str],
+        **values: Any,
+    ) -> Self | None:
+        """
+        Inserts a row unless one with the same conflict columns already exists.
+
+        Args:
+            session (AsyncSession): Active database session.
+            conflict (list[str]): Columns of the unique constraint to check.
+            **values: Column values of the new row.
+
+        Returns:
+            Self | None: The inserted instance, or None if the row already exists.
+        """
+        stmt = (
+            cls.insert_statement(session)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=conflict)
+            .returning(cls)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def update_returning(
+        cls,
+        session: AsyncSession,
+        filters: list[ColumnElement[bool]],
+        **values: Any,
+    ) -> Self | None:
+        """
+        Updates the row matching the filters and returns it with the new values.
+
+        Args:
+            session (AsyncSession): Active database session.
+            filters (list[ColumnElement[bool]]): Conditions identifying the row.
+            **values: Column values to set.
+
+        Returns:
+            Self | None: The updated instance, or None if no row matched.
+        """
+        stmt = (
+            update(cls)
+            .where(*filters)
+            .values(**values)
+            .returning(cls)
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await session.execute(stmt)
+        return result.scalars().first()
+
+    @classmethod
+    async def compare_and_set(
+        cls,
+        session: AsyncSession,
+        filters: list[ColumnElement[bool]],
+        expected: dict[str, Any],
+        **values: Any,
+    ) -> Self | None:
+        """
+        Updates the row only while its columns still hold the expected values.
+
+        The check and the write are one UPDATE ... WHERE statement, so of two concurrent
+        transitions from the same state exactly one succeeds.
+
+        Args:
+            session (AsyncSession): Active database session.
+            filters (list[ColumnElement[bool]]): Conditions identifying the row.
+            expected (dict[str, Any]): Current column values required for the update.
+            **values: Column values to set.
+
+        Returns:
+            Self | None: The updated instance, or None if the row is missing or changed.
+        """
+        guards = [
+            getattr(cls, name).is_(None) if value is None else getattr(cls, name) == value
+            for name, value in expected.items()
+        ]
+        return await cls.update_returning(session=session, filters=[*filters, *guards], **values)
+
+
 Base = declarative_base(
+    cls=_Model,
     metadata=MetaData(
         naming_convention={
             "ix": "ix_%(column_0_label)s",
@@ -10,5 +115,5 @@ Base = declarative_base(
             "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
             "pk": "pk_%(table_name)s",
         }
-    )
+    ),
 )
@@ -0,0 +1,172 @@
+import logging
+from datetime import datetime
+from typing import Any, Self
+
+from sqlalchemy import *
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Enum
+
+from app.bot.utils.constants import BroadcastSegment, BroadcastStatus
+
+from . import Base
+from .broadcast_receipt import BroadcastReceipt
+
+logger = logging.getLogger(__name__)
+
+
+class Broadcast(Base):
+    """
+    Represents a notification sent by an admin to one or all users.
+
+    A broadcast to all users is persisted so it can be resumed after a restart: recipients
+    are walked in users.id order and last_user_id is the checkpoint up to which every
+    recipient has been processed.
+
+    Attributes:
+        id (int): Unique identifier for the broadcast (primary key).
+        admin_tg_id (int): Telegram user ID of the admin who started the broadcast.
+        text (str): Text of the message.
+        status (BroadcastStatus): Current status of the broadcast.
+        segment (BroadcastSegment): Audience of the broadcast.
+        segment_value (str | None): Parameter of the segment, e.g. days, server id or location.
+        total (int): Number of recipients when the broadcast started.
+        sent (int): Number of messages delivered so far.
+        failed (int): Number of messages that could not be delivered.
+        last_user_id (int): Checkpoint, the last processed users.id.
+        progress_message_id (int | None): Message in the admin chat showing the progress.
+        created_at (datetime): Timestamp when the broadcast was started.
+        finished_at (datetime | None): Timestamp when the broadcast was completed.
+    """
+
+    __tablename__ = "broadcasts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    admin_tg_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[BroadcastStatus] = mapped_column(
+        Enum(
+            BroadcastStatus,
+            values_callable=lambda obj: [e.value for e in obj],
+            native_enum=False,
+            length=16,
+        ),
+        default=BroadcastStatus.RUNNING,
+        nullable=False,
+    )
+    segment: Mapped[BroadcastSegment] = mapped_column(
+        Enum(
+            BroadcastSegment,
+            values_callable=lambda obj: [e.value for e in obj],
+            native_enum=False,
+            length=16,
+        ),
+        default=BroadcastSegment.ALL,
+        nullable=False,
+    )
+    segment_value: Mapped[str | None] = mapped_column(String(length=64), nullable=True)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_user_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    progress_message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<Broadcast(id={self.id}, admin_tg_id={self.admin_tg_id}, "
+            f"status='{self.status}', segment='{self.segment}', total={self.total}, "
+            f"sent={self.sent}, failed={self.failed}, last_user_id={self.last_user_id})>"
+        )
+
+    @classmethod
+    async def get(cls, session: AsyncSession, broadcast_id: int) -> Self | None:
+        query = await session.execute(select(Broadcast).where(Broadcast.id == broadcast_id))
+        return query.scalar_one_or_none()
+
+    @classmethod
+    async def get_running(cls, session: AsyncSession) -> list[Self]:
+        query = await session.execute(
+            select(Broadcast)
+            .where(Broadcast.status == BroadcastStatus.RUNNING)
+            .order_by(Broadcast.id)
+        )
+        return list(query.scalars().all())
+
+    @classmethod
+    async def create(
+        cls,
+        session: AsyncSession,
+        receipts: list[tuple[int, int]] | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        broadcast = Broadcast(**kwargs)
+        session.add(broadcast)
+        if receipts:
+            await session.flush()
+            await BroadcastReceipt.add_many(
+                session=session, broadcast_id=broadcast.id, receipts=receipts
+            )
+        await session.commit()
+        logger.info(f"Broadcast {broadcast.id} created by admin {broadcast.admin_tg_id}.")
+        return broadcast
+
+    @classmethod
+    async def save_progress(
+        cls,
+        session: AsyncSession,
+        broadcast_id: int,
+        last_user_id: int,
+        sent: int,
+        failed: int,
+        receipts: list[tuple[int, int]],
+    ) -> None:
+        """
+        Stores a checkpoint: all recipients up to last_user_id have been processed.
+
+        The receipts of the batch are stored in the same transaction as the checkpoint.
+
+        Args:
+            session (AsyncSession): Active database session.
+            broadcast_id (int): ID of the broadcast.
+            last_user_id (int): Last processed users.id.
+            sent (int): Number of messages delivered in the processed batch.
+            failed (int): Number of messages failed in the processed batch.
+            receipts (list[tuple[int, int]]): Chat and message IDs delivered in the batch.
+        """
+        await BroadcastReceipt.add_many(
+            session=session, broadcast_id=broadcast_id, receipts=receipts
+        )
+        await session.execute(
+            update(Broadcast)
+            .where(Broadcast.id == broadcast_id)
+            .values(
+                last_user_id=last_user_id,
+                sent=Broadcast.sent + sent,
+                failed=Broadcast.failed + failed,
+            )
+        )
+        await session.commit()
+
+    @classmethod
+    async def update_text(cls, session: AsyncSession, broadcast_id: int, text: str) -> None:
+        await session.execute(
+            update(Broadcast).where(Broadcast.id == broadcast_id).values(text=text)
+        )
+        await session.commit()
+
+    @classmethod
+    async def finish(
+        cls,
+        session: AsyncSession,
+        broadcast_id: int,
+        status: BroadcastStatus = BroadcastStatus.COMPLETED,
+    ) -> None:
+        await session.execute(
+            update(Broadcast)
+            .where(Broadcast.id == broadcast_id)
+            .values(status=status, finished_at=func.now())
+        )
+        await session.commit()
+        logger.info(f"Broadcast {broadcast_id} {status.value}.")
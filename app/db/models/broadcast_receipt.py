@@ -0,0 +1,109 @@
+import logging
+from typing import Self
+
+from sqlalchemy import *
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastReceipt(Base):
+    """
+    Represents a delivered broadcast message, so it can be edited or deleted later.
+
+    Attributes:
+        id (int): Unique identifier for the receipt (primary key).
+        broadcast_id (int): ID of the broadcast the message belongs to.
+        chat_id (int): Chat the message was sent to.
+        message_id (int): ID of the sent message.
+    """
+
+    __tablename__ = "broadcast_receipts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    broadcast_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("broadcasts.id", ondelete="CASCADE"), nullable=False
+    )
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    __table_args__ = (UniqueConstraint("broadcast_id", "chat_id"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<BroadcastReceipt(id={self.id}, broadcast_id={self.broadcast_id}, "
+            f"chat_id={self.chat_id}, message_id={self.message_id})>"
+        )
+
+    @classmethod
+    async def get_page(
+        cls,
+        session: AsyncSession,
+        broadcast_id: int,
+        after_id: int,
+        limit: int,
+    ) -> list[Self]:
+        query = await session.execute(
+            select(BroadcastReceipt)
+            .where(BroadcastReceipt.broadcast_id == broadcast_id, BroadcastReceipt.id > after_id)
+            .order_by(BroadcastReceipt.id)
+            .limit(limit)
+        )
+        return list(query.scalars().all())
+
+    @classmethod
+    async def count(cls, session: AsyncSession, broadcast_id: int) -> int:
+        query = await session.execute(
+            select(func.count()).where(BroadcastReceipt.broadcast_id == broadcast_id)
+        )
+        return query.scalar() or 0
+
+    @classmethod
+    async def add_many(
+        cls,
+        session: AsyncSession,
+        broadcast_id: int,
+        receipts: list[tuple[int, int]],
+    ) -> None:
+        """
+        Stores receipts in the caller's transaction, without committing.
+
+        A message re-sent after a restart replaces the receipt of the same chat.
+
+        Args:
+            session (AsyncSession): Active database session.
+            broadcast_id (int): ID of the broadcast.
+            receipts (list[tuple[int, int]]): Pairs of chat ID and message ID.
+        """
+        if not receipts:
+            return
+
+        stmt = cls.insert_statement(session).values(
+            [
+                {"broadcast_id": broadcast_id, "chat_id": chat_id, "message_id": message_id}
+                for chat_id, message_id in receipts
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["broadcast_id", "chat_id"],
+            set_={"message_id": stmt.excluded.message_id},
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def delete_many(cls, session: AsyncSession, receipt_ids: list[int]) -> None:
+        if not receipt_ids:
+            return
+
+        await session.execute(delete(BroadcastReceipt).where(BroadcastReceipt.id.in_(receipt_ids)))
+        await session.commit()
+
+    @classmethod
+    async def delete_all(cls, session: AsyncSession, broadcast_id: int) -> None:
+        await session.execute(
+            delete(BroadcastReceipt).where(BroadcastReceipt.broadcast_id == broadcast_id)
+        )
+        await session.commit()
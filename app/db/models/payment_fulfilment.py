@@ -0,0 +1,167 @@
+import logging
+from datetime import datetime, timezone
+from typing import Self
+
+from sqlalchemy import *
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Enum
+
+from app.bot.utils.constants import FulfilmentStatus
+
+from . import Base
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    """Returns the current time as naive UTC, the format of the timestamp columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class PaymentFulfilment(Base):
+    """
+    Represents the delivery of a paid subscription, queued by the payment webhook.
+
+    The webhook only stores this row and answers the gateway, the fulfilment task delivers
+    the subscription and retries it until it succeeds. A payment is fulfilled at least once:
+    provisioned_at marks that the VPN client was created or updated, so a retry after a later
+    step failed does not extend the subscription twice.
+
+    Attributes:
+        id (int): Unique identifier for the fulfilment (primary key).
+        payment_id (str): Payment ID of the fulfilled transaction.
+        gateway (str): Callback of the payment gateway that received the payment.
+        status (FulfilmentStatus): Current status of the fulfilment.
+        attempts (int): Number of failed attempts so far.
+        next_attempt_at (datetime): Naive UTC time when the next attempt is due.
+        provisioned_at (datetime | None): Timestamp when the VPN client was provisioned.
+        last_error (str | None): Error of the last failed attempt.
+        created_at (datetime): Timestamp when the payment was received.
+        completed_at (datetime | None): Timestamp when the fulfilment was completed.
+    """
+
+    __tablename__ = "payment_fulfilments"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    payment_id: Mapped[str] = mapped_column(
+        String(length=64), ForeignKey("transactions.payment_id"), unique=True, nullable=False
+    )
+    gateway: Mapped[str] = mapped_column(String(length=32), nullable=False)
+    status: Mapped[FulfilmentStatus] = mapped_column(
+        Enum(
+            FulfilmentStatus,
+            values_callable=lambda obj: [e.value for e in obj],
+            native_enum=False,
+            length=16,
+        ),
+        default=FulfilmentStatus.PENDING,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(default=utcnow, nullable=False)
+    provisioned_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+    completed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    __table_args__ = (
+        Index("ix_payment_fulfilments_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<PaymentFulfilment(id={self.id}, payment_id='{self.payment_id}', "
+            f"gateway='{self.gateway}', status='{self.status}', attempts={self.attempts}, "
+            f"next_attempt_at={self.next_attempt_at}, provisioned_at={self.provisioned_at})>"
+        )
+
+    @classmethod
+    async def get_due(cls, session: AsyncSession, limit: int) -> list[Self]:
+        query = await session.execute(
+            select(PaymentFulfilment)
+            .where(
+                PaymentFulfilment.status == FulfilmentStatus.PENDING,
+                PaymentFulfilment.next_attempt_at <= utcnow(),
+            )
+            .order_by(PaymentFulfilment.next_attempt_at)
+            .limit(limit)
+        )
+        return list(query.scalars().all())
+
+    @classmethod
+    async def enqueue(cls, session: AsyncSession, payment_id: str, gateway: str) -> Self | None:
+        """
+        Queues a payment for fulfilment, once however often the gateway reports it.
+
+        Args:
+            session (AsyncSession): Active database session.
+            payment_id (str): Payment ID of the transaction.
+            gateway (str): Callback of the payment gateway.
+
+        Returns:
+            Self | None: The queued fulfilment, or None if the payment is already queued.
+        """
+        fulfilment = await PaymentFulfilment.insert_or_ignore(
+            session=session,
+            conflict=["payment_id"],
+            payment_id=payment_id,
+            gateway=gateway,
+            next_attempt_at=utcnow(),
+        )
+        await session.commit()
+
+        if fulfilment:
+            logger.info(f"Payment {payment_id} queued for fulfilment.")
+        else:
+            logger.info(f"Payment {payment_id} is already queued for fulfilment.")
+        return fulfilment
+
+    @classmethod
+    async def mark_provisioned(cls, session: AsyncSession, payment_id: str) -> None:
+        await session.execute(
+            update(PaymentFulfilment)
+            .where(PaymentFulfilment.payment_id == payment_id)
+            .values(provisioned_at=func.now())
+        )
+        await session.commit()
+
+    @classmethod
+    async def complete(cls, session: AsyncSession, payment_id: str) -> None:
+        await session.execute(
+            update(PaymentFulfilment)
+            .where(PaymentFulfilment.payment_id == payment_id)
+            .values(status=FulfilmentStatus.COMPLETED, completed_at=func.now(), last_error=None)
+        )
+        await session.commit()
+        logger.info(f"Payment {payment_id} fulfilled.")
+
+    @classmethod
+    async def record_failure(
+        cls,
+        session: AsyncSession,
+        payment_id: str,
+        error: str,
+        next_attempt_at: datetime | None,
+    ) -> None:
+        """
+        Stores a failed attempt and when to retry it.
+
+        Args:
+            session (AsyncSession): Active database session.
+            payment_id (str): Payment ID of the fulfilment.
+            error (str): Error of the attempt.
+            next_attempt_at (datetime | None): Naive UTC time of the retry, None to give up.
+        """
+        values = {"attempts": PaymentFulfilment.attempts + 1, "last_error": error}
+        if next_attempt_at:
+            values["next_attempt_at"] = next_attempt_at
+        else:
+            values["status"] = FulfilmentStatus.FAILED
+
+        await session.execute(
+            update(PaymentFulfilment)
+            .where(PaymentFulfilment.payment_id == payment_id)
+            .values(**values)
+        )
+        await session.commit()
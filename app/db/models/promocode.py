@@ -13,6 +13,9 @@ from . import Base
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT, keeps the statement below the bound parameter limits.
+PROMOCODE_BATCH_SIZE = 1000
+
 
 class Promocode(Base):
     """
@@ -34,7 +37,9 @@ class Promocode(Base):
     code: Mapped[str] = mapped_column(String(length=32), unique=True, nullable=False)
     duration: Mapped[int] = mapped_column(nullable=False)
     is_activated: Mapped[bool] = mapped_column(default=False, nullable=False)
-    activated_by: Mapped[int | None] = mapped_column(ForeignKey("users.tg_id"), nullable=True)
+    activated_by: Mapped[int | None] = mapped_column(
+        BigInteger, ForeignKey("users.tg_id"), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
     activated_user: Mapped["User | None"] = relationship(  # type: ignore
         "User", back_populates="activated_promocodes"
@@ -57,38 +62,75 @@ class Promocode(Base):
 
     @classmethod
     async def create(cls, session: AsyncSession, **kwargs: Any) -> Self | None:
-        while True:
-            code = generate_code()
-            promocode = await Promocode.get(session=session, code=code)
-            if not promocode:
-                break
-
-        promocode = Promocode(code=code, **kwargs)
-        session.add(promocode)
-
         try:
+            promocode = None
+            while not promocode:
+                # A colliding code is skipped by ON CONFLICT, retry with a fresh one.
+                promocode = await Promocode.insert_or_ignore(
+                    session=session, conflict=["code"], code=generate_code(), **kwargs
+                )
             await session.commit()
             logger.info(f"Promocode {promocode.code} created.")
             return promocode
         except IntegrityError as exception:
             await session.rollback()
-            logger.error(f"Error occurred while creating promocode {promocode.code}: {exception}")
+            logger.error(f"Error occurred while creating promocode: {exception}")
             return None
 
     @classmethod
-    async def update(cls, session: AsyncSession, code: str, **kwargs: Any) -> Self | None:
-        promocode = await Promocode.get(session=session, code=code)
+    async def create_bulk(cls, session: AsyncSession, amount: int, duration: int) -> list[str]:
+        """
+        Creates many promocodes with multi-row inserts in a single transaction.
 
-        if not promocode:
-            logger.warning(f"Promocode {code} not found for update.")
-            return None
+        Codes are generated unique in memory. Codes that already exist in the database are
+        skipped by ON CONFLICT and only those are generated again.
+
+        Args:
+            session (AsyncSession): Active database session.
+            amount (int): Number of promocodes to create.
+            duration (int): Subscription duration in days for every promocode.
 
+        Returns:
+            list[str]: Created codes, empty if the transaction failed.
+        """
+        created: list[str] = []
+
+        try:
+            while len(created) < amount:
+                codes: set[str] = set()
+                while len(codes) < min(amount - len(created), PROMOCODE_BATCH_SIZE):
+                    codes.add(generate_code())
+
+                stmt = (
+                    Promocode.insert_statement(session)
+                    .values([{"code": code, "duration": duration} for code in codes])
+                    .on_conflict_do_nothing(index_elements=["code"])
+                    .returning(Promocode.code)
+                )
+                result = await session.execute(stmt)
+                created.extend(result.scalars().all())
+
+            await session.commit()
+            logger.info(f"{len(created)} promocodes for {duration} days created.")
+            return created
+        except IntegrityError as exception:
+            await session.rollback()
+            logger.error(f"Error occurred while creating promocodes in bulk: {exception}")
+            return []
+
+    @classmethod
+    async def update(cls, session: AsyncSession, code: str, **kwargs: Any) -> Self | None:
         # if promocode.is_activated:
         #     logger.warning(f"Promocode {code} is activated and cannot be updated.")
         #     return None
 
         filter = [Promocode.code == code]
-        await session.execute(update(Promocode).where(*filter).values(**kwargs))
+        promocode = await Promocode.update_returning(session=session, filters=filter, **kwargs)
+
+        if not promocode:
+            logger.warning(f"Promocode {code} not found for update.")
+            return None
+
         await session.commit()
         logger.info(f"Promocode {code} updated.")
         return promocode
@@ -107,31 +149,39 @@ class Promocode(Base):
         return False
 
     @classmethod
-    async def set_activated(cls, session: AsyncSession, code: str, user_id: int) -> bool:
-        promocode = await Promocode.get(session=session, code=code)
+    async def set_activated(cls, session: AsyncSession, code: str, user_id: int) -> Self | None:
+        filter = [Promocode.code == code]
+        promocode = await Promocode.compare_and_set(
+            session=session,
+            filters=filter,
+            expected={"is_activated": False},
+            is_activated=True,
+            activated_by=user_id,
+        )
 
         if not promocode:
-            logger.warning(f"Promocode {code} not found for activation.")
-            return False
-
-        if promocode.is_activated:
-            logger.warning(f"Promocode {code} is already activated.")
-            return False
+            logger.warning(f"Promocode {code} not found or already activated.")
+            return None
 
-        await Promocode.update(session=session, code=code, is_activated=True, activated_by=user_id)
-        return True
+        await session.commit()
+        logger.info(f"Promocode {code} activated by user {user_id}.")
+        return promocode
 
     @classmethod
     async def set_deactivated(cls, session: AsyncSession, code: str) -> bool:
-        promocode = await Promocode.get(session=session, code=code)
+        filter = [Promocode.code == code]
+        promocode = await Promocode.compare_and_set(
+            session=session,
+            filters=filter,
+            expected={"is_activated": True},
+            is_activated=False,
+            activated_by=None,
+        )
 
         if not promocode:
-            logger.warning(f"Promocode {code} not found for deactivation.")
+            logger.warning(f"Promocode {code} not found or already deactivated.")
             return False
 
-        if not promocode.is_activated:
-            logger.warning(f"Promocode {code} is already deactivated.")
-            return False
-
-        await Promocode.update(session=session, code=code, is_activated=False, activated_by=None)
+        await session.commit()
+        logger.info(f"Promocode {code} deactivated.")
         return True
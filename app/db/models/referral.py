@@ -2,12 +2,13 @@ import logging
 from datetime import datetime
 from typing import Self
 
-from sqlalchemy import ForeignKey, Integer, func, select, update
+from sqlalchemy import BigInteger, ForeignKey, Integer, func, literal, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy.orm import Mapped, aliased, mapped_column, relationship, selectinload
 
 from . import Base
+from .referrer_stats import ReferrerStats
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +30,10 @@ class Referral(Base):
     __tablename__ = "referrals"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    referred_tg_id: Mapped[int] = mapped_column(ForeignKey("users.tg_id", ondelete="CASCADE"), unique=True,
+    referred_tg_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id", ondelete="CASCADE"), unique=True,
                                                 nullable=False)
-    referrer_tg_id: Mapped[int] = mapped_column(ForeignKey("users.tg_id", ondelete="CASCADE"), nullable=False)
+    referrer_tg_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id", ondelete="CASCADE"), nullable=False,
+                                                index=True)
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
     referred_rewarded_at: Mapped[datetime | None] = mapped_column(nullable=True)
     referred_bonus_days: Mapped[int] = mapped_column(Integer, nullable=True)
@@ -101,6 +103,42 @@ class Referral(Base):
         )
         return query.scalar_one_or_none()
 
+    @classmethod
+    async def get_referrer_chain(
+            cls,
+            session: AsyncSession,
+            referred_tg_id: int,
+            depth: int,
+    ) -> list[int]:
+        """
+        Returns the referrers above a user, up to the given depth, with a single recursive query.
+
+        Args:
+            session (AsyncSession): Active database session.
+            referred_tg_id (int): Unique telegram id of the referred user.
+            depth (int): Maximum number of levels to walk up.
+
+        Returns:
+            list[int]: Telegram ids of the referrers, the direct referrer first.
+        """
+        chain = (
+            select(Referral.referrer_tg_id, literal(1).label("level"))
+            .where(Referral.referred_tg_id == referred_tg_id)
+            .cte("referrer_chain", recursive=True)
+        )
+        parent = aliased(Referral)
+        chain = chain.union_all(
+            select(parent.referrer_tg_id, chain.c.level + 1).where(
+                parent.referred_tg_id == chain.c.referrer_tg_id,
+                chain.c.level < depth,
+            )
+        )
+
+        query = await session.execute(
+            select(chain.c.referrer_tg_id).order_by(chain.c.level)
+        )
+        return list(query.scalars().all())
+
     @classmethod
     async def create(
             cls,
@@ -119,27 +157,30 @@ class Referral(Base):
         Returns:
             bool: True if rewards successfully marked, False if duplicate rewards detected.
         """
-        existing_referral = await cls.get_referral(session, referred_tg_id)
-
-        if existing_referral:
-            logger.warning(f"User {referred_tg_id} is already invited by {existing_referral.referrer_tg_id}.")
-            return False
-
-        referral = Referral(
-            referrer_tg_id=referrer_tg_id,
-            referred_tg_id=referred_tg_id,
-        )
-        session.add(referral)
-
         try:
+            referral = await cls.insert_or_ignore(
+                session=session,
+                conflict=["referred_tg_id"],
+                referrer_tg_id=referrer_tg_id,
+                referred_tg_id=referred_tg_id,
+            )
+            if referral:
+                await ReferrerStats.increment(
+                    session=session, tg_id=referrer_tg_id, referrals_count=1
+                )
             await session.commit()
-            logger.info(f"Referral created: {referrer_tg_id} → {referred_tg_id}.")
-            return referral
         except IntegrityError as exception:
             await session.rollback()
             logger.error(f"Error occurred while creating referral {referrer_tg_id} → {referred_tg_id}: {exception}")
             return False
 
+        if not referral:
+            logger.warning(f"User {referred_tg_id} is already invited.")
+            return False
+
+        logger.info(f"Referral created: {referrer_tg_id} → {referred_tg_id}.")
+        return referral
+
     @classmethod
     async def set_rewarded(
             cls,
@@ -156,20 +197,21 @@ class Referral(Base):
             referred_bonus_days (int): Bonus days granted to the referred.
 
         Returns:
-            bool: True if reward successfully marked, False otherwise.
+            bool: True if reward successfully marked, False if the referred is already rewarded.
         """
         filters = [Referral.id == referral.id]
 
-        await session.execute(
-            update(Referral)
-            .where(*filters)  # type: ignore
-            .values(
-                referred_rewarded_at=func.now(),
-                referred_bonus_days=referred_bonus_days,
-            )
+        rewarded = await cls.compare_and_set(
+            session=session,
+            filters=filters,
+            expected={"referred_rewarded_at": None},
+            referred_rewarded_at=func.now(),
+            referred_bonus_days=referred_bonus_days,
         )
+        if not rewarded:
+            return False
+
         await session.commit()
-        await session.refresh(referral)
 
         logger.info(f"Referred {referral.referred_tg_id} received {referred_bonus_days} bonus days")
         return True
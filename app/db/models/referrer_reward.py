@@ -1,16 +1,20 @@
 import logging
+from collections import Counter
 from datetime import datetime
 from decimal import Decimal
 from typing import Self
 
 from sqlalchemy import (
+    BigInteger,
     Enum,
     ForeignKey,
+    Index,
     Numeric,
     String,
     UniqueConstraint,
     func,
     select,
+    text,
     update,
 )
 from sqlalchemy.exc import IntegrityError
@@ -20,6 +24,9 @@ from sqlalchemy.orm import Mapped, mapped_column, validates
 from app.bot.utils.constants import ReferrerRewardLevel, ReferrerRewardType
 from app.db.models import Base
 
+from .referrer_stats import ReferrerStats
+from .user import User
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,7 +49,7 @@ class ReferrerReward(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_tg_id: Mapped[int] = mapped_column(
-        ForeignKey("users.tg_id", ondelete="CASCADE"), nullable=False
+        BigInteger, ForeignKey("users.tg_id", ondelete="CASCADE"), nullable=False
     )
     reward_type: Mapped[ReferrerRewardType] = mapped_column(
         Enum(ReferrerRewardType), nullable=False
@@ -55,7 +62,16 @@ class ReferrerReward(Base):
     rewarded_at: Mapped[datetime | None] = mapped_column(nullable=True)
     payment_id: Mapped[str] = mapped_column(String(length=64), nullable=False)
 
-    __table_args__ = (UniqueConstraint("user_tg_id", "payment_id", name="uq_user_payment"),)
+    __table_args__ = (
+        UniqueConstraint("user_tg_id", "payment_id", name="uq_user_payment"),
+        Index(
+            "ix_referrer_rewards_pending",
+            "user_tg_id",
+            sqlite_where=text("rewarded_at IS NULL"),
+            postgresql_where=text("rewarded_at IS NULL"),
+        ),
+        Index("ix_referrer_rewards_user_type_level", "user_tg_id", "reward_type", "reward_level"),
+    )
 
     def __repr__(self) -> str:
         return (
@@ -122,6 +138,14 @@ class ReferrerReward(Base):
 
         session.add(reward)
         try:
+            await session.flush()
+            await ReferrerStats.add_reward(
+                session=session,
+                tg_id=user_tg_id,
+                reward_type=reward_type,
+                reward_level=reward_level,
+                amount=amount,
+            )
             await session.commit()
             logger.info(
                 f"Referral reward created for user {user_tg_id}, type {reward_type}, amount {amount}"
@@ -147,6 +171,29 @@ class ReferrerReward(Base):
 
         return query.scalars().all()
 
+    @classmethod
+    async def get_pending_rewards_with_server(
+        cls,
+        session: AsyncSession,
+    ) -> list[tuple[Self, int | None]]:
+        """
+        Returns all pending rewards together with the server of the rewarded user.
+
+        Args:
+            session (AsyncSession): Database session.
+
+        Returns:
+            list[tuple[ReferrerReward, int | None]]: Pending rewards and server IDs, by user.
+        """
+        query = await session.execute(
+            select(ReferrerReward, User.server_id)
+            .join(User, User.tg_id == ReferrerReward.user_tg_id)
+            .where(ReferrerReward.rewarded_at.is_(None))
+            .order_by(ReferrerReward.user_tg_id, ReferrerReward.id)
+        )
+
+        return query.tuples().all()
+
     @classmethod
     async def get_pending_rewards_count(
         cls,
@@ -166,12 +213,10 @@ class ReferrerReward(Base):
 
     @classmethod
     async def mark_reward_as_given(cls, session: AsyncSession, reward: Self) -> Self | None:
-        filters = [ReferrerReward.id == reward.id]
+        filters = [ReferrerReward.id == reward.id, ReferrerReward.rewarded_at.is_(None)]
 
         try:
-            await session.execute(
-                update(ReferrerReward).where(*filters).values(rewarded_at=func.now())
-            )
+            await cls._set_given(session=session, filters=filters)
             await session.commit()
             logger.info(f"Marked reward {reward.id} as given.")
             return reward
@@ -179,3 +224,40 @@ class ReferrerReward(Base):
             await session.rollback()
             logger.error(f"Failed to mark reward {reward.id} as given: {exception}")
             return False
+
+    @classmethod
+    async def mark_rewards_as_given(cls, session: AsyncSession, reward_ids: list[int]) -> int:
+        """
+        Marks the pending rewards as given with a single statement.
+
+        Args:
+            session (AsyncSession): Database session.
+            reward_ids (list[int]): IDs of the rewards.
+
+        Returns:
+            int: Number of rewards marked, rewards given concurrently are skipped.
+        """
+        filters = [ReferrerReward.id.in_(reward_ids), ReferrerReward.rewarded_at.is_(None)]
+
+        try:
+            marked = await cls._set_given(session=session, filters=filters)
+            await session.commit()
+            logger.info(f"Marked rewards {reward_ids} as given.")
+            return marked
+        except Exception as exception:
+            await session.rollback()
+            logger.error(f"Failed to mark rewards {reward_ids} as given: {exception}")
+            return 0
+
+    @classmethod
+    async def _set_given(cls, session: AsyncSession, filters: list) -> int:
+        result = await session.execute(
+            update(ReferrerReward)
+            .where(*filters)
+            .values(rewarded_at=func.now())
+            .returning(ReferrerReward.user_tg_id)
+        )
+        users = Counter(result.scalars().all())
+        for user_tg_id, count in users.items():
+            await ReferrerStats.increment(session=session, tg_id=user_tg_id, pending_rewards=-count)
+        return users.total()
@@ -0,0 +1,109 @@
+import logging
+from decimal import Decimal
+from typing import Self
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, Numeric, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.bot.utils.constants import ReferrerRewardLevel, ReferrerRewardType
+
+from . import Base
+
+logger = logging.getLogger(__name__)
+
+REWARD_COLUMNS = {
+    (ReferrerRewardType.DAYS, ReferrerRewardLevel.FIRST_LEVEL): "first_level_days",
+    (ReferrerRewardType.DAYS, ReferrerRewardLevel.SECOND_LEVEL): "second_level_days",
+    (ReferrerRewardType.MONEY, ReferrerRewardLevel.FIRST_LEVEL): "first_level_money",
+    (ReferrerRewardType.MONEY, ReferrerRewardLevel.SECOND_LEVEL): "second_level_money",
+}
+
+
+class ReferrerStats(Base):
+    """
+    Represents denormalized referral counters of a user, so the referral screen reads one row.
+
+    The counters are changed in the same transaction as the referrals and rewards they count.
+
+    Attributes:
+        user_tg_id (int): Telegram user ID of the referrer (primary key).
+        referrals_count (int): Number of users invited by the user.
+        pending_rewards (int): Number of rewards not given yet.
+        first_level_days (Decimal): Sum of first level rewards in days.
+        second_level_days (Decimal): Sum of second level rewards in days.
+        first_level_money (Decimal): Sum of first level rewards in money.
+        second_level_money (Decimal): Sum of second level rewards in money.
+    """
+
+    __tablename__ = "referrer_stats"
+
+    user_tg_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.tg_id", ondelete="CASCADE"), primary_key=True
+    )
+    referrals_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    pending_rewards: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    first_level_days: Mapped[Decimal] = mapped_column(
+        Numeric(precision=38, scale=18), default=0, nullable=False
+    )
+    second_level_days: Mapped[Decimal] = mapped_column(
+        Numeric(precision=38, scale=18), default=0, nullable=False
+    )
+    first_level_money: Mapped[Decimal] = mapped_column(
+        Numeric(precision=38, scale=18), default=0, nullable=False
+    )
+    second_level_money: Mapped[Decimal] = mapped_column(
+        Numeric(precision=38, scale=18), default=0, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReferrerStats(user_tg_id={self.user_tg_id}, "
+            f"referrals_count={self.referrals_count}, "
+            f"pending_rewards={self.pending_rewards})>"
+        )
+
+    def get_rewards_sum(
+        self,
+        reward_type: ReferrerRewardType,
+        reward_level: ReferrerRewardLevel,
+    ) -> Decimal:
+        column = REWARD_COLUMNS.get((reward_type, reward_level))
+        return getattr(self, column) if column else Decimal(0)
+
+    @classmethod
+    async def get(cls, session: AsyncSession, tg_id: int) -> Self | None:
+        query = await session.execute(select(ReferrerStats).where(ReferrerStats.user_tg_id == tg_id))
+        return query.scalar_one_or_none()
+
+    @classmethod
+    async def increment(cls, session: AsyncSession, tg_id: int, **deltas: int | Decimal) -> None:
+        """
+        Adds the deltas to the counters of a user in the caller's transaction, without committing.
+
+        Args:
+            session (AsyncSession): Active database session.
+            tg_id (int): Telegram user ID of the referrer.
+            **deltas: Values to add by counter name.
+        """
+        stmt = cls.insert_statement(session).values(user_tg_id=tg_id, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_tg_id"],
+            set_={name: getattr(cls, name) + stmt.excluded[name] for name in deltas},
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def add_reward(
+        cls,
+        session: AsyncSession,
+        tg_id: int,
+        reward_type: ReferrerRewardType,
+        reward_level: ReferrerRewardLevel | None,
+        amount: Decimal,
+    ) -> None:
+        deltas = {"pending_rewards": 1}
+        column = REWARD_COLUMNS.get((reward_type, reward_level))
+        if column:
+            deltas[column] = amount
+        await cls.increment(session=session, tg_id=tg_id, **deltas)
@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
 
+from app.bot.utils.constants import BroadcastSegment
+
 from . import Base
 from .user import User
 
@@ -75,32 +77,41 @@ class Server(Base):
         return query.scalars().all()
 
     @classmethod
-    async def create(cls, session: AsyncSession, name: str, **kwargs: Any) -> Self | None:
-        server = await Server.get_by_name(session=session, name=name)
-
-        if server:
-            logger.warning(f"Server {name} already exists.")
-            return None
-
-        server = Server(name=name, **kwargs)
-        session.add(server)
+    async def get_clients_count(cls, session: AsyncSession) -> list[tuple[str, str | None, int]]:
+        # Only clients with an active subscription, expired ones keep their server_id.
+        active = User.get_segment_filters(BroadcastSegment.ACTIVE)
+        query = await session.execute(
+            select(Server.name, Server.location, func.count(User.id))
+            .outerjoin(User, and_(User.server_id == Server.id, *active))
+            .group_by(Server.id, Server.name, Server.location)
+        )
+        return query.all()
 
+    @classmethod
+    async def create(cls, session: AsyncSession, name: str, **kwargs: Any) -> Self | None:
         try:
+            server = await Server.insert_or_ignore(
+                session=session, conflict=["name"], name=name, **kwargs
+            )
             await session.commit()
-            logger.info(f"Server {name} created.")
-            return server
         except IntegrityError as exception:
             await session.rollback()
             logger.error(f"Error occurred while creating server {name}: {exception}")
             return None
 
+        if not server:
+            logger.warning(f"Server {name} already exists.")
+            return None
+
+        logger.info(f"Server {name} created.")
+        return server
+
     @classmethod
     async def update(cls, session: AsyncSession, name: str, **kwargs: Any) -> Self | None:
-        server = await Server.get_by_name(session=session, name=name)
+        filter = [Server.name == name]
+        server = await Server.update_returning(session=session, filters=filter, **kwargs)
 
         if server:
-            filter = [Server.id == server.id]
-            await session.execute(update(Server).where(*filter).values(**kwargs))
             await session.commit()
             logger.debug(f"Server {name} updated.")
             return server
@@ -0,0 +1,190 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import *
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import Enum
+
+from app.bot.utils.constants import StatisticMetric
+
+from . import Base
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_METRICS = [
+    StatisticMetric.SUBSCRIPTIONS_BY_SERVER,
+    StatisticMetric.SUBSCRIPTIONS_BY_LOCATION,
+]
+
+
+def today() -> date:
+    # Timestamps are stored as naive UTC, so statistics days are UTC days as well.
+    return datetime.now(timezone.utc).date()
+
+
+class Statistic(Base):
+    """
+    Represents one pre-aggregated daily statistics value.
+
+    Event metrics (new users, trials, payments, revenue) are incremented in the transaction
+    that records the event. Snapshot metrics (subscriptions per server and location) are
+    rewritten by the statistics task.
+
+    Attributes:
+        id (int): Unique identifier for the row (primary key).
+        day (date): UTC day the value belongs to.
+        metric (StatisticMetric): Aggregated metric.
+        dimension (str): Breakdown key, e.g. gateway, plan or currency; empty if none.
+        value (float): Aggregated value.
+        updated_at (datetime): Timestamp when the value was last changed.
+    """
+
+    __tablename__ = "statistics"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    metric: Mapped[StatisticMetric] = mapped_column(
+        Enum(
+            StatisticMetric,
+            values_callable=lambda obj: [e.value for e in obj],
+            native_enum=False,
+            length=32,
+        ),
+        nullable=False,
+    )
+    dimension: Mapped[str] = mapped_column(String(length=64), default="", nullable=False)
+    value: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (UniqueConstraint("day", "metric", "dimension"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<Statistic(id={self.id}, day={self.day}, metric='{self.metric}', "
+            f"dimension='{self.dimension}', value={self.value})>"
+        )
+
+    @classmethod
+    async def increment(
+        cls,
+        session: AsyncSession,
+        metric: StatisticMetric,
+        amount: float = 1,
+        dimension: str = "",
+        day: date | None = None,
+    ) -> None:
+        """
+        Adds the amount to a daily value in the caller's transaction, without committing.
+
+        Args:
+            session (AsyncSession): Active database session.
+            metric (StatisticMetric): Metric to update.
+            amount (float): Value to add, negative to revert an event.
+            dimension (str): Breakdown key of the value.
+            day (date | None): Day of the event, today if not provided.
+        """
+        stmt = cls.insert_statement(session).values(
+            day=day or today(),
+            metric=metric,
+            dimension=dimension,
+            value=amount,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "metric", "dimension"],
+            set_={"value": cls.value + stmt.excluded.value, "updated_at": func.now()},
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def replace(
+        cls,
+        session: AsyncSession,
+        metric: StatisticMetric,
+        values: dict[str, float],
+        day: date | None = None,
+    ) -> None:
+        """
+        Replaces all values of a metric for a day, without committing.
+
+        Args:
+            session (AsyncSession): Active database session.
+            metric (StatisticMetric): Metric to rewrite.
+            values (dict[str, float]): Values by dimension.
+            day (date | None): Day to rewrite, today if not provided.
+        """
+        day = day or today()
+        await session.execute(delete(cls).where(cls.day == day, cls.metric == metric))
+        if values:
+            await session.execute(
+                insert(cls),
+                [
+                    {"day": day, "metric": metric, "dimension": dimension, "value": value}
+                    for dimension, value in values.items()
+                ],
+            )
+
+    @classmethod
+    async def get_summary(
+        cls,
+        session: AsyncSession,
+        days: int,
+    ) -> dict[StatisticMetric, dict[str, tuple[float, float]]]:
+        """
+        Sums the event metrics for today and for the last days, including today.
+
+        Args:
+            session (AsyncSession): Active database session.
+            days (int): Length of the period.
+
+        Returns:
+            dict[StatisticMetric, dict[str, tuple[float, float]]]: Today's and the period's
+                value by dimension for every metric with data.
+        """
+        current_day = today()
+        query = await session.execute(
+            select(
+                cls.metric,
+                cls.dimension,
+                func.sum(case((cls.day == current_day, cls.value), else_=0)),
+                func.sum(cls.value),
+            )
+            .where(
+                cls.day > current_day - timedelta(days=days),
+                cls.metric.not_in(SNAPSHOT_METRICS),
+            )
+            .group_by(cls.metric, cls.dimension)
+        )
+
+        summary: dict[StatisticMetric, dict[str, tuple[float, float]]] = {}
+        for metric, dimension, today_value, period_value in query.all():
+            summary.setdefault(metric, {})[dimension] = (today_value, period_value)
+        return summary
+
+    @classmethod
+    async def get_latest(cls, session: AsyncSession, metric: StatisticMetric) -> dict[str, float]:
+        """
+        Returns the values of the most recent day a snapshot metric was written for.
+
+        Args:
+            session (AsyncSession): Active database session.
+            metric (StatisticMetric): Snapshot metric.
+
+        Returns:
+            dict[str, float]: Values by dimension.
+        """
+        latest_day = select(func.max(cls.day)).where(cls.metric == metric).scalar_subquery()
+        query = await session.execute(
+            select(cls.dimension, cls.value).where(cls.metric == metric, cls.day == latest_day)
+        )
+        return dict(query.all())
+
+    @classmethod
+    async def get_first_day(cls, session: AsyncSession, metric: StatisticMetric) -> date | None:
+        query = await session.execute(select(func.min(cls.day)).where(cls.metric == metric))
+        return query.scalar_one_or_none()
@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Self
 
 from sqlalchemy import *
@@ -23,7 +23,13 @@ class Transaction(Base):
         id (int): Unique identifier for the transaction (primary key).
         tg_id (int): Telegram user ID associated with the transaction.
         payment_id (str): Unique payment identifier for the transaction.
-        subscription (str): Name of the subscription plan associated with the transaction.
+        subscription (str): Packed subscription data, kept for compatibility.
+        devices (int | None): Number of devices of the purchased plan.
+        duration (int | None): Duration of the purchased plan in days.
+        price (float | None): Price of the purchased plan.
+        location (str | None): Requested server location, if any.
+        is_extend (bool | None): Whether the payment extends the current subscription.
+        is_change (bool | None): Whether the payment changes the current subscription.
         status (TransactionStatus): Current status of the transaction (e.g., pending, completed).
         created_at (datetime): Timestamp when the transaction was created.
         updated_at (datetime): Timestamp when the transaction was last updated.
@@ -33,9 +39,15 @@ class Transaction(Base):
     __tablename__ = "transactions"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    tg_id: Mapped[int] = mapped_column(ForeignKey("users.tg_id"), nullable=False)
+    tg_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id"), nullable=False)
     payment_id: Mapped[str] = mapped_column(String(length=64), unique=True, nullable=False)
     subscription: Mapped[str] = mapped_column(String(length=255), nullable=False)
+    devices: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    duration: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    price: Mapped[float | None] = mapped_column(Float, nullable=True)
+    location: Mapped[str | None] = mapped_column(String(length=32), nullable=True)
+    is_extend: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    is_change: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     status: Mapped[TransactionStatus] = mapped_column(
         Enum(TransactionStatus, values_callable=lambda obj: [e.value for e in obj]),
         nullable=False,
@@ -48,10 +60,16 @@ class Transaction(Base):
     )
     user: Mapped["User"] = relationship("User", back_populates="transactions")  # type: ignore
 
+    __table_args__ = (
+        Index("ix_transactions_status_created_at", "status", "created_at"),
+        Index("ix_transactions_tg_id_status", "tg_id", "status"),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<Transaction(id={self.id}, tg_id={self.tg_id}, payment_id='{self.payment_id}', "
-            f"subscription='{self.subscription}', status='{self.status}', "
+            f"subscription='{self.subscription}', devices={self.devices}, "
+            f"duration={self.duration}, price={self.price}, status='{self.status}', "
             f"created_at={self.created_at}, updated_at={self.updated_at})>"
         )
 
@@ -72,32 +90,128 @@ class Transaction(Base):
         return query.scalars().all()
 
     @classmethod
-    async def create(cls, session: AsyncSession, payment_id: str, **kwargs: Any) -> Self | None:
-        transaction = await Transaction.get_by_id(session=session, payment_id=payment_id)
-
-        if transaction:
-            logger.warning(f"Transaction {payment_id} already exists.")
-            return None
-
-        transaction = Transaction(payment_id=payment_id, **kwargs)
-        session.add(transaction)
+    async def cancel_expired(cls, session: AsyncSession, expiration_time: datetime) -> list[str]:
+        """
+        Cancels all pending transactions created before the expiration time in one statement.
+
+        The status check is part of the UPDATE, so a transaction completed concurrently is
+        left untouched.
+
+        Args:
+            session (AsyncSession): Active database session.
+            expiration_time (datetime): Naive UTC time before which pending transactions expire.
+
+        Returns:
+            list[str]: Payment IDs of the canceled transactions.
+        """
+        stmt = (
+            update(Transaction)
+            .where(
+                Transaction.status == TransactionStatus.PENDING,
+                Transaction.created_at <= expiration_time,
+            )
+            .values(status=TransactionStatus.CANCELED)
+            .returning(Transaction.payment_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        payment_ids = list(result.scalars().all())
+        await session.commit()
+        return payment_ids
 
+    @classmethod
+    async def create(cls, session: AsyncSession, payment_id: str, **kwargs: Any) -> Self | None:
         try:
+            transaction = await Transaction.insert_or_ignore(
+                session=session, conflict=["payment_id"], payment_id=payment_id, **kwargs
+            )
             await session.commit()
-            logger.info(f"Transaction {payment_id} created.")
-            return transaction
         except IntegrityError as exception:
             await session.rollback()
             logger.error(f"Error occurred while creating transaction {payment_id}: {exception}")
             return None
 
+        if not transaction:
+            logger.warning(f"Transaction {payment_id} already exists.")
+            return None
+
+        logger.info(f"Transaction {payment_id} created.")
+        return transaction
+
+    @classmethod
+    async def complete(cls, session: AsyncSession, payment_id: str, tg_id: int) -> Self | None:
+        """
+        Marks a transaction as completed in the caller's transaction, without committing.
+
+        The status check is part of the UPDATE, so of two concurrent attempts to complete
+        the same payment exactly one gets the transaction back.
+
+        Args:
+            session (AsyncSession): Active database session.
+            payment_id (str): Payment ID of the transaction.
+            tg_id (int): Telegram user ID of the payer.
+
+        Returns:
+            Self | None: The completed transaction, or None if it was already completed.
+        """
+        return await Transaction.update_returning(
+            session=session,
+            filters=[
+                Transaction.payment_id == payment_id,
+                Transaction.status != TransactionStatus.COMPLETED,
+            ],
+            tg_id=tg_id,
+            status=TransactionStatus.COMPLETED,
+        )
+
+    @classmethod
+    async def count_by_plan(
+        cls,
+        session: AsyncSession,
+        until: datetime,
+        since: datetime | None = None,
+    ) -> dict[date, dict[str, int]]:
+        """
+        Counts the completed payments of every plan by the day they were completed.
+
+        Transactions whose typed columns were not backfilled are left out.
+
+        Args:
+            session (AsyncSession): Active database session.
+            until (datetime): Naive UTC end of the period, exclusive.
+            since (datetime | None): Naive UTC start of the period, all history if not provided.
+
+        Returns:
+            dict[date, dict[str, int]]: Payments by plan ("devices:duration") for every day.
+        """
+        day = func.date(Transaction.updated_at)
+        filter = [
+            Transaction.status == TransactionStatus.COMPLETED,
+            Transaction.devices.is_not(None),
+            Transaction.duration.is_not(None),
+            Transaction.updated_at < until,
+        ]
+        if since:
+            filter.append(Transaction.updated_at >= since)
+
+        query = await session.execute(
+            select(day, Transaction.devices, Transaction.duration, func.count(Transaction.id))
+            .where(*filter)
+            .group_by(day, Transaction.devices, Transaction.duration)
+        )
+
+        plans: dict[date, dict[str, int]] = {}
+        for value, devices, duration, count in query.all():
+            # SQLite returns the day as an ISO string, PostgreSQL as a date.
+            plans.setdefault(date.fromisoformat(str(value)), {})[f"{devices}:{duration}"] = count
+        return plans
+
     @classmethod
     async def update(cls, session: AsyncSession, payment_id: str, **kwargs: Any) -> Self | None:
-        transaction = await Transaction.get_by_id(session=session, payment_id=payment_id)
+        filter = [Transaction.payment_id == payment_id]
+        transaction = await Transaction.update_returning(session=session, filters=filter, **kwargs)
 
         if transaction:
-            filter = [Transaction.id == transaction.id]
-            await session.execute(update(Transaction).where(*filter).values(**kwargs))
             await session.commit()
             logger.info(f"Transaction {payment_id} updated.")
             return transaction
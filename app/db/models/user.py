@@ -1,18 +1,58 @@
 import logging
-from datetime import datetime
+import time
+from datetime import date, datetime
 from typing import Any, Self, Optional
 
-from sqlalchemy import ForeignKey, String, func, select, update, or_
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    ForeignKey,
+    Index,
+    String,
+    bindparam,
+    column,
+    delete,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    update,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.bot.utils.constants import DEFAULT_LANGUAGE
+from app.bot.utils.constants import (
+    DEFAULT_LANGUAGE,
+    BroadcastSegment,
+    StatisticMetric,
+    TransactionStatus,
+)
+from app.bot.utils.time import get_current_timestamp
 
 from . import Base
+from .statistic import Statistic
+from .transaction import Transaction
 
 logger = logging.getLogger(__name__)
 
+# SQLite FTS5 index over users.first_name/users.username, maintained by triggers.
+USER_SEARCH_TABLE = "users_search"
+# The trigram tokenizer cannot match shorter substrings.
+USER_SEARCH_MIN_LENGTH = 3
+
+# Cached number of users, dropped by User.create and User.delete and refreshed after
+# USERS_COUNT_TTL_SECONDS to pick up changes made elsewhere. The generation keeps a count
+# computed concurrently with such a change from being cached.
+USERS_COUNT_TTL_SECONDS = 60
+_users_count: int | None = None
+_users_count_expires_at = 0.0
+_users_count_generation = 0
+
+DAY_MS = 24 * 60 * 60 * 1000
+
 
 class User(Base):
     """
@@ -26,6 +66,8 @@ class User(Base):
         first_name (str): First name of the user.
         username (str | None): Telegram username of the user.
         created_at (datetime): Timestamp when the user was created.
+        client_expiry_time (int | None): Expiry of the VPN client in milliseconds, mirrored from
+            the panel; 0 for unlimited, None if the user has no client.
         server (Server | None): Associated server object.
         transactions (list[Transaction]): List of transactions associated with the user.
         activated_promocodes (list[Promocode]): List of promocodes activated by the user.
@@ -36,7 +78,7 @@ class User(Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    tg_id: Mapped[int] = mapped_column(unique=True, nullable=False)
+    tg_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
     vpn_id: Mapped[str | None] = mapped_column(String(36), unique=True, nullable=True)
     server_id: Mapped[int | None] = mapped_column(
         ForeignKey("servers.id", ondelete="SET NULL"), nullable=True
@@ -49,6 +91,7 @@ class User(Base):
         default=DEFAULT_LANGUAGE,
     )
     created_at: Mapped[datetime] = mapped_column(default=func.now(), nullable=False)
+    client_expiry_time: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     server: Mapped["Server | None"] = relationship("Server", back_populates="users", uselist=False)  # type: ignore
     transactions: Mapped[list["Transaction"]] = relationship("Transaction", back_populates="user")  # type: ignore
     activated_promocodes: Mapped[list["Promocode"]] = relationship(  # type: ignore
@@ -70,6 +113,11 @@ class User(Base):
         uselist=False
     )
 
+    __table_args__ = (
+        Index("ix_users_server_id", "server_id"),
+        Index("ix_users_client_expiry_time", "client_expiry_time"),
+    )
+
     @property
     def display_name(self) -> str:
         if self.username:
@@ -106,68 +154,233 @@ class User(Base):
         return None
 
     @classmethod
-    async def get_all(cls, session: AsyncSession, limit: Optional[int] = None, offset: Optional[int] = None) -> list[Self]:
-        query = select(User).options(selectinload(User.server))
+    async def get_all(
+        cls,
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> list[Self]:
+        query = select(User).options(selectinload(User.server)).order_by(User.id)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
         if offset is not None:
             query = query.offset(offset)
         if limit is not None:
             query = query.limit(limit)
-        
+
         result = await session.execute(query)
         return result.scalars().all()
 
     @classmethod
-    async def search_users(cls, session: AsyncSession, query_text: str, limit: Optional[int] = 15, offset: Optional[int] = 0) -> list[Self]:
+    def get_segment_filters(
+        cls,
+        segment: BroadcastSegment,
+        value: str | None = None,
+    ) -> list[ColumnElement[bool]]:
+        """
+        Builds the conditions selecting the users of a broadcast segment.
+
+        Args:
+            segment (BroadcastSegment): Segment to select.
+            value (str | None): Parameter of the segment: days since expiry for EXPIRED,
+                server id for SERVER, location name for LOCATION.
+
+        Returns:
+            list[ColumnElement[bool]]: Conditions on users, empty for all users.
+        """
+        now = get_current_timestamp()
+        paid = User.transactions.any(status=TransactionStatus.COMPLETED)
+
+        match segment:
+            case BroadcastSegment.ACTIVE:
+                return [or_(User.client_expiry_time == 0, User.client_expiry_time > now)]
+            case BroadcastSegment.EXPIRED:
+                return [
+                    User.client_expiry_time > now - int(value) * DAY_MS,
+                    User.client_expiry_time <= now,
+                    User.client_expiry_time > 0,
+                ]
+            case BroadcastSegment.TRIAL_ONLY:
+                return [User.is_trial_used.is_(True), ~paid]
+            case BroadcastSegment.NEVER_PAID:
+                return [~paid]
+            case BroadcastSegment.SERVER:
+                return [User.server_id == int(value)]
+            case BroadcastSegment.LOCATION:
+                return [User.server.has(location=value)]
+        return []
+
+    @classmethod
+    async def get_chat_ids(
+        cls,
+        session: AsyncSession,
+        after_id: int,
+        limit: int,
+        filters: list[ColumnElement[bool]] | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Returns a page of recipients for a broadcast, without loading the user rows.
+
+        Args:
+            session (AsyncSession): Active database session.
+            after_id (int): Return users with a greater users.id only.
+            limit (int): Maximum number of users to return.
+            filters (list[ColumnElement[bool]] | None): Conditions of the segment, if any.
+
+        Returns:
+            list[tuple[int, int]]: Pairs of users.id and Telegram user ID, ordered by users.id.
+        """
+        query = await session.execute(
+            select(User.id, User.tg_id)
+            .where(User.id > after_id, *(filters or []))
+            .order_by(User.id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in query.all()]
+
+    @classmethod
+    async def count_segment(
+        cls,
+        session: AsyncSession,
+        filters: list[ColumnElement[bool]],
+    ) -> int:
+        if not filters:
+            return await User.count(session=session)
+
+        query = await session.execute(select(func.count(User.id)).where(*filters))
+        return query.scalar() or 0
+
+    @classmethod
+    async def count(cls, session: AsyncSession) -> int:
+        global _users_count, _users_count_expires_at
+
+        if _users_count is not None and time.monotonic() < _users_count_expires_at:
+            return _users_count
+
+        generation = _users_count_generation
+        query = await session.execute(select(func.count(User.id)))
+        count = query.scalar() or 0
+        if generation == _users_count_generation:
+            _users_count = count
+            _users_count_expires_at = time.monotonic() + USERS_COUNT_TTL_SECONDS
+            logger.debug(f"Users count refreshed: {count}.")
+        return count
+
+    @classmethod
+    async def count_by_day(
+        cls,
+        session: AsyncSession,
+        until: datetime,
+        since: datetime | None = None,
+    ) -> dict[date, int]:
+        day = func.date(User.created_at)
+        filter = [User.created_at < until]
+        if since:
+            filter.append(User.created_at >= since)
+
+        query = await session.execute(select(day, func.count(User.id)).where(*filter).group_by(day))
+        # SQLite returns the day as an ISO string, PostgreSQL as a date.
+        return {date.fromisoformat(str(value)): count for value, count in query.all()}
+
+    @classmethod
+    async def search_users(
+        cls,
+        session: AsyncSession,
+        query_text: str,
+        limit: Optional[int] = 15,
+        offset: Optional[int] = 0,
+    ) -> tuple[list[Self], int]:
+        """
+        Searches users by Telegram ID, username (prefixed with @) or first name.
+
+        Returns the requested page and the total number of matches, counted by the same query.
+        """
         normalized_query = query_text.strip()
-        filters = []
+        total = func.count().over().label("total")
+        query_stmt = select(User, total)
 
         if normalized_query.isdigit():
-            filters.append(User.tg_id == int(normalized_query))
-        elif normalized_query.startswith('@'):
-            filters.append(User.username.ilike(f"%{normalized_query[1:]}%"))
+            query_stmt = query_stmt.where(User.tg_id == int(normalized_query))
         else:
-            filters.append(User.first_name.ilike(f"%{normalized_query}%"))
-
-        if not filters:
-            return []
+            if normalized_query.startswith("@"):
+                column_name, value = "username", normalized_query[1:]
+            else:
+                column_name, value = "first_name", normalized_query
+
+            if not value:
+                return [], 0
+
+            dialect = session.bind.dialect.name
+            if dialect == "sqlite" and len(value) >= USER_SEARCH_MIN_LENGTH:
+                search = table(USER_SEARCH_TABLE, column("rowid"))
+                phrase = value.replace('"', '""')
+                query_stmt = query_stmt.join(search, search.c.rowid == User.id).where(
+                    literal_column(USER_SEARCH_TABLE).op("MATCH")(f'{column_name} : "{phrase}"')
+                )
+            else:
+                query_stmt = query_stmt.where(getattr(User, column_name).ilike(f"%{value}%"))
+
+        query_stmt = query_stmt.options(selectinload(User.server)).order_by(User.id)
 
-        query_stmt = select(User).where(or_(*filters)).options(selectinload(User.server))
-        
         if offset is not None:
             query_stmt = query_stmt.offset(offset)
         if limit is not None:
             query_stmt = query_stmt.limit(limit)
-            
+
         result = await session.execute(query_stmt)
-        return result.scalars().all()
+        rows = result.all()
+        return [row.User for row in rows], rows[0].total if rows else 0
 
     @classmethod
     async def create(cls, session: AsyncSession, tg_id: int, **kwargs: Any) -> Self | None:
-        user = await User.get(session=session, tg_id=tg_id)
-
-        if user:
-            logger.warning(f"User {tg_id} already exists.")
-            return None
-
-        user = User(tg_id=tg_id, **kwargs)
-        session.add(user)
-
         try:
+            user = await User.insert_or_ignore(
+                session=session, conflict=["tg_id"], tg_id=tg_id, **kwargs
+            )
+            if user:
+                await Statistic.increment(session=session, metric=StatisticMetric.NEW_USERS)
             await session.commit()
-            logger.debug(f"User {tg_id} created.")
-            return user
         except IntegrityError as exception:
             await session.rollback()
             logger.error(f"Error occurred while creating user {tg_id}: {exception}")
             return None
 
+        if not user:
+            logger.warning(f"User {tg_id} already exists.")
+            return None
+
+        _invalidate_users_count()
+
+        # A new user has nothing related yet, mark the collections as loaded like User.get does.
+        set_committed_value(user, "transactions", [])
+        set_committed_value(user, "activated_promocodes", [])
+        if user.server_id is None:
+            set_committed_value(user, "server", None)
+        logger.debug(f"User {tg_id} created.")
+        return user
+
     @classmethod
-    async def update(cls, session: AsyncSession, tg_id: int, **kwargs: Any) -> Self | None:
+    async def delete(cls, session: AsyncSession, tg_id: int) -> bool:
         user = await User.get(session=session, tg_id=tg_id)
 
+        if not user:
+            logger.warning(f"User {tg_id} not found for deletion.")
+            return False
+
+        await session.execute(delete(Transaction).where(Transaction.tg_id == tg_id))
+        await session.delete(user)
+        await session.commit()
+        _invalidate_users_count()
+        logger.info(f"User {tg_id} deleted.")
+        return True
+
+    @classmethod
+    async def update(cls, session: AsyncSession, tg_id: int, **kwargs: Any) -> Self | None:
+        filter = [User.tg_id == tg_id]
+        user = await User.update_returning(session=session, filters=filter, **kwargs)
+
         if user:
-            filter = [User.tg_id == tg_id]
-            await session.execute(update(User).where(*filter).values(**kwargs))
             await session.commit()
             logger.debug(f"User {tg_id} updated.")
             return user
@@ -182,7 +395,7 @@ class User(Base):
     @classmethod
     async def update_trial_status(cls, session: AsyncSession, tg_id: int, used: bool) -> bool:
         """
-        Updates the trial status of a user.
+        Switches the trial status of a user, only if it is not already in the requested state.
 
         Args:
             session (AsyncSession): Database session.
@@ -190,27 +403,74 @@ class User(Base):
             used (bool): Whether the trial has been used.
 
         Returns:
-            bool: True if updated, False otherwise.
+            bool: True if updated, False if the user is not found or already in this state.
         """
-        user = await cls.get(session=session, tg_id=tg_id)
+        filter = [User.tg_id == tg_id]
+        user = await cls.compare_and_set(
+            session=session,
+            filters=filter,
+            expected={"is_trial_used": not used},
+            is_trial_used=used,
+        )
 
         if not user:
-            logger.warning(f"User {tg_id} not found to update trial status.")
+            logger.warning(f"User {tg_id} not found or trial status is already {used}.")
             return False
 
-        await session.execute(
-            update(User).where(User.tg_id == tg_id).values(is_trial_used=used)
+        # A reset trial is one that failed to be granted, so it is not counted.
+        await Statistic.increment(
+            session=session, metric=StatisticMetric.TRIALS, amount=1 if used else -1
         )
         await session.commit()
         logger.info(f"Trial status updated for user {tg_id}: {used}")
         return True
 
     @classmethod
-    async def update_language_code(cls, session: AsyncSession, tg_id: int, language_code: str | None = None) -> None:
-        """Update user's language code."""
+    async def set_client_expiry(
+        cls,
+        session: AsyncSession,
+        tg_id: int,
+        expiry_time: int | None,
+    ) -> None:
+        await session.execute(
+            update(User).where(User.tg_id == tg_id).values(client_expiry_time=expiry_time)
+        )
+
+    @classmethod
+    async def sync_client_expiry(
+        cls,
+        session: AsyncSession,
+        server_id: int,
+        expiry_times: dict[int, int],
+    ) -> None:
+        """
+        Mirrors the client expiry times of a server panel to its users.
+
+        Args:
+            session (AsyncSession): Active database session.
+            server_id (int): ID of the synchronized server.
+            expiry_times (dict[int, int]): Expiry time in milliseconds by Telegram user ID.
+        """
+        # Both statements run in one transaction, so clients missing from the panel are
+        # cleared without a window where the whole server looks expired.
+        users = User.__table__
         await session.execute(
-            update(cls)
-            .where(cls.tg_id == tg_id)
-            .values(language_code=language_code or "ru")
+            update(users).where(users.c.server_id == server_id).values(client_expiry_time=None)
         )
+        if expiry_times:
+            await session.execute(
+                update(users)
+                .where(users.c.server_id == server_id, users.c.tg_id == bindparam("user_tg_id"))
+                .values(client_expiry_time=bindparam("expiry_time")),
+                [
+                    {"user_tg_id": tg_id, "expiry_time": expiry_time}
+                    for tg_id, expiry_time in expiry_times.items()
+                ],
+            )
         await session.commit()
+
+
+def _invalidate_users_count() -> None:
+    global _users_count, _users_count_generation
+    _users_count = None
+    _users_count_generation += 1
@@ -0,0 +1,41 @@
+import logging
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class LazySession:
+    """
+    Proxy for AsyncSession that creates the underlying session on first use.
+
+    Attribute access is delegated to the wrapped AsyncSession, so the proxy can be
+    passed wherever a session is expected. A connection is checked out of the pool
+    only when the first statement runs and is returned by release() or close().
+    """
+
+    def __init__(self, session_maker: async_sessionmaker) -> None:
+        self._session_maker = session_maker
+        self._session: AsyncSession | None = None
+
+    @property
+    def is_opened(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._session_maker()
+            logger.debug("Database session opened on first use.")
+        return getattr(self._session, name)
+
+    async def release(self) -> None:
+        """Ends the current transaction and returns its connection to the pool."""
+        if self._session is not None and self._session.in_transaction():
+            await self._session.commit()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            logger.debug("Database session closed.")
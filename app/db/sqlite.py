@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import weakref
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.config import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+WRITER_BOUND_KEY = "sqlite_writer_bound"
+
+# Session holding the writer connection, per task.
+_writer_sessions: weakref.WeakKeyDictionary[asyncio.Task, Session] = weakref.WeakKeyDictionary()
+
+
+def _current_task() -> asyncio.Task | None:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+def setup_engine(engine: Engine, config: DatabaseConfig, immediate: bool = False) -> None:
+    """
+    Applies the SQLite performance profile to every new connection of the engine.
+
+    WAL lets readers run next to the writer, busy_timeout makes a blocked writer wait
+    instead of failing with "database is locked". Transactions are started explicitly
+    so writer connections can take the write lock up front with BEGIN IMMEDIATE.
+    """
+    pragmas = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": config.BUSY_TIMEOUT,
+        "cache_size": config.CACHE_SIZE,
+        "mmap_size": config.MMAP_SIZE,
+        "temp_store": "MEMORY",
+    }
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    begin_statement = "BEGIN IMMEDIATE" if immediate else "BEGIN"
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection: Any) -> None:
+        connection.exec_driver_sql(begin_statement)
+
+    logger.debug(f"SQLite profile applied ({begin_statement}): {pragmas}")
+
+
+class SQLiteRoutingSession(Session):
+    """
+    Session that sends all writes to the writer engine.
+
+    Reads go to the reader pool until the transaction performs its first write.
+    From then on the transaction stays on the writer so it sees its own changes.
+
+    The writer engine has a single connection, so writers are serialized by waiting
+    for it. A session that writes while another session of the same task holds the
+    connection joins that transaction in a savepoint instead: waiting would deadlock
+    the task. Its changes are then committed by the session holding the connection.
+    Writes from tasks started by a writing task must wait until it commits.
+    """
+
+    def __init__(self, *args: Any, reader: Engine, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.reader = reader
+
+    def get_bind(
+        self, mapper: Any = None, *, clause: Any = None, **kwargs: Any
+    ) -> Engine | Connection:
+        if self._flushing or isinstance(clause, UpdateBase) or self.info.get(WRITER_BOUND_KEY):
+            self.info[WRITER_BOUND_KEY] = True
+            task = _current_task()
+            owner = _writer_sessions.get(task) if task else None
+            if owner is not None and owner is not self:
+                return owner.connection()
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return self.reader
+
+
+@event.listens_for(SQLiteRoutingSession, "after_begin")
+def _claim_writer(session: Session, transaction: Any, connection: Connection) -> None:
+    task = _current_task()
+    if task and connection.engine is session.bind and task not in _writer_sessions:
+        _writer_sessions[task] = session
+
+
+@event.listens_for(SQLiteRoutingSession, "after_transaction_end")
+def _release_writer(session: Session, transaction: Any) -> None:
+    if transaction.parent is None:
+        session.info.pop(WRITER_BOUND_KEY, None)
+        task = _current_task()
+        if task and _writer_sessions.get(task) is session:
+            del _writer_sessions[task]
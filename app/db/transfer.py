@@ -0,0 +1,107 @@
+"""
+Copies an existing SQLite database into the configured PostgreSQL database.
+
+Usage:
+    python -m app.db.transfer [--batch-size 1000]
+
+The destination schema must be created beforehand (alembic upgrade head). Rows are
+streamed from SQLite in batches and written with multi-row inserts, so memory usage
+does not depend on the size of the source database.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import func, insert, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.bot.utils.constants import DB_DRIVER_SQLITE
+from app.config import load_config
+from app.db.models import Base
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+async def _copy_table(
+    source: AsyncConnection,
+    destination: AsyncConnection,
+    table_name: str,
+    batch_size: int,
+) -> int:
+    table = Base.metadata.tables[table_name]
+    copied = 0
+
+    result = await source.stream(
+        select(table).order_by(*table.primary_key.columns).execution_options(yield_per=batch_size)
+    )
+    async for partition in result.mappings().partitions(batch_size):
+        await destination.execute(insert(table), [dict(row) for row in partition])
+        copied += len(partition)
+        logger.info(f"{table_name}: {copied} rows copied.")
+
+    return copied
+
+
+async def _reset_sequence(destination: AsyncConnection, table_name: str) -> None:
+    table = Base.metadata.tables[table_name]
+    if "id" not in table.columns:
+        return
+
+    max_id = (await destination.execute(select(func.max(table.c.id)))).scalar()
+    await destination.execute(
+        text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :value, :is_called)"),
+        {"table": table_name, "value": max_id or 1, "is_called": max_id is not None},
+    )
+
+
+async def transfer(batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    config = load_config().database
+    if config.is_sqlite:
+        raise SystemExit("DB_DRIVER must point to PostgreSQL to run the transfer.")
+
+    source_engine = create_async_engine(config.url(driver=DB_DRIVER_SQLITE))
+    destination_engine = create_async_engine(config.url())
+
+    try:
+        async with destination_engine.begin() as destination:
+            await destination.run_sync(Base.metadata.create_all)
+
+            for table in Base.metadata.sorted_tables:
+                count = (
+                    await destination.execute(select(func.count()).select_from(table))
+                ).scalar_one()
+                if count:
+                    raise SystemExit(f"Destination table {table.name} is not empty. Aborting.")
+
+        async with source_engine.connect() as source, destination_engine.begin() as destination:
+            source_tables = await source.run_sync(
+                lambda connection: set(inspect(connection).get_table_names())
+            )
+            for table in Base.metadata.sorted_tables:
+                if table.name not in source_tables:
+                    logger.warning(f"Table {table.name} not found in SQLite database. Skipping.")
+                    continue
+                copied = await _copy_table(source, destination, table.name, batch_size)
+                await _reset_sequence(destination, table.name)
+                logger.info(f"Table {table.name} transferred ({copied} rows).")
+    finally:
+        await source_engine.dispose()
+        await destination_engine.dispose()
+
+    logger.info("SQLite to PostgreSQL transfer finished.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Copy the SQLite database into PostgreSQL.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    asyncio.run(transfer(batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
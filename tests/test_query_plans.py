@@ -0,0 +1,119 @@
+import asyncio
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import pytest
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+import app.config
+from app.bot.utils.constants import ReferrerRewardLevel, ReferrerRewardType
+from app.db.models import Referral, ReferrerReward, Transaction
+
+ROOT = Path(__file__).resolve().parent.parent
+DB_NAME = "query_plans"
+# Revision before the hot query indexes.
+BASE_REVISION = "c3f18a6e2b47"
+
+
+@pytest.fixture
+def database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    A database upgraded to head by the migrations, from a deployment that predates them.
+
+    referrer_rewards is created by the application rather than by a migration, so it is
+    created here as it existed before the hot query indexes, which the upgrade then adds.
+    """
+    for name, value in {
+        "BOT_TOKEN": "0:test",
+        "BOT_DEV_ID": "1",
+        "BOT_SUPPORT_ID": "1",
+        "BOT_DOMAIN": "localhost",
+        "XUI_USERNAME": "test",
+        "XUI_PASSWORD": "test",
+        "DB_NAME": DB_NAME,
+    }.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(app.config, "DEFAULT_DATA_DIR", tmp_path)
+    path = tmp_path / f"{DB_NAME}.{app.config.DB_FORMAT}"
+
+    alembic_config = AlembicConfig(str(ROOT / "app" / "db" / "alembic.ini"))
+    alembic_config.set_main_option("script_location", str(ROOT / "app" / "db" / "migration"))
+    command.upgrade(alembic_config, BASE_REVISION)
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        # CREATE TABLE without the table's indexes.
+        connection.execute(CreateTable(ReferrerReward.__table__))
+    engine.dispose()
+
+    command.upgrade(alembic_config, "head")
+    return path
+
+
+def capture(path: Path, query: Callable[[AsyncSession], Awaitable[Any]]) -> tuple[str, Any]:
+    """Runs a model classmethod and returns the statement it sent to the database."""
+    statements = []
+
+    async def run() -> None:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any) -> None:
+            statements.append((statement, parameters))
+
+        async with AsyncSession(engine) as session:
+            await query(session)
+        await engine.dispose()
+
+    asyncio.run(run())
+    assert len(statements) == 1, statements
+    return statements[0]
+
+
+def explain(path: Path, statement: str, parameters: Any) -> str:
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    ("query", "index"),
+    [
+        pytest.param(
+            lambda session: Transaction.cancel_expired(session, datetime(2026, 1, 1)),
+            "ix_transactions_status_created_at",
+            id="transactions-expiry",
+        ),
+        pytest.param(
+            ReferrerReward.get_pending_rewards_with_server,
+            "ix_referrer_rewards_pending",
+            id="pending-rewards",
+        ),
+        pytest.param(
+            lambda session: ReferrerReward.get_rewards_sum(
+                session, 1, ReferrerRewardType.DAYS, ReferrerRewardLevel.FIRST_LEVEL
+            ),
+            "ix_referrer_rewards_user_type_level",
+            id="rewards-sum",
+        ),
+        pytest.param(
+            lambda session: Referral.get_referral_count(session, 1),
+            "ix_referrals_referrer_tg_id",
+            id="referral-count",
+        ),
+    ],
+)
+def test_hot_query_uses_index(
+    database: Path,
+    query: Callable[[AsyncSession], Awaitable[Any]],
+    index: str,
+) -> None:
+    plan = explain(database, *capture(database, query))
+    assert re.search(rf"\bINDEX {index}\b", plan), plan